@@ -8,6 +8,26 @@ Features:
 - Hierarchical model with partial pooling
 - Three prior specifications (default, informative, vague)
 - Full MCMC sampling with convergence diagnostics
+- Pluggable NUTS backends (PyMC, nutpie, NumPyro/JAX)
+- Optional sufficient-statistics likelihood (cost independent of row count)
+- Exact blocked Gibbs sampler for the simple model (sub-second fits)
+- ADVI / full-rank ADVI / Pathfinder fast-preview inference
+- Centered / non-centered / auto parameterization of hierarchical group effects
+- pm.Data containers + compiled-model cache: refits of the same structure skip compilation
+- Convergence-driven adaptive sampling in blocks (R-hat / ESS / divergence thresholds)
+- Warm starts from a previous trace (positions, step size, mass matrix)
+- Sequential Bayesian updating (previous posterior -> MVN prior, new rows only)
+- Checkpointed, resumable sampling (draws written to disk in blocks)
+- Posterior summaries computed per variable on first access, then cached
+- Lazily computed per-parameter diagnostics table shared by summary() and reports
+- One SamplerConfig of sampling / inference / checkpoint options for both models
+- Broadcast scenario grid over price changes x discounts x retailers
+- Compound, vectorized probability statements with parse caching
+- All-pairs group comparison matrix (one broadcast over the group axis)
+- Slim, picklable results (to_bytes / from_bytes, optional float32 posterior)
+- Results.from_artifacts: lazy trace.nc loading with stored group labels
+- Named `retailer` dims / coords in hierarchical traces, O(1) label lookup
+- Trimmed, compressed trace export (groups, float32, zlib/blosc, thinning)
 - Comprehensive results with uncertainty quantification
 - Revenue scenario calculations
 - Probability statements
@@ -18,15 +38,36 @@ Usage:
     model = HierarchicalBayesianModel()
     results = model.fit(df)
     print(results.summary())
+
+    # Shared sampling options
+    sampler = SamplerConfig(n_samples=1000, n_chains=2, adaptive=True)
+    model = HierarchicalBayesianModel(sampler=sampler, parameterization='auto')
 """
 
 import numpy as np
 import pandas as pd
 import pymc as pm
+import pytensor.tensor as pt
+from pymc.blocking import DictToArrayBijection
+from pymc.initial_point import make_initial_point_fn
+from pymc.model.fgraph import clone_model
+from pymc.step_methods.hmc.quadpotential import QuadPotentialDiagAdapt
 import arviz as az
-from typing import Dict, Optional, List, Callable
-from dataclasses import dataclass
+from arviz.labels import BaseLabeller
+import xarray as xr
+from typing import Dict, Optional, List, Callable, Tuple
+from dataclasses import dataclass, fields, replace
+import ast
+import functools
+import importlib.util
+import itertools
+import json
 import logging
+import os
+import pickle
+import sys
+import threading
+import time
 import warnings
 
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -138,6 +179,8 @@ class PriorLibrary:
 class PosteriorSummary:
     """Summary statistics for a posterior distribution"""
     
+    __slots__ = ('mean', 'median', 'std', 'ci_lower', 'ci_upper')
+    
     mean: float
     median: float
     std: float
@@ -148,6 +191,216 @@ class PosteriorSummary:
         return f"{self.mean:.3f} [{self.ci_lower:.3f}, {self.ci_upper:.3f}]"
 
 
+def _column_stats(values: np.ndarray, ci_prob: float = 0.95) -> Dict[str, np.ndarray]:
+    """Mean / median / std / central CI of each column of a (chain, draw, k) sample array"""
+    tail = (1.0 - ci_prob) / 2.0
+    median, ci_lower, ci_upper = np.quantile(values, [0.5, tail, 1.0 - tail], axis=(0, 1))
+    return {
+        'mean': values.mean(axis=(0, 1)),
+        'median': median,
+        'std': values.std(axis=(0, 1)),
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper,
+    }
+
+
+def _summarize_posterior(posterior: xr.Dataset, ci_prob: float = 0.95) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Summary statistics of every posterior variable in one vectorized pass.
+
+    All variables are laid side by side as columns of a single (chain, draw, k)
+    array, so mean, std and one multi-quantile call cover every parameter and
+    group at once; the columns are then split back into each variable's shape.
+    """
+    n_chain, n_draw = posterior.sizes['chain'], posterior.sizes['draw']
+    names, shapes, columns = [], [], []
+    for name, da in posterior.data_vars.items():
+        values = np.asarray(da.values, dtype=float)
+        names.append(name)
+        shapes.append(values.shape[2:])
+        columns.append(values.reshape(n_chain, n_draw, -1))
+    if not columns:
+        return {}
+
+    stats = _column_stats(np.concatenate(columns, axis=2), ci_prob)
+    out, start = {}, 0
+    for name, shape in zip(names, shapes):
+        stop = start + int(np.prod(shape, dtype=int))
+        out[name] = {stat: col[start:stop].reshape(shape) for stat, col in stats.items()}
+        start = stop
+    return out
+
+
+_COMPARE_OPS = {ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater, ast.GtE: np.greater_equal}
+_ARITH_OPS = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide, ast.Pow: np.power}
+_FUNCTIONS = {'abs': np.abs, 'exp': np.exp, 'log': np.log}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_statement(statement: str) -> ast.AST:
+    """
+    Parse and validate a probability statement (cached across calls and results).
+
+    Allowed: variables, `var[label]` / `var[0]` for group elements, numbers,
+    + - * / **, abs / exp / log, comparisons (< <= > >=, chained), and / or / not.
+    """
+    try:
+        tree = ast.parse(statement.strip(), mode='eval').body
+    except SyntaxError as e:
+        raise ValueError(f"Cannot parse probability statement {statement!r}: {e.msg}") from None
+
+    def _check(node):
+        if isinstance(node, ast.BoolOp) or (isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub))):
+            children = node.values if isinstance(node, ast.BoolOp) else [node.operand]
+        elif isinstance(node, ast.Compare) and all(type(op) in _COMPARE_OPS for op in node.ops):
+            children = [node.left] + node.comparators
+        elif isinstance(node, ast.BinOp) and type(node.op) in _ARITH_OPS:
+            children = [node.left, node.right]
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+              and node.func.id in _FUNCTIONS and len(node.args) == 1 and not node.keywords):
+            children = node.args
+        elif isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name):
+            label = node.slice
+            if not (isinstance(label, ast.Name) or (isinstance(label, ast.Constant)
+                                                   and isinstance(label.value, (int, str)))):
+                raise ValueError(f"Unsupported index in {statement!r}: {ast.unparse(label)}")
+            children = []
+        elif isinstance(node, ast.Name) or (isinstance(node, ast.Constant) and isinstance(node.value, (int, float))):
+            children = []
+        else:
+            raise ValueError(f"Unsupported expression in {statement!r}: {ast.unparse(node)}")
+        for child in children:
+            _check(child)
+
+    _check(tree)
+    return tree
+
+
+DEFAULT_PRICE_CHANGES = (-5, -3, -1, 1, 3, 5)
+DEFAULT_DISCOUNTS = (5, 10, 15, 20)
+PROMO_VOLUME_MODELS = ('linear', 'exponential')
+# Group elasticity types of compare_groups / compare_all_groups
+ELASTICITY_TYPES = ('base', 'promo')
+
+# Scenario group for the hierarchical global-mean elasticity (mu_global_*). Only
+# evaluated when requested explicitly; 'Overall' pools the draws of all retailers.
+GLOBAL_MEAN_GROUP = 'Global mean'
+
+
+def scenario_impacts(
+    samples: Dict[str, np.ndarray],
+    price_changes_pct,
+    exponential: bool = False,
+    ci_prob: float = 0.95,
+) -> pd.DataFrame:
+    """
+    Volume and revenue impact of every price change for every group in one broadcast.
+
+    Elasticity draws (draws x groups) are combined with the price changes into a
+    (draws x scenarios x groups) array; mean, CI and P(revenue > 0) are reduced over
+    the draw axis in one call each (one broadcast per distinct draw count).
+
+    Parameters:
+    ----------
+    samples : dict
+        group name -> flattened elasticity draws
+    price_changes_pct : array-like
+        Price changes in percent (negative for discounts)
+    exponential : bool
+        Volume change exp(e * dp) - 1 (exact for a log-sales model) instead of the
+        linear e * dp approximation
+
+    Returns:
+    -------
+    pd.DataFrame
+        One row per (group, price change), groups in the order given
+    """
+    names = list(samples)
+    pct = np.asarray(price_changes_pct, dtype=float)
+
+    # Groups with the same number of draws share one broadcast ('Overall' pools the
+    # draws of every retailer, so it is longer than each retailer's own)
+    blocks: Dict[int, List[str]] = {}
+    for name in names:
+        blocks.setdefault(len(samples[name]), []).append(name)
+    columns_by_name = {}
+    for block in blocks.values():
+        elasticity = np.stack([np.asarray(samples[name], dtype=float) for name in block], axis=1)
+        columns = _impact_columns(elasticity, pct, exponential, ci_prob)
+        for i, name in enumerate(block):
+            columns_by_name[name] = {col: values[:, i] for col, values in columns.items()}
+
+    # (scenarios, groups) -> group-major rows
+    table = pd.DataFrame({
+        'group': np.repeat(names, len(pct)),
+        'price_change_pct': np.tile(pct, len(names)),
+        **{col: np.concatenate([columns_by_name[name][col] for name in names])
+           for col in columns_by_name[names[0]]},
+    })
+    return table
+
+
+def _impact_columns(elasticity: np.ndarray, pct: np.ndarray, exponential: bool, ci_prob: float) -> Dict[str, np.ndarray]:
+    """Impact statistics of (draws x groups) elasticities, each a (scenarios, groups) array"""
+    e = elasticity[:, None, :]            # (draws, 1, groups)
+    dp = pct[None, :, None]               # (1, scenarios, 1)
+    volume = np.expm1(e * dp / 100.0) * 100.0 if exponential else e * dp
+    revenue = ((1 + volume / 100.0) * (1 + dp / 100.0) - 1) * 100.0
+
+    tail = (1.0 - ci_prob) / 2.0
+    volume_q = np.quantile(volume, [tail, 1.0 - tail], axis=0)
+    revenue_q = np.quantile(revenue, [tail, 1.0 - tail], axis=0)
+    return {
+        'volume_impact_mean': volume.mean(axis=0),
+        'volume_impact_ci_lower': volume_q[0],
+        'volume_impact_ci_upper': volume_q[1],
+        'revenue_impact_mean': revenue.mean(axis=0),
+        'revenue_impact_ci_lower': revenue_q[0],
+        'revenue_impact_ci_upper': revenue_q[1],
+        'probability_positive': (revenue > 0).mean(axis=0),
+    }
+
+
+def _results_config(model) -> Dict:
+    """
+    Plain fitting settings (numbers, strings, flags) of a model for its results.
+
+    Results used to keep the model's whole __dict__, which drags the pm.Model,
+    the trace, compiled functions and the logger into every results object.
+    """
+    return {
+        key: value for key, value in vars(model).items()
+        if not key.startswith('_') and (value is None or isinstance(value, (bool, int, float, str)))
+    }
+
+
+# Named group axis of hierarchical traces; its coords are the retailer labels
+GROUP_DIM = 'retailer'
+
+
+def _label_key(label) -> str:
+    """Lookup key for a group label: case and punctuation insensitive ("BJ's" == "BJs")"""
+    return ''.join(ch for ch in str(label).lower() if ch.isalnum())
+
+
+def _stored_groups(trace: az.InferenceData, data: Optional[pd.DataFrame] = None) -> Optional[List[str]]:
+    """
+    Group labels of a saved hierarchical trace, in the order of its group axis.
+
+    Traces from fit() / update() carry them as `retailer` coords (and in
+    `posterior.attrs['retailers']`); older traces fall back to the sorted Retailer
+    categories of the prepared data, which is how the group index was built.
+    """
+    if GROUP_DIM in trace.posterior.coords:
+        return [str(g) for g in trace.posterior[GROUP_DIM].values]
+    stored = trace.posterior.attrs.get('retailers')
+    if stored is not None:
+        return [str(g) for g in json.loads(stored)]
+    if data is not None and 'Retailer' in data.columns:
+        return [str(g) for g in pd.Categorical(data['Retailer'].astype(str)).categories]
+    return None
+
+
 class BayesianResults:
     """
     Results container for Bayesian elasticity models
@@ -164,148 +417,303 @@ class BayesianResults:
         self.trace = trace
         self.model = model
         self.data = data
+        self.n_observations = len(data)
         self.config = config
         self.priors = priors
-        
-        # Extract posteriors
-        self._extract_posteriors()
-        
-        # Check convergence
-        self._check_convergence()
+        self._posterior_stats = {}
+        self._pooled_stats = {}
+        self._diagnostics = None
+        self._draw_cache = {}
+        self.inference_method = self.trace.posterior.attrs.get('inference_method', 'nuts')
+
+        # Convergence thresholds from the fitting config (defaults 1.01 / 400). Summaries
+        # and convergence diagnostics are computed on first access.
+        self.max_rhat = float((self.config or {}).get('max_rhat', 1.01))
+        self.min_ess = float((self.config or {}).get('min_ess', 400))
     
-    def _extract_posteriors(self):
-        """Extract posterior summaries"""
+    @classmethod
+    def from_artifacts(cls, run_dir: str, data: Optional[pd.DataFrame] = None) -> 'BayesianResults':
+        """
+        Results of a previous run from its output directory (trace.nc + prepared_data.csv).
+
+        The netCDF file is opened lazily: a variable is read from disk only when it is
+        first accessed, and summaries / convergence checks are computed per variable on
+        first use, so trace groups and variables that reports never touch are never
+        loaded. When the run saved diagnostics.csv, the diagnostics table is read from
+        it instead of being recomputed over the whole posterior. Called on
+        BayesianResults, a hierarchical trace returns HierarchicalResults; group labels
+        come from the trace's stored retailer coords / attrs, falling back to the sorted
+        Retailer categories of prepared_data.csv for older traces. `data` (the prepared
+        frame) replaces prepared_data.csv; a FileNotFoundError is raised without either.
 
-        # V2: Base price elasticity (preferred). Fall back to V1 `elasticity_own` if needed.
-        if 'base_elasticity' in self.trace.posterior:
-            base_samples = self.trace.posterior['base_elasticity'].values.flatten()
-        else:
-            base_samples = self.trace.posterior['elasticity_own'].values.flatten()
-
-        self.base_elasticity = PosteriorSummary(
-            mean=base_samples.mean(),
-            median=np.median(base_samples),
-            std=base_samples.std(),
-            ci_lower=np.percentile(base_samples, 2.5),
-            ci_upper=np.percentile(base_samples, 97.5),
-        )
-        self.base_elasticity_samples = base_samples
-
-        # V2: Promotional elasticity (coefficient on promo-depth / price-change during promos)
-        # May be absent in legacy traces.
-        if 'promo_elasticity' in self.trace.posterior:
-            promo_samples = self.trace.posterior['promo_elasticity'].values.flatten()
-            self.promo_elasticity = PosteriorSummary(
-                mean=promo_samples.mean(),
-                median=np.median(promo_samples),
-                std=promo_samples.std(),
-                ci_lower=np.percentile(promo_samples, 2.5),
-                ci_upper=np.percentile(promo_samples, 97.5),
-            )
-            self.promo_elasticity_samples = promo_samples
-        else:
-            self.promo_elasticity = None
-            self.promo_elasticity_samples = None
-
-        # Backwards-compat aliases
-        self.elasticity_own = self.base_elasticity
-        self.elasticity_own_samples = self.base_elasticity_samples
-        
-        # Cross-price elasticity
-        if 'elasticity_cross' in self.trace.posterior:
-            samples = self.trace.posterior['elasticity_cross'].values.flatten()
-            self.elasticity_cross = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5)
-            )
+        Example:
+        -------
+        >>> results = BayesianResults.from_artifacts('./results_v4_tune3000')
+        """
+        run_dir = os.fspath(run_dir)
+        trace_path = os.path.join(run_dir, 'trace.nc')
+        if not os.path.exists(trace_path):
+            raise FileNotFoundError(f"Missing trace file: {trace_path}")
+        with az.rc_context({'data.load': 'lazy'}):
+            trace = az.from_netcdf(trace_path)
+
+        if data is None:
+            data_path = os.path.join(run_dir, 'prepared_data.csv')
+            if not os.path.exists(data_path):
+                raise FileNotFoundError(f"Missing prepared data: {data_path} (or pass data=)")
+            data = pd.read_csv(data_path)
+
+        config = {'loaded_from': trace_path}
+        posterior = trace.posterior
+        hierarchical = 'mu_global_base' in posterior or 'mu_global_own' in posterior
+        if cls is BayesianResults and not hierarchical:
+            results = cls(trace=trace, model=None, data=data, config=config, priors={})
         else:
-            self.elasticity_cross = None
-        
+            groups = _stored_groups(trace, data)
+            if groups is None:
+                raise ValueError(f"Cannot restore group labels for {trace_path}: no stored retailers "
+                                 "and no Retailer column in prepared_data.csv")
+            results = HierarchicalResults(trace=trace, model=None, data=data, config=config, priors={}, groups=groups)
+
+        diagnostics_path = os.path.join(run_dir, 'diagnostics.csv')
+        if os.path.exists(diagnostics_path):
+            table = pd.read_csv(diagnostics_path, index_col=0)
+            table.attrs['n_divergences'] = None if results._approximate else _divergence_count(trace)
+            results._diagnostics = table
+        return results
+
+    # ------------------------------------------------------------------
+    # Posterior summaries (computed on first access, one variable at a time)
+    # ------------------------------------------------------------------
+
+    @property
+    def _base_var(self) -> str:
+        # V2: Base price elasticity (preferred). Fall back to V1 `elasticity_own` if needed.
+        return 'base_elasticity' if 'base_elasticity' in self.trace.posterior else 'elasticity_own'
+
+    @functools.cached_property
+    def base_elasticity(self) -> Optional[PosteriorSummary]:
+        return self.posterior_summary(self._base_var)
+
+    @functools.cached_property
+    def promo_elasticity(self) -> Optional[PosteriorSummary]:
+        # V2: coefficient on promo depth; may be absent in legacy traces
+        return self.posterior_summary('promo_elasticity')
+
+    @functools.cached_property
+    def elasticity_cross(self) -> Optional[PosteriorSummary]:
+        return self.posterior_summary('elasticity_cross')
+
+    @functools.cached_property
+    def beta_promo(self) -> Optional[PosteriorSummary]:
         # Legacy: Promo effect (V1)
-        if 'beta_promo' in self.trace.posterior:
-            samples = self.trace.posterior['beta_promo'].values.flatten()
-            self.beta_promo = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5)
-            )
-        else:
-            self.beta_promo = None
-        
-        # Seasonal effects
-        self.seasonal_effects = {}
+        return self.posterior_summary('beta_promo')
+
+    @functools.cached_property
+    def seasonal_effects(self) -> Dict[str, PosteriorSummary]:
+        effects = {}
         for season in ['spring', 'summer', 'fall']:
-            param = f'beta_{season}'
-            if param in self.trace.posterior:
-                samples = self.trace.posterior[param].values.flatten()
-                self.seasonal_effects[season.capitalize()] = PosteriorSummary(
-                    mean=samples.mean(),
-                    median=np.median(samples),
-                    std=samples.std(),
-                    ci_lower=np.percentile(samples, 2.5),
-                    ci_upper=np.percentile(samples, 97.5)
-                )
+            summary = self.posterior_summary(f'beta_{season}')
+            if summary is not None:
+                effects[season.capitalize()] = summary
+        return effects
+
+    @functools.cached_property
+    def beta_time_trend(self) -> Optional[PosteriorSummary]:
+        return self.posterior_summary('beta_time')
+
+    @functools.cached_property
+    def base_elasticity_samples(self) -> np.ndarray:
+        """Flattened base elasticity draws (a view into the trace)"""
+        return self.trace.posterior[self._base_var].values.reshape(-1)
+
+    @functools.cached_property
+    def promo_elasticity_samples(self) -> Optional[np.ndarray]:
+        posterior = self.trace.posterior
+        return posterior['promo_elasticity'].values.reshape(-1) if 'promo_elasticity' in posterior else None
+
+    # Backwards-compat aliases
+    @property
+    def elasticity_own(self) -> Optional[PosteriorSummary]:
+        return self.base_elasticity
+
+    @property
+    def elasticity_own_samples(self) -> np.ndarray:
+        return self.base_elasticity_samples
+
+    # ------------------------------------------------------------------
+    # Slim serialization (pickle / worker processes)
+    # ------------------------------------------------------------------
+
+    def _slim_state(self, var_names: Optional[List[str]] = None, float32: bool = False) -> Dict:
+        """
+        Array-backed state: summaries, settings and the posterior arrays of `var_names`
+        (default: every variable except non-centered `*_offset` internals).
+        The pm.Model, the full trace and the data frame are left out.
+        """
+        posterior = self.trace.posterior
+        if var_names is None:
+            var_names = [name for name in posterior.data_vars if not name.endswith('_offset')]
+        dtype = np.float32 if float32 else None
+
+        variables = {}
+        for name in var_names:
+            da = posterior[name]
+            values = np.asarray(da.values)
+            variables[name] = (da.dims, values.astype(dtype) if dtype is not None and values.dtype.kind == 'f' else values)
+        dims = {dim for name in var_names for dim in posterior[name].dims}
+        coords = {dim: posterior[dim].values for dim in dims if dim in posterior.coords}
+
+        diverging = None
+        if 'sample_stats' in self.trace.groups() and 'diverging' in self.trace.sample_stats:
+            diverging = np.asarray(self.trace.sample_stats['diverging'].values)
+
+        skip = {'trace', 'model', 'data', '_draw_cache',
+                'base_elasticity_samples', 'promo_elasticity_samples', 'elasticity_own_samples'}
+        return {
+            'attributes': {k: v for k, v in self.__dict__.items() if k not in skip},
+            'posterior': variables,
+            'coords': coords,
+            'posterior_attrs': dict(posterior.attrs),
+            'diverging': diverging,
+        }
+
+    def __getstate__(self):
+        return self._slim_state()
 
-        # Time trend
-        if 'beta_time' in self.trace.posterior:
-            samples = self.trace.posterior['beta_time'].values.flatten()
-            self.beta_time_trend = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5)
+    def __setstate__(self, state):
+        self.__dict__.update(state['attributes'])
+        self.model = None
+        self.data = None
+        self._draw_cache = {}
+
+        posterior = xr.Dataset(state['posterior'], coords=state['coords'], attrs=state['posterior_attrs'])
+        groups = {'posterior': posterior}
+        if state['diverging'] is not None:
+            groups['sample_stats'] = xr.Dataset(
+                {'diverging': (('chain', 'draw'), state['diverging'])},
+                coords={'chain': posterior['chain'].values, 'draw': posterior['draw'].values},
             )
-        else:
-            self.beta_time_trend = None
-    
-    def _check_convergence(self):
-        """Check MCMC convergence"""
-
-        def _stat_max(x) -> float:
-            """
-            ArviZ returns xarray objects (Dataset/DataArray). We need a single scalar.
-            Convert to a single array and take a numeric max.
-            """
-            try:
-                # Dataset -> DataArray via to_array()
-                if hasattr(x, "to_array"):
-                    x = x.to_array()
-                arr = np.asarray(getattr(x, "values", x), dtype=float)
-                return float(np.nanmax(arr))
-            except Exception:
-                # Last resort: try a direct float conversion
-                return float(x)
+        self.trace = az.InferenceData(**groups)
 
-        def _stat_min(x) -> float:
-            """See `_stat_max`."""
-            try:
-                if hasattr(x, "to_array"):
-                    x = x.to_array()
-                arr = np.asarray(getattr(x, "values", x), dtype=float)
-                return float(np.nanmin(arr))
-            except Exception:
-                return float(x)
+    def to_bytes(self, var_names: Optional[List[str]] = None, float32: bool = False) -> bytes:
+        """
+        Compact serialized results for sending to worker processes.
+
+        Only summaries, settings and the posterior arrays of `var_names` are kept
+        (optionally as float32); `from_bytes` restores a results object whose
+        summaries, scenario / probability methods, plots and reports all work.
+        Plain `pickle.dumps(results)` uses the same slim state (all variables, float64).
+        """
+        return pickle.dumps((type(self), self._slim_state(var_names, float32)), protocol=pickle.HIGHEST_PROTOCOL)
 
-        # R-hat (maximum across all parameters)
-        rhat = az.rhat(self.trace)
-        self.rhat_max = _stat_max(rhat)
+    @staticmethod
+    def from_bytes(payload: bytes) -> 'BayesianResults':
+        """Inverse of `to_bytes`"""
+        cls, state = pickle.loads(payload)
+        results = cls.__new__(cls)
+        results.__setstate__(state)
+        return results
 
-        # ESS (minimum across all parameters)
-        ess = az.ess(self.trace)
-        self.ess_min = _stat_min(ess)
+    def posterior_stats(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Mean / median / std / 95% CI of every posterior variable, computed once and cached.
 
-        # Divergences
-        divergences = self.trace.sample_stats.diverging.sum().values
-        self.n_divergences = int(np.asarray(divergences).item() if np.asarray(divergences).shape == () else np.asarray(divergences).sum())
-        
-        # Overall convergence
-        self.converged = (self.rhat_max < 1.01 and self.ess_min > 400 and self.n_divergences == 0)
+        Returns:
+        -------
+        Dict
+            variable -> {'mean', 'median', 'std', 'ci_lower', 'ci_upper'}, each an
+            array with the variable's non-sample shape (e.g. one value per retailer)
+        """
+        posterior = self.trace.posterior
+        missing = [name for name in posterior.data_vars if name not in self._posterior_stats]
+        if missing:
+            self._posterior_stats.update(_summarize_posterior(posterior[missing]))
+        return self._posterior_stats
+
+    def _variable_stats(self, var: str) -> Optional[Dict[str, np.ndarray]]:
+        """posterior_stats() entry of one variable, reading only that variable"""
+        if var not in self._posterior_stats:
+            if var not in self.trace.posterior:
+                return None
+            self._posterior_stats.update(_summarize_posterior(self.trace.posterior[[var]]))
+        return self._posterior_stats[var]
+
+    def posterior_summary(self, var: str, index=None) -> Optional[PosteriorSummary]:
+        """
+        PosteriorSummary of a scalar variable, or of element `index` of a vector one
+        (all elements pooled when no index is given). Returns None when the variable
+        is not in the trace.
+        """
+        stats = self._variable_stats(var)
+        if stats is None:
+            return None
+        if index is None and stats['mean'].ndim:
+            # Non-scalar variable without an index: pool all of its elements
+            # (e.g. base_elasticity across retailers), as the flattened samples did
+            if var not in self._pooled_stats:
+                values = np.asarray(self.trace.posterior[var].values, dtype=float)
+                self._pooled_stats[var] = _column_stats(values.reshape(values.shape[0], -1, 1))
+            stats, index = self._pooled_stats[var], 0
+        key = () if index is None else index
+        return PosteriorSummary(**{stat: float(values[key]) for stat, values in stats.items()})
+    
+    # ------------------------------------------------------------------
+    # Convergence (computed on first access)
+    # ------------------------------------------------------------------
+
+    @property
+    def _approximate(self) -> bool:
+        # Approximate posteriors (ADVI / Pathfinder) are independent draws from a fitted
+        # approximation: R-hat, ESS and divergences are not defined for them.
+        return self.inference_method in APPROXIMATE_INFERENCE_METHODS
+
+    @functools.cached_property
+    def rhat_max(self) -> Optional[float]:
+        """Maximum R-hat across all parameters"""
+        return None if self._approximate else float(np.nanmax(self.diagnostics()['r_hat'].values))
+
+    @functools.cached_property
+    def ess_min(self) -> Optional[float]:
+        """Minimum bulk ESS across all parameters"""
+        return None if self._approximate else float(np.nanmin(self.diagnostics()['ess_bulk'].values))
+
+    @functools.cached_property
+    def n_divergences(self) -> Optional[int]:
+        """Divergent transitions (read from sample_stats; no diagnostics table needed)"""
+        if self._approximate:
+            return None
+        if self._diagnostics is not None:
+            return self._diagnostics.attrs['n_divergences']
+        return _divergence_count(self.trace)
+
+    @functools.cached_property
+    def converged(self) -> Optional[bool]:
+        """R-hat / ESS within the configured thresholds and no divergences (None for approximate inference)"""
+        if self._approximate:
+            return None
+        return bool(self.rhat_max < self.max_rhat and self.ess_min > self.min_ess and self.n_divergences == 0)
+
+    def diagnostics(self) -> pd.DataFrame:
+        """
+        Per-parameter MCMC diagnostics, computed on first use and cached.
+
+        One row per scalar parameter (ArviZ labels, e.g. `base_elasticity[0]`) with
+        columns r_hat, ess_bulk, ess_tail, mcse_mean, mcse_sd; the total number of
+        divergent transitions is in `.attrs['n_divergences']`. For approximate
+        inference the diagnostic columns are NaN and the divergence count is None.
+        Convergence checks, summary() and both HTML reports read from this table.
+        """
+        if self._diagnostics is None:
+            columns = ['r_hat', 'ess_bulk', 'ess_tail', 'mcse_mean', 'mcse_sd']
+            if self.trace.posterior.attrs.get('inference_method', 'nuts') in APPROXIMATE_INFERENCE_METHODS:
+                table = pd.DataFrame(np.nan, index=_parameter_labels(self.trace.posterior), columns=columns)
+                table.attrs['n_divergences'] = None
+            else:
+                table = az.summary(self.trace, kind='diagnostics', round_to=None)[columns]
+                table.attrs['n_divergences'] = _divergence_count(self.trace)
+            self._diagnostics = table
+        return self._diagnostics
     
     def summary(self) -> str:
         """Print summary"""
@@ -316,19 +724,26 @@ class BayesianResults:
         lines.append("="*80)
         
         # Convergence
-        if self.converged:
+        if self.converged is None:
+            lines.append(f"\nℹ️  Approximate inference ({self.inference_method}): "
+                         "R-hat / ESS / divergence diagnostics do not apply")
+            lines.append("  → Use as a fast preview; confirm with a full MCMC run")
+        elif self.converged:
             lines.append("\n✓ Model converged successfully")
         else:
             lines.append("\n⚠️  Convergence warnings:")
-            if self.rhat_max >= 1.01:
-                lines.append(f"  - Max R-hat: {self.rhat_max:.4f} (should be < 1.01)")
-            if self.ess_min <= 400:
-                lines.append(f"  - Min ESS: {self.ess_min:.0f} (should be > 400)")
+            table = self.diagnostics()
+            if self.rhat_max >= self.max_rhat:
+                lines.append(f"  - Max R-hat: {self.rhat_max:.4f} (should be < {self.max_rhat}) "
+                             f"at {table['r_hat'].idxmax()}")
+            if self.ess_min <= self.min_ess:
+                lines.append(f"  - Min ESS: {self.ess_min:.0f} (should be > {self.min_ess:.0f}) "
+                             f"at {table['ess_bulk'].idxmin()}")
             if self.n_divergences > 0:
                 lines.append(f"  - Divergences: {self.n_divergences} (should be 0)")
         
         # Sample info
-        lines.append(f"\nObservations: {len(self.data)}")
+        lines.append(f"\nObservations: {self.n_observations}")
         lines.append(f"Chains: {self.trace.posterior.dims['chain']}")
         lines.append(f"Samples per chain: {self.trace.posterior.dims['draw']}")
         
@@ -376,32 +791,94 @@ class BayesianResults:
         
         return "\n".join(lines)
     
-    def probability(self, statement: str) -> float:
+    def probability(self, statement):
         """
-        Calculate probability of a statement
+        Posterior probability of a statement, or of each statement in a list
+        
+        Statements are Python-like expressions over posterior variables, evaluated
+        vectorized over all draws. Group elements are addressed by label or position
+        (`base_elasticity[Costco]`, `base_elasticity["Sam's Club"]`, `base_elasticity[0]`);
+        a vector variable without an index pools all of its elements.
         
         Example:
         -------
-        >>> prob = results.probability('elasticity_own < -2.0')
+        >>> prob = results.probability('base_elasticity < -2.0')
         >>> print(f"P(elasticity < -2.0) = {prob:.1%}")
-        """
-        
-        if '<' in statement:
-            var, threshold = statement.split('<')
-            var = var.strip()
-            threshold = float(threshold.strip())
-            samples = self.trace.posterior[var].values.flatten()
-            return (samples < threshold).mean()
+        >>> results.probability('base_elasticity[Costco] < base_elasticity[BJs] and promo_elasticity < -2')
+        >>> results.probability(['abs(promo_elasticity) > 2 * abs(base_elasticity)', 'elasticity_cross > 0'])
         
-        elif '>' in statement:
-            var, threshold = statement.split('>')
-            var = var.strip()
-            threshold = float(threshold.strip())
-            samples = self.trace.posterior[var].values.flatten()
-            return (samples > threshold).mean()
-        
-        else:
-            raise ValueError("Statement must contain '<' or '>'")
+        Returns:
+        -------
+        float, or pd.Series indexed by statement when a list is given
+        """
+        if not isinstance(statement, str):
+            return pd.Series({s: self.probability(s) for s in statement}, dtype=float)
+
+        result = self._evaluate(_parse_statement(statement))
+        if np.asarray(result).dtype != bool:
+            raise ValueError(f"Statement must be a comparison (e.g. 'base_elasticity < -2'): {statement!r}")
+        return float(np.mean(result))
+
+    def _evaluate(self, node):
+        """Evaluate a validated statement tree over the posterior draws"""
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self._draws(node.id)
+        if isinstance(node, ast.Subscript):
+            label = node.slice.id if isinstance(node.slice, ast.Name) else node.slice.value
+            return self._draws(node.value.id, label)
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return functools.reduce(combine, (self._evaluate(v) for v in node.values))
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand)
+            return np.logical_not(operand) if isinstance(node.op, ast.Not) else np.negative(operand)
+        if isinstance(node, ast.BinOp):
+            return _ARITH_OPS[type(node.op)](self._evaluate(node.left), self._evaluate(node.right))
+        if isinstance(node, ast.Call):
+            return _FUNCTIONS[node.func.id](self._evaluate(node.args[0]))
+
+        # Comparison, possibly chained: a < b < c == (a < b) and (b < c)
+        left = self._evaluate(node.left)
+        result = None
+        for op, comparator in zip(node.ops, node.comparators):
+            right = self._evaluate(comparator)
+            step = _COMPARE_OPS[type(op)](left, right)
+            result = step if result is None else np.logical_and(result, step)
+            left = right
+        return result
+
+    def _draws(self, var: str, label=None) -> np.ndarray:
+        """
+        Draws of a variable as a (n_draws, k) array (k = 1 for scalars / one element),
+        cached so repeated statements never re-flatten the posterior.
+        """
+        key = (var, label)
+        if key not in self._draw_cache:
+            posterior = self.trace.posterior
+            if var not in posterior:
+                raise ValueError(f"Unknown variable {var!r}. Available: {list(posterior.data_vars)}")
+            values = posterior[var].values
+            values = values.reshape(values.shape[0] * values.shape[1], -1)
+            if label is not None:
+                position = self._element_position(var, label, values.shape[1])
+                values = values[:, position:position + 1]
+            self._draw_cache[key] = values
+        return self._draw_cache[key]
+
+    def _element_position(self, var: str, label, size: int) -> int:
+        """Position of a group element given its label or integer position"""
+        if isinstance(label, int):
+            if not 0 <= label < size:
+                raise ValueError(f"Index {label} out of range for {var!r} ({size} elements)")
+            return label
+
+        positions = getattr(self, '_group_positions', {})
+        position = positions.get(str(label), positions.get(_label_key(label)))
+        if position is None or size != len(self.groups):
+            raise ValueError(f"Unknown group {label!r} for {var!r}. Groups: {[str(g) for g in getattr(self, 'groups', [])]}")
+        return position
     
     def compare_elasticities(self) -> Dict:
         """
@@ -424,6 +901,90 @@ class BayesianResults:
             'probability_promo_more_responsive': float((np.abs(promo) > np.abs(base)).mean()),
         }
 
+    def _elasticity_samples(self, kind: str = 'base') -> Dict[str, np.ndarray]:
+        """Flattened elasticity draws per scenario group ('base' or 'promo')"""
+        samples = self.base_elasticity_samples if kind == 'base' else self.promo_elasticity_samples
+        return {} if samples is None else {'Overall': samples}
+
+    def scenario_grid(
+        self,
+        price_changes=None,
+        discounts=None,
+        groups: Optional[List[str]] = None,
+        promo_volume: str = 'linear',
+        ci_prob: float = 0.95,
+    ) -> pd.DataFrame:
+        """
+        Revenue impact of a grid of base price changes and promotional discounts.
+
+        Every (scenario, group) pair is evaluated in one broadcast over the posterior
+        draws, so a dense 1%-step grid costs about the same as a handful of points.
+
+        Parameters:
+        ----------
+        price_changes : list of float, optional
+            Base price changes in percent (default: -5, -3, -1, 1, 3, 5); [] to skip
+        discounts : list of float, optional
+            Discount depths in percent off (default: 5, 10, 15, 20); [] to skip.
+            Skipped when promotional elasticity is not available.
+        groups : list of str, optional
+            'Overall' (draws pooled across retailers) and/or retailer names (default:
+            all of them). Hierarchical results also accept GLOBAL_MEAN_GROUP
+            ('Global mean'), the mu_global_* elasticity, which is never included by default.
+        promo_volume : str
+            'linear' (e * dp, as promo_impact) or 'exponential' (exp(e * dp) - 1)
+
+        Returns:
+        -------
+        pd.DataFrame
+            Columns: scenario ('base' / 'promo'), group, price_change_pct,
+            discount_depth_pct, volume/revenue impact mean and CI, probability_positive
+
+        Example:
+        -------
+        >>> grid = results.scenario_grid(price_changes=np.arange(-10, 11), discounts=[])
+        """
+        if promo_volume not in PROMO_VOLUME_MODELS:
+            raise ValueError(f"Unknown promo_volume: {promo_volume}. Options: {list(PROMO_VOLUME_MODELS)}")
+        price_changes = DEFAULT_PRICE_CHANGES if price_changes is None else price_changes
+        discounts = DEFAULT_DISCOUNTS if discounts is None else discounts
+
+        frames = []
+        for kind, values in (('base', price_changes), ('promo', discounts)):
+            samples = self._elasticity_samples(kind)
+            if len(values) == 0 or not samples:
+                continue
+            if groups is None:
+                samples = {g: draws for g, draws in samples.items() if g != GLOBAL_MEAN_GROUP}
+            else:
+                unknown = [g for g in groups if g not in samples]
+                if unknown:
+                    raise ValueError(f"Unknown groups: {unknown}. Available: {list(samples)}")
+                samples = {g: samples[g] for g in groups}
+
+            values = np.asarray(values, dtype=float)
+            pct = values if kind == 'base' else -np.abs(values)
+            table = scenario_impacts(samples, pct, exponential=(kind == 'promo' and promo_volume == 'exponential'),
+                                     ci_prob=ci_prob)
+            table.insert(0, 'scenario', kind)
+            table.insert(3, 'discount_depth_pct', np.nan if kind == 'base' else np.abs(table['price_change_pct']))
+            frames.append(table)
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _impact_dict(row: pd.Series) -> Dict:
+        """One scenario_grid row in the dict layout of base_price_impact / promo_impact"""
+        return {
+            'volume_impact_mean': float(row['volume_impact_mean']),
+            'volume_impact_ci': [float(row['volume_impact_ci_lower']), float(row['volume_impact_ci_upper'])],
+            'revenue_impact_mean': float(row['revenue_impact_mean']),
+            'revenue_impact_ci': [float(row['revenue_impact_ci_lower']), float(row['revenue_impact_ci_upper'])],
+            'probability_positive': float(row['probability_positive']),
+        }
+
     def base_price_impact(self, price_change_pct: float) -> Dict:
         """
         Revenue impact of a permanent/base price change using base price elasticity.
@@ -431,20 +992,8 @@ class BayesianResults:
         Uses multiplicative revenue math:
           revenue_multiplier = (1 + volume_change%) * (1 + price_change%)
         """
-        base_samples = self.base_elasticity_samples
-        volume_impact = base_samples * price_change_pct  # % volume change
-
-        revenue_multiplier = (1 + volume_impact / 100.0) * (1 + price_change_pct / 100.0)
-        revenue_impact = (revenue_multiplier - 1) * 100.0
-
-        return {
-            'price_change_pct': float(price_change_pct),
-            'volume_impact_mean': float(volume_impact.mean()),
-            'volume_impact_ci': [float(np.percentile(volume_impact, 2.5)), float(np.percentile(volume_impact, 97.5))],
-            'revenue_impact_mean': float(revenue_impact.mean()),
-            'revenue_impact_ci': [float(np.percentile(revenue_impact, 2.5)), float(np.percentile(revenue_impact, 97.5))],
-            'probability_positive': float((revenue_impact > 0).mean()),
-        }
+        row = self.scenario_grid(price_changes=[price_change_pct], discounts=[], groups=['Overall']).iloc[0]
+        return {'price_change_pct': float(price_change_pct), **self._impact_dict(row)}
 
     def promo_impact(self, discount_depth_pct: float) -> Dict:
         """
@@ -459,22 +1008,11 @@ class BayesianResults:
         if self.promo_elasticity_samples is None:
             raise ValueError("Promotional elasticity not available in this result.")
 
-        price_change_pct = -abs(float(discount_depth_pct))
-        promo_samples = self.promo_elasticity_samples
-
-        volume_impact = promo_samples * price_change_pct  # % volume change (negative * negative => positive)
-
-        revenue_multiplier = (1 + volume_impact / 100.0) * (1 + price_change_pct / 100.0)
-        revenue_impact = (revenue_multiplier - 1) * 100.0
-
+        row = self.scenario_grid(price_changes=[], discounts=[discount_depth_pct], groups=['Overall']).iloc[0]
         return {
             'discount_depth_pct': float(discount_depth_pct),
-            'price_change_pct': float(price_change_pct),
-            'volume_impact_mean': float(volume_impact.mean()),
-            'volume_impact_ci': [float(np.percentile(volume_impact, 2.5)), float(np.percentile(volume_impact, 97.5))],
-            'revenue_impact_mean': float(revenue_impact.mean()),
-            'revenue_impact_ci': [float(np.percentile(revenue_impact, 2.5)), float(np.percentile(revenue_impact, 97.5))],
-            'probability_positive': float((revenue_impact > 0).mean()),
+            'price_change_pct': float(row['price_change_pct']),
+            **self._impact_dict(row),
         }
 
     def revenue_impact(self, price_change_pct: float) -> Dict:
@@ -489,119 +1027,111 @@ class HierarchicalResults(BayesianResults):
     
     def __init__(self, trace, model, data, config, priors, groups):
         """Initialize hierarchical results"""
+        # Traces with a named `retailer` axis describe their own group order
+        if GROUP_DIM in trace.posterior.coords:
+            groups = [str(g) for g in trace.posterior[GROUP_DIM].values]
         self.groups = groups
+        # label (exact or normalized) -> position on the group axis, built once
+        self._group_positions = {}
+        for i, group in enumerate(groups):
+            self._group_positions.setdefault(_label_key(group), i)
+            self._group_positions[str(group)] = i
         super().__init__(trace, model, data, config, priors)
-        
-        # Extract group-specific results
-        self._extract_group_posteriors()
-    
-    def _extract_group_posteriors(self):
-        """Extract group-specific posteriors"""
-        is_v2 = 'mu_global_base' in self.trace.posterior and 'base_elasticity' in self.trace.posterior
-
-        if is_v2:
-            # Global base elasticity
-            samples = self.trace.posterior['mu_global_base'].values.flatten()
-            self.global_base_elasticity = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5),
-            )
-
-            # Global promo elasticity
-            samples = self.trace.posterior['mu_global_promo'].values.flatten()
-            self.global_promo_elasticity = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5),
-            )
-
-            # Between-group variance (base)
-            samples = self.trace.posterior['sigma_group_base'].values.flatten()
-            self.sigma_group_base = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5),
-            )
-
-            # Between-group variance (promo)
-            samples = self.trace.posterior['sigma_group_promo'].values.flatten()
-            self.sigma_group_promo = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5),
-            )
-
-            # Group-specific elasticities
-            self.group_base_elasticities = {}
-            self.group_promo_elasticities = {}
-
-            base_samples_3d = self.trace.posterior['base_elasticity'].values
-            promo_samples_3d = self.trace.posterior['promo_elasticity'].values
-
-            for i, group in enumerate(self.groups):
-                s_base = base_samples_3d[:, :, i].flatten()
-                s_promo = promo_samples_3d[:, :, i].flatten()
-                self.group_base_elasticities[group] = PosteriorSummary(
-                    mean=s_base.mean(),
-                    median=np.median(s_base),
-                    std=s_base.std(),
-                    ci_lower=np.percentile(s_base, 2.5),
-                    ci_upper=np.percentile(s_base, 97.5),
-                )
-                self.group_promo_elasticities[group] = PosteriorSummary(
-                    mean=s_promo.mean(),
-                    median=np.median(s_promo),
-                    std=s_promo.std(),
-                    ci_lower=np.percentile(s_promo, 2.5),
-                    ci_upper=np.percentile(s_promo, 97.5),
-                )
-
-            # Backwards-compat aliases
-            self.global_elasticity = self.global_base_elasticity
-            self.sigma_group = self.sigma_group_base
-            self.group_elasticities = self.group_base_elasticities
 
+    # ------------------------------------------------------------------
+    # Group summaries (computed on first access)
+    # ------------------------------------------------------------------
+
+    @property
+    def _is_v2(self) -> bool:
+        return 'mu_global_base' in self.trace.posterior and 'base_elasticity' in self.trace.posterior
+
+    def _by_group(self, var: str) -> Dict[str, PosteriorSummary]:
+        if var not in self.trace.posterior:
+            return {}
+        return {group: self.posterior_summary(var, i) for i, group in enumerate(self.groups)}
+
+    # V2: global elasticities and between-group variance
+    @functools.cached_property
+    def global_base_elasticity(self) -> Optional[PosteriorSummary]:
+        return self.posterior_summary('mu_global_base')
+
+    @functools.cached_property
+    def global_promo_elasticity(self) -> Optional[PosteriorSummary]:
+        return self.posterior_summary('mu_global_promo')
+
+    @functools.cached_property
+    def sigma_group_base(self) -> Optional[PosteriorSummary]:
+        return self.posterior_summary('sigma_group_base')
+
+    @functools.cached_property
+    def sigma_group_promo(self) -> Optional[PosteriorSummary]:
+        return self.posterior_summary('sigma_group_promo')
+
+    # V2: group-specific elasticities
+    @functools.cached_property
+    def group_base_elasticities(self) -> Dict[str, PosteriorSummary]:
+        return self._by_group('base_elasticity')
+
+    @functools.cached_property
+    def group_promo_elasticities(self) -> Dict[str, PosteriorSummary]:
+        return self._by_group('promo_elasticity')
+
+    # Backwards-compat aliases (legacy V1 variables for V1 traces)
+    @property
+    def global_elasticity(self) -> Optional[PosteriorSummary]:
+        return self.global_base_elasticity if self._is_v2 else self.posterior_summary('mu_global_own')
+
+    @property
+    def sigma_group(self) -> Optional[PosteriorSummary]:
+        return self.sigma_group_base if self._is_v2 else self.posterior_summary('sigma_group_own')
+
+    @property
+    def group_elasticities(self) -> Dict[str, PosteriorSummary]:
+        return self.group_base_elasticities if self._is_v2 else self._by_group('elasticity_own')
+    
+    def _elasticity_samples(self, kind: str = 'base') -> Dict[str, np.ndarray]:
+        """'Overall' (draws pooled across groups), one entry per group and GLOBAL_MEAN_GROUP"""
+        posterior = self.trace.posterior
+        if 'mu_global_base' in posterior:
+            global_var, var = f'mu_global_{kind}', f'{kind}_elasticity'
+        elif kind == 'base':
+            global_var, var = 'mu_global_own', 'elasticity_own'
         else:
-            # Legacy V1 hierarchical extraction
-            samples = self.trace.posterior['mu_global_own'].values.flatten()
-            self.global_elasticity = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5),
-            )
-
-            samples = self.trace.posterior['sigma_group_own'].values.flatten()
-            self.sigma_group = PosteriorSummary(
-                mean=samples.mean(),
-                median=np.median(samples),
-                std=samples.std(),
-                ci_lower=np.percentile(samples, 2.5),
-                ci_upper=np.percentile(samples, 97.5),
-            )
+            return {}
+        if var not in posterior:
+            return {}
+
+        values = posterior[var].values
+        samples = {'Overall': values.reshape(-1)}
+        for i, group in enumerate(self.groups):
+            samples[str(group)] = values[:, :, i].reshape(-1)
+        if global_var in posterior:
+            samples[GLOBAL_MEAN_GROUP] = posterior[global_var].values.reshape(-1)
+        return samples
+
+    def group_position(self, label) -> Optional[int]:
+        """Position of a retailer on the group axis (exact or normalized label), or None"""
+        return self._group_positions.get(str(label), self._group_positions.get(_label_key(label)))
+
+    def group_samples(self, var: str, group) -> np.ndarray:
+        """Flattened draws of one group's element of `var` (cached)"""
+        return self._draws(var, group)[:, 0]
+
+    def _group_var(self, elasticity_type: str) -> Optional[str]:
+        """
+        Posterior variable holding the group elasticities of a type ('base' / 'promo'),
+        None when this model did not estimate them
+        """
+        kind = str(elasticity_type).strip().lower()
+        if kind not in ELASTICITY_TYPES:
+            raise ValueError(f"Unknown elasticity_type: {elasticity_type}. Options: {list(ELASTICITY_TYPES)}")
+        if 'base_elasticity' in self.trace.posterior:
+            var = f'{kind}_elasticity'
+        else:
+            var = 'elasticity_own'
+        return var if var in self.trace.posterior else None
 
-            self.group_elasticities = {}
-            elasticity_samples = self.trace.posterior['elasticity_own'].values
-            for i, group in enumerate(self.groups):
-                s = elasticity_samples[:, :, i].flatten()
-                self.group_elasticities[group] = PosteriorSummary(
-                    mean=s.mean(),
-                    median=np.median(s),
-                    std=s.std(),
-                    ci_lower=np.percentile(s, 2.5),
-                    ci_upper=np.percentile(s, 97.5),
-                )
-    
     def compare_groups(self, group1: str, group2: str, elasticity_type: str = 'base') -> Dict:
         """
         Compare two groups statistically
@@ -611,17 +1141,11 @@ class HierarchicalResults(BayesianResults):
         Dict
             Comparison statistics
         """
-        
-        idx1 = list(self.groups).index(group1)
-        idx2 = list(self.groups).index(group2)
-        
-        if 'base_elasticity' in self.trace.posterior and elasticity_type.lower() in ['base', 'promo']:
-            var = 'base_elasticity' if elasticity_type.lower() == 'base' else 'promo_elasticity'
-        else:
-            var = 'elasticity_own'
-
-        samples1 = self.trace.posterior[var].values[:, :, idx1].flatten()
-        samples2 = self.trace.posterior[var].values[:, :, idx2].flatten()
+        var = self._group_var(elasticity_type)
+        if var is None:
+            raise ValueError(f"No {elasticity_type} group elasticities in this result")
+        samples1 = self._draws(var, group1)[:, 0]
+        samples2 = self._draws(var, group2)[:, 0]
         
         diff = samples1 - samples2
         
@@ -631,210 +1155,1554 @@ class HierarchicalResults(BayesianResults):
             'probability': (diff < 0).mean()  # P(group1 more elastic than group2)
         }
 
-
-# ============================================================================
-# SIMPLE BAYESIAN MODEL
-# ============================================================================
-
-class SimpleBayesianModel:
-    """
-    Simple (non-hierarchical) Bayesian elasticity model
-    
-    Use for:
-    - Overall data (BJ's + Sam's combined)
-    - Single retailer analysis
-    
-    Example:
-    -------
-    >>> model = SimpleBayesianModel(priors='default')
-    >>> results = model.fit(df)
-    """
-    
-    def __init__(
-        self,
-        priors: str = 'default',
-        n_samples: int = 2000,
-        n_tune: int = 1000,
-        n_chains: int = 4,
-        target_accept: float = 0.95,
-        random_seed: int = 42,
-        verbose: bool = True
-    ):
-        """Initialize model"""
-        self.priors = PriorLibrary.get_priors(priors)
-        self.n_samples = n_samples
-        self.n_tune = n_tune
-        self.n_chains = n_chains
-        self.target_accept = target_accept
-        self.random_seed = random_seed
-        self.verbose = verbose
-        
-        self.logger = self._setup_logger()
-        self.model = None
-        self.trace = None
-    
-    def _setup_logger(self):
-        """Setup logging"""
-        logger = logging.getLogger('SimpleBayesianModel')
-        logger.setLevel(logging.INFO if self.verbose else logging.WARNING)
-        
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(message)s')
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
-        return logger
-    
-    def fit(self, data: pd.DataFrame) -> BayesianResults:
+    def compare_all_groups(self, types=('base', 'promo'), ci_prob: float = 0.95) -> pd.DataFrame:
         """
-        Fit Bayesian model
+        Compare every pair of groups at once
         
-        Parameters:
-        ----------
-        data : pd.DataFrame
-            Model-ready data from data_prep.py
+        Differences group1 - group2 for all pairs are computed in one broadcast over
+        the group axis ((draws, groups, 1) - (draws, 1, groups)).
         
         Returns:
         -------
-        BayesianResults
-            Results object
-        """
-        
-        self.logger.info("="*80)
-        self.logger.info("FITTING SIMPLE BAYESIAN MODEL")
-        self.logger.info("="*80)
-        
-        # Build model
-        self.logger.info("\nBuilding model...")
-        self._build_model(data)
-        
-        # Sample
-        self.logger.info(f"\nSampling ({self.n_chains} chains × {self.n_samples} samples)...")
-        self._sample()
-        
-        # Create results
-        self.logger.info("\nProcessing results...")
-        results = BayesianResults(
-            trace=self.trace,
-            model=self.model,
-            data=data,
-            config=self.__dict__,
-            priors=self.priors
-        )
-        
-        self.logger.info("\n" + "="*80)
-        self.logger.info("✓ FITTING COMPLETE")
-        self.logger.info("="*80)
-        
-        return results
-    
-    def _build_model(self, data: pd.DataFrame):
-        """Build PyMC model"""
+        pd.DataFrame
+            Rows (type, statistic, group1), columns group2; statistics are
+            ci_lower, ci_upper, difference_mean and probability
+            (P(group1 more elastic than group2)). The diagonal is NaN; types
+            the model did not estimate are left out (unknown types raise).
         
-        # Extract data
-        y = data['Log_Volume_Sales_SI'].values
-        use_dual = ('Log_Base_Price_SI' in data.columns) and ('Promo_Depth_SI' in data.columns)
-        X_base = data['Log_Base_Price_SI'].values if use_dual else data['Log_Price_SI'].values
-        X_cross = data['Log_Price_PL'].values
-        X_has_competitor = data['has_competitor'].values if 'has_competitor' in data else np.ones(len(data))
+        Example:
+        -------
+        >>> matrix = results.compare_all_groups()
+        >>> matrix.loc[('base', 'probability')]      # groups x groups
+        """
+        labels = [str(g) for g in self.groups]
+        tail = (1.0 - ci_prob) / 2.0
+        off_diagonal = ~np.eye(len(labels), dtype=bool)
+
+        blocks = {}
+        for elasticity_type in types:
+            var = self._group_var(elasticity_type)
+            if var is None:
+                continue
+            values = self._draws(var)                              # (draws, groups)
+            diff = values[:, :, None] - values[:, None, :]         # (draws, groups, groups)
+            ci_lower, ci_upper = np.quantile(diff, [tail, 1.0 - tail], axis=0)
+            # Alphabetical statistic order keeps (type, statistic) lookups lexsorted
+            stats = {
+                'ci_lower': ci_lower,
+                'ci_upper': ci_upper,
+                'difference_mean': diff.mean(axis=0),
+                'probability': (diff < 0).mean(axis=0),
+            }
+            for stat, matrix in stats.items():
+                blocks[(elasticity_type, stat)] = pd.DataFrame(
+                    np.where(off_diagonal, matrix, np.nan), index=labels, columns=labels
+                )
 
-        if use_dual:
-            X_promo = data['Promo_Depth_SI'].values
-            X_has_promo = data['has_promo'].values if 'has_promo' in data else np.ones(len(data))
-        else:
-            X_promo = data['Promo_Intensity_SI'].values if 'Promo_Intensity_SI' in data else None
-            X_has_promo = data['has_promo'].values if 'has_promo' in data else (np.ones(len(data)) if X_promo is not None else None)
+        if not blocks:
+            return pd.DataFrame()
+        matrix = pd.concat(blocks, names=['type', 'statistic', 'group1'])
+        matrix.columns.name = 'group2'
+        return matrix
 
-        # Safety: ensure no NaNs propagate into the linear predictor
-        X_cross = np.nan_to_num(X_cross, nan=0.0)
-        X_has_competitor = np.nan_to_num(X_has_competitor, nan=0.0)
-        if X_promo is not None:
-            X_promo = np.nan_to_num(X_promo, nan=0.0)
+
+# ============================================================================
+# LIKELIHOOD
+# ============================================================================
+
+LIKELIHOODS = ('full', 'sufficient_stats')
+
+
+def _validate_likelihood(likelihood: Optional[str]) -> str:
+    """Normalize a likelihood mode name and fail fast on unknown values"""
+    name = str(likelihood or 'full').strip().lower()
+    if name not in LIKELIHOODS:
+        raise ValueError(f"Unknown likelihood: {likelihood}. Options: {list(LIKELIHOODS)}")
+    return name
+
+
+def _gaussian_sufficient_stats(X: np.ndarray, y: np.ndarray, group_idx: np.ndarray, n_groups: int) -> Dict:
+    """
+    Per-group sufficient statistics of a linear-Gaussian model.
+
+    Returns:
+    -------
+    Dict
+        XtX (n_groups, p, p), Xty (n_groups, p), yty (n_groups,), n (n_groups,)
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    p = X.shape[1]
+
+    XtX = np.zeros((n_groups, p, p))
+    Xty = np.zeros((n_groups, p))
+    yty = np.zeros(n_groups)
+    n = np.zeros(n_groups)
+    for g in range(n_groups):
+        mask = group_idx == g
+        Xg, yg = X[mask], y[mask]
+        XtX[g] = Xg.T @ Xg
+        Xty[g] = Xg.T @ yg
+        yty[g] = yg @ yg
+        n[g] = mask.sum()
+
+    return {'XtX': XtX, 'Xty': Xty, 'yty': yty, 'n': n}
+
+
+def _likelihood_data(
+    y: np.ndarray,
+    X: np.ndarray,
+    likelihood: str = 'full',
+    group_idx: Optional[np.ndarray] = None,
+    n_groups: int = 1,
+) -> Dict[str, np.ndarray]:
+    """
+    Values of the model's data containers for one dataset.
+
+    'full' keeps the rows (y, design matrix X and, for grouped models, group_idx);
+    'sufficient_stats' keeps only the per-group X'X, X'y, y'y and row counts, so the
+    container shapes do not depend on the number of rows.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    if likelihood == 'full':
+        values = {'X': X, 'y': y}
+        if group_idx is not None:
+            values['group_idx'] = np.asarray(group_idx, dtype='int64')
+        return values
+
+    if group_idx is None:
+        group_idx = np.zeros(len(y), dtype=int)
+        n_groups = 1
+    stats = _gaussian_sufficient_stats(X, y, group_idx, n_groups)
+    return {'XtX': stats['XtX'], 'Xty': stats['Xty'], 'yty': stats['yty'], 'n_obs': stats['n']}
+
+
+def _add_gaussian_likelihood(terms, data: Dict, sigma, likelihood: str = 'full', n_groups: int = 1):
+    """
+    Add the Gaussian likelihood for `y ~ Normal(X @ coefs, sigma)` to the model in context.
+
+    Parameters:
+    ----------
+    terms : list of (coefficient, group-specific?)
+        One entry per column of the design matrix. Group-specific coefficients
+        have shape (n_groups,) and are indexed by the `group_idx` container.
+    data : dict
+        Data containers created from `_likelihood_data`.
+    likelihood : str
+        'full' adds the usual observed `y_obs` node (O(n) per gradient).
+        'sufficient_stats' adds the same log-likelihood as a Potential built from
+        per-group X'X, X'y, y'y and n, so the gradient cost is O(n_groups * p^2).
+    """
+    if likelihood == 'full':
+        X = data['X']
+        group_idx = data.get('group_idx')
+        mu = 0.0
+        for j, (coef, grouped) in enumerate(terms):
+            mu = mu + (coef[group_idx] if grouped else coef) * X[:, j]
+        return pm.Normal('y_obs', mu=mu, sigma=sigma, observed=data['y'])
+
+    # Coefficient matrix B (n_groups, p): shared coefficients are repeated across groups
+    B = pt.stack(
+        [coef if grouped else coef * np.ones(n_groups) for coef, grouped in terms],
+        axis=1,
+    )
+
+    # ||y_g - X_g b_g||^2 = y'y - 2 b'X'y + b'X'X b, per group
+    sse = (
+        data['yty']
+        - 2.0 * (B * data['Xty']).sum(axis=1)
+        + (B[:, :, None] * data['XtX'] * B[:, None, :]).sum(axis=(1, 2))
+    )
+    n_total = data['n_obs'].sum()
+    loglik = -0.5 * n_total * pt.log(2.0 * np.pi * sigma ** 2) - sse.sum() / (2.0 * sigma ** 2)
+
+    return pm.Potential('y_obs', loglik)
+
+
+# ============================================================================
+# DATA CONTAINERS & COMPILED-MODEL CACHE
+# ============================================================================
+
+# Model structure key -> {'model': pm.Model, 'logp_dlogp': compiled function, ...}
+# A fit checks its entry out of the cache (so no other fit can set_data on the same
+# graph while it samples) and puts it back afterwards; see _checkout_model.
+_MODEL_CACHE: Dict[tuple, Dict] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def clear_model_cache():
+    """Drop every cached model and its compiled functions"""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+
+
+def _data_container(name: str, value):
+    """Mutable data container (`pm.MutableData` on PyMC versions that still split the two)"""
+    if hasattr(pm, 'MutableData'):
+        return pm.MutableData(name, value)
+    return pm.Data(name, value)
+
+
+def _model_cache_key(kind: str, structure: tuple, likelihood: str, priors: Dict) -> tuple:
+    """
+    Cache key of a model graph: everything that changes the graph, nothing that only changes data.
+
+    `structure` holds the model-specific parts (coefficient names in design order,
+    group-specific flags, n_groups, parameterization of group effects).
+    """
+    return (kind, structure, likelihood, json.dumps(priors, sort_keys=True, default=str))
+
+
+def _checkout_model(key: tuple, values: Dict[str, np.ndarray], build: Callable[[], pm.Model]) -> Dict:
+    """
+    Take the cache entry for `key` out of the cache, loading `values` into its data containers.
+
+    On a miss (or while another fit holds the entry) the model is built by `build()`;
+    on a hit the existing graph is reused and only `pm.set_data` runs, so nothing is
+    recompiled. Hand the entry back with `_checkin_model` once sampling is done.
+    """
+    with _MODEL_CACHE_LOCK:
+        entry = _MODEL_CACHE.pop(key, None)
+    if entry is None:
+        entry = {'key': key, 'model': build(), 'hits': 0}
+    else:
+        pm.set_data(values, model=entry['model'])
+        entry['hits'] += 1
+    return entry
+
+
+def _checkin_model(entry: Dict) -> pm.Model:
+    """
+    Return a checked-out entry to the cache; gives back a snapshot of its model.
+
+    The snapshot is a clone of the graph with its own copy of the data, which is what
+    results keep, so later fits reusing the cached graph cannot change earlier results.
+    """
+    snapshot = clone_model(entry['model'])
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.setdefault(entry['key'], entry)
+    return snapshot
+
+
+def _compiled_functions(entry: Dict):
+    """Compile (once per cache entry) the logp/gradient and jittered initial-point functions"""
+    if 'logp_dlogp' not in entry:
+        model = entry['model']
+        func = model.logp_dlogp_function(ravel_inputs=True)
+        func.trust_input = True
+        entry['logp_dlogp'] = func
+        entry['initial_point'] = make_initial_point_fn(
+            model=model, jitter_rvs=set(model.free_RVs), return_transformed=True
+        )
+    return entry['logp_dlogp'], entry['initial_point']
+
+
+def _cached_nuts(entry: Dict, n_chains: int, target_accept: float, random_seed: Optional[int]):
+    """
+    NUTS step and jittered starting points for a cached model.
+
+    Mirrors PyMC's default 'jitter+adapt_diag' initialisation, but the logp/gradient
+    and initial-point functions are compiled once per cache entry and then reused for
+    every refit (they read the current values of the data containers).
+    """
+    model = entry['model']
+    func, initial_point = _compiled_functions(entry)
+
+    seed_rng = np.random.default_rng(random_seed)
+    points = []
+    for _ in range(n_chains):
+        # Redraw the jitter until the starting point has a finite log-probability
+        for _attempt in range(10):
+            point = initial_point(int(seed_rng.integers(2**30)))
+            q, _ = DictToArrayBijection.map(point)
+            if np.isfinite(func([q], extra_vars={})[0]):
+                break
+        points.append(point)
+
+    mean = np.mean([DictToArrayBijection.map(point).data for point in points], axis=0)
+    potential = QuadPotentialDiagAdapt(len(mean), mean, np.ones_like(mean), 10)
+    step = pm.NUTS(
+        potential=potential,
+        model=model,
+        target_accept=target_accept,
+        initial_point=points[0],
+        logp_dlogp_func=func,
+    )
+    return step, points
+
+
+def _unconstrained_draws(model: pm.Model, posterior) -> np.ndarray:
+    """
+    Posterior draws of the free variables mapped to the sampler's unconstrained space.
+
+    Returns an array (n_draws, n_params) with columns in `model.value_vars` order,
+    i.e. the layout NUTS uses for its position vector and mass matrix.
+    """
+    cols = []
+    for rv in model.free_RVs:
+        values = np.asarray(posterior[rv.name].values, dtype=float)
+        flat = values.reshape(values.shape[0] * values.shape[1], -1)
+        transform = model.rvs_to_transforms.get(rv)
+        if transform is not None:
+            shaped = flat.reshape((flat.shape[0],) + values.shape[2:])
+            flat = np.asarray(transform.forward(pt.as_tensor_variable(shaped), *rv.owner.inputs).eval())
+            flat = flat.reshape(flat.shape[0], -1)
+        cols.append(flat)
+    return np.concatenate(cols, axis=1)
+
+
+def _continuation_kernel(entry: Dict, trace: az.InferenceData, mass_matrix_weight: Optional[int] = None) -> Dict:
+    """
+    Frozen NUTS kernel estimated from a previous trace, as plain JSON-serialisable values.
+
+    - mean / var: diagonal mass matrix from the previous draws in unconstrained space
+    - weight: how many draws' worth of evidence the mass matrix counts for if tuning
+      continues (default: all previous draws)
+    - step_scale: the previous run's final adapted step size (mean over chains), scaled
+      as PyMC's NUTS expects; None when the trace recorded no step size
+    """
+    draws = _unconstrained_draws(entry['model'], trace.posterior)
+    mean = draws.mean(axis=0)
+    var = np.maximum(draws.var(axis=0), 1e-8)
+
+    step_scale = None
+    stats = getattr(trace, 'sample_stats', None)
+    if stats is not None and 'step_size' in stats:
+        step_size = float(np.asarray(stats['step_size'].isel(draw=-1).values).mean())
+        if np.isfinite(step_size) and step_size > 0:
+            # PyMC's NUTS uses step_size = step_scale / n_params ** 0.25
+            step_scale = step_size * len(mean) ** 0.25
+
+    return {
+        'mean': mean.tolist(),
+        'var': var.tolist(),
+        'weight': max(int(mass_matrix_weight or draws.shape[0]), 1),
+        'step_scale': step_scale,
+    }
+
+
+def _continuation_nuts(
+    entry: Dict,
+    trace: az.InferenceData,
+    n_chains: int,
+    target_accept: float,
+    mass_matrix_weight: Optional[int] = None,
+    start: Optional[az.InferenceData] = None,
+    kernel: Optional[Dict] = None,
+):
+    """
+    NUTS step that continues from a previous trace instead of starting cold.
+
+    - starting points: the last draw of each previous chain (cycled if `n_chains`
+      exceeds the number of previous chains), taken from `start` when given
+    - step size and mass matrix: `kernel` when given, otherwise estimated from
+      `trace` by `_continuation_kernel`
+
+    With `tune=0` the kernel stays frozen, so successive blocks are one long chain.
+    """
+    model = entry['model']
+    func, initial_point = _compiled_functions(entry)
+
+    free_names = [rv.name for rv in model.free_RVs]
+    reference = initial_point(0)
+    for other in (trace, start):
+        if other is None:
+            continue
+        missing = [name for name in free_names if name not in other.posterior]
+        mismatched = [
+            rv.name for rv in model.free_RVs
+            if rv.name not in missing
+            and other.posterior[rv.name].shape[2:] != reference[model.rvs_to_values[rv].name].shape
+        ]
+        if missing or mismatched:
+            raise ValueError(
+                "Previous trace does not match the model structure "
+                f"(missing: {missing or 'none'}; shape mismatch: {mismatched or 'none'})"
+            )
+
+    if kernel is None:
+        kernel = _continuation_kernel(entry, trace, mass_matrix_weight)
+    mean = np.asarray(kernel['mean'], dtype=float)
+    potential = QuadPotentialDiagAdapt(len(mean), mean, np.asarray(kernel['var'], dtype=float), kernel['weight'])
+
+    start_posterior = (start if start is not None else trace).posterior
+    n_prev = start_posterior.sizes['chain']
+    last = start_posterior[free_names].isel(draw=-1)
+    initvals = [
+        {name: np.asarray(last[name].isel(chain=c % n_prev).values) for name in free_names}
+        for c in range(n_chains)
+    ]
+
+    kwargs = {}
+    if kernel.get('step_scale') is not None:
+        kwargs['step_scale'] = kernel['step_scale']
+
+    step = pm.NUTS(
+        potential=potential,
+        model=model,
+        target_accept=target_accept,
+        initial_point=reference,
+        logp_dlogp_func=func,
+        **kwargs,
+    )
+    return step, initvals
+
+
+def _sample_nuts(
+    entry: Dict,
+    draws: int,
+    tune: int,
+    chains: int,
+    target_accept: float,
+    random_seed: Optional[int],
+    progressbar: bool,
+    sampler_backend: str = 'pymc',
+    warm_start: Optional[az.InferenceData] = None,
+) -> az.InferenceData:
+    """
+    Run NUTS on a cached model.
+
+    The PyMC backend reuses the entry's compiled logp/gradient; nutpie and NumPyro
+    are handed the model through `pm.sample` and compile it themselves.
+    `warm_start` (a previous trace of the same model structure) starts every chain
+    from the previous run's last draw, step size and mass matrix; it always runs
+    on PyMC's NUTS (the models reject it with another `sampler_backend`).
+    """
+    if warm_start is not None:
+        step, initvals = _continuation_nuts(entry, warm_start, chains, target_accept)
+        kwargs = {'step': step, 'initvals': initvals}
+    elif sampler_backend == 'pymc':
+        kwargs = {}
+        step, initvals = _cached_nuts(entry, chains, target_accept, random_seed)
+        kwargs.update(step=step, initvals=initvals)
+    else:
+        kwargs = _sampler_backend_kwargs(sampler_backend, chains)
+        kwargs['target_accept'] = target_accept
+
+    with entry['model']:
+        return pm.sample(
+            draws=draws,
+            tune=tune,
+            chains=chains,
+            random_seed=random_seed,
+            return_inferencedata=True,
+            progressbar=progressbar,
+            **kwargs
+        )
+
+
+def _load_trace(source) -> Optional[az.InferenceData]:
+    """Accept a trace path (e.g. a previous run's trace.nc), an InferenceData or a results object"""
+    if source is None:
+        return None
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"Trace not found: {source}")
+        return az.from_netcdf(source)
+    return getattr(source, 'trace', source)
+
+
+def _parameter_labels(posterior: xr.Dataset) -> List[str]:
+    """
+    ArviZ row labels of every scalar parameter (as az.summary, e.g. `base_elasticity[Costco]`),
+    built from variable dims and coords only, so no draws are read
+    """
+    labeller = BaseLabeller()
+    labels = []
+    for name, da in posterior.data_vars.items():
+        dims = [dim for dim in da.dims if dim not in ('chain', 'draw')]
+        coords = [da[dim].values for dim in dims]
+        for position in itertools.product(*(range(len(values)) for values in coords)):
+            sel = {dim: values[i] for dim, values, i in zip(dims, coords, position)}
+            labels.append(labeller.make_label_flat(name, sel, dict(zip(dims, position))))
+    return labels
+
+
+def _divergence_count(trace: az.InferenceData) -> int:
+    """Total divergent transitions of a trace (0 when no `diverging` stat was recorded)"""
+    stats = getattr(trace, 'sample_stats', None)
+    diverging = stats['diverging'] if stats is not None and 'diverging' in stats else None
+    return int(np.asarray(diverging.values).sum()) if diverging is not None else 0
+
+
+def _convergence_stats(trace: az.InferenceData) -> Dict:
+    """Max R-hat, min bulk / tail ESS and divergence count of a trace"""
+    def _extreme(ds, fn) -> float:
+        arr = np.asarray(ds.to_array().values, dtype=float)
+        return float(fn(arr)) if np.isfinite(arr).any() else float('nan')
+
+    return {
+        'rhat_max': _extreme(az.rhat(trace), np.nanmax),
+        'ess_bulk_min': _extreme(az.ess(trace, method='bulk'), np.nanmin),
+        'ess_tail_min': _extreme(az.ess(trace, method='tail'), np.nanmin),
+        'n_divergences': _divergence_count(trace),
+    }
+
+
+def _concat_draws(blocks: List[az.InferenceData]) -> az.InferenceData:
+    """Join consecutive sampling blocks of the same chains along the draw dimension"""
+    if len(blocks) == 1:
+        return blocks[0]
+
+    groups = {}
+    for group in ('posterior', 'sample_stats'):
+        parts = [getattr(b, group) for b in blocks if hasattr(b, group)]
+        if len(parts) != len(blocks):
+            continue
+        common = [v for v in parts[0].data_vars if all(v in part.data_vars for part in parts)]
+        joined = xr.concat([part[common] for part in parts], dim='draw')
+        groups[group] = joined.assign_coords(draw=np.arange(joined.sizes['draw']))
+    for group in ('observed_data', 'constant_data'):
+        if hasattr(blocks[-1], group):
+            groups[group] = getattr(blocks[-1], group)
+
+    trace = az.InferenceData(**groups)
+    trace.posterior.attrs.update(blocks[0].posterior.attrs)
+    return trace
+
+
+CHECKPOINT_MANIFEST = 'checkpoint.json'
+
+
+def _checkpoint_blocks(
+    checkpoint_dir: str, settings: Dict, resume: bool
+) -> Tuple[List[az.InferenceData], Optional[Dict]]:
+    """
+    Blocks and continuation kernel already on disk for this run (resume), or an empty,
+    freshly initialised directory.
+
+    The manifest records the settings that must match for the saved draws to be
+    continued; resuming with different settings raises instead of mixing runs.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    manifest_path = os.path.join(checkpoint_dir, CHECKPOINT_MANIFEST)
+    block_files = sorted(f for f in os.listdir(checkpoint_dir) if f.startswith('block_') and f.endswith('.nc'))
+
+    if resume and os.path.exists(manifest_path):
+        with open(manifest_path) as fh:
+            saved = json.load(fh)
+        saved_settings = saved.get('settings', saved)
+        if saved_settings != settings:
+            changed = sorted(
+                k for k in set(saved_settings) | set(settings) if saved_settings.get(k) != settings.get(k)
+            )
+            raise ValueError(f"Checkpoint in {checkpoint_dir} was written with different settings: {changed}")
+        blocks = [az.from_netcdf(os.path.join(checkpoint_dir, f)) for f in block_files]
+        return blocks, saved.get('kernel')
+
+    for f in block_files:
+        os.remove(os.path.join(checkpoint_dir, f))
+    _write_checkpoint_manifest(checkpoint_dir, {'settings': settings, 'kernel': None})
+    return [], None
+
+
+def _write_checkpoint_manifest(checkpoint_dir: str, manifest: Dict):
+    """Replace the manifest atomically (settings, then the kernel once the first block is done)"""
+    path = os.path.join(checkpoint_dir, CHECKPOINT_MANIFEST)
+    with open(path + '.tmp', 'w') as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _save_checkpoint_block(checkpoint_dir: str, index: int, block: az.InferenceData):
+    """Write one block atomically so an interruption never leaves a truncated file"""
+    path = os.path.join(checkpoint_dir, f'block_{index:04d}.nc')
+    tmp_path = path + '.tmp'
+    block.to_netcdf(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _sample_in_blocks(
+    entry: Dict,
+    block_draws: int,
+    tune: int,
+    chains: int,
+    target_accept: float,
+    random_seed: Optional[int],
+    progressbar: bool,
+    sampler_backend: str,
+    max_draws: int,
+    logger: logging.Logger,
+    thresholds: Optional[Dict] = None,
+    max_seconds: Optional[float] = None,
+    warm_start: Optional[az.InferenceData] = None,
+    checkpoint_dir: Optional[str] = None,
+    resume: bool = False,
+) -> az.InferenceData:
+    """
+    Sample in blocks of `block_draws`, optionally checkpointing each block to disk.
+
+    The first block tunes with `sampler_backend` (SamplerConfig only allows 'pymc' here).
+    Later blocks always run PyMC's NUTS with tune=0, continuing every chain from its
+    last position with a frozen kernel estimated once from the first block: a diagonal
+    mass matrix from its draws and its final adapted step size (`_continuation_kernel`).
+    That kernel is a re-estimate, not the sampler's internal adapted state, which PyMC
+    does not expose; it is fixed for the whole run, so the blocks form one long chain.
+
+    - `thresholds` (max_rhat / min_ess / max_divergences) given: adaptive mode. Stop
+      when R-hat, bulk/tail ESS and divergences meet them, when divergences exceed the
+      limit (more draws cannot fix those), or when the next block would pass
+      `max_draws` per chain or `max_seconds` of wall-clock time.
+    - otherwise: stop once `max_draws` draws per chain exist.
+    - `checkpoint_dir`: each block is written there as it completes, and the
+      continuation kernel is stored in the manifest after the first block; `resume=True`
+      picks up the saved blocks and kernel, so a resumed run draws exactly what an
+      uninterrupted one would (same seed). Tuning is not checkpointed: the first block
+      (`tune` + `block_draws` draws) must finish before anything is written, and an
+      interruption during it starts the run over.
+    """
+    started = time.perf_counter()
+    blocks, kernel = [], None
+    if checkpoint_dir is not None:
+        settings = {
+            'chains': chains, 'tune': tune, 'block_draws': block_draws, 'random_seed': random_seed,
+            'target_accept': target_accept, 'sampler_backend': sampler_backend,
+            'free_variables': [rv.name for rv in entry['model'].free_RVs],
+        }
+        blocks, kernel = _checkpoint_blocks(checkpoint_dir, settings, resume)
+        if blocks:
+            logger.info(f"  Resuming from checkpoint: {len(blocks)} block(s), "
+                        f"{sum(b.posterior.sizes['draw'] for b in blocks)} draws/chain")
+
+    def _keep(block):
+        blocks.append(block)
+        if checkpoint_dir is not None:
+            _save_checkpoint_block(checkpoint_dir, len(blocks) - 1, block)
+
+    if not blocks:
+        _keep(_sample_nuts(entry, block_draws, tune, chains, target_accept, random_seed,
+                           progressbar, sampler_backend, warm_start=warm_start))
+    if kernel is None:
+        kernel = _continuation_kernel(entry, blocks[0])
+        if checkpoint_dir is not None:
+            _write_checkpoint_manifest(checkpoint_dir, {'settings': settings, 'kernel': kernel})
+
+    while True:
+        trace = _concat_draws(blocks)
+        total = trace.posterior.sizes['draw']
+        elapsed = time.perf_counter() - started
+
+        if thresholds is None:
+            logger.info(f"  Block {len(blocks)}: {total}/{max_draws} draws/chain | {elapsed:.0f}s")
+            if total >= max_draws:
+                reason = 'complete'
+                break
+        else:
+            stats = _convergence_stats(trace)
+            logger.info(
+                f"  Block {len(blocks)}: {total} draws/chain | R-hat {stats['rhat_max']:.4f} | "
+                f"ESS bulk {stats['ess_bulk_min']:.0f} / tail {stats['ess_tail_min']:.0f} | "
+                f"divergences {stats['n_divergences']} | {elapsed:.0f}s"
+            )
+            if (stats['rhat_max'] < thresholds['max_rhat']
+                    and min(stats['ess_bulk_min'], stats['ess_tail_min']) > thresholds['min_ess']
+                    and stats['n_divergences'] <= thresholds['max_divergences']):
+                reason = 'converged'
+                logger.info("  ✓ Convergence thresholds met")
+                break
+            if stats['n_divergences'] > thresholds['max_divergences']:
+                reason = 'divergences'
+                logger.warning("  ⚠️  Divergences exceed the threshold; more draws will not remove them "
+                               "(raise target_accept or use parameterization='non_centered')")
+                break
+            if total + block_draws > max_draws:
+                reason = 'max_draws'
+                logger.warning(f"  ⚠️  Draw ceiling reached ({max_draws} per chain) before convergence")
+                break
+            if max_seconds is not None and elapsed >= max_seconds:
+                reason = 'max_time'
+                logger.warning(f"  ⚠️  Time ceiling reached ({max_seconds:.0f}s) before convergence")
+                break
+
+        step, initvals = _continuation_nuts(entry, blocks[0], chains, target_accept,
+                                            start=blocks[-1], kernel=kernel)
+        seed = None if random_seed is None else random_seed + len(blocks)
+        draws = block_draws if thresholds is not None else min(block_draws, max_draws - total)
+        with entry['model']:
+            _keep(pm.sample(
+                draws=draws,
+                tune=0,
+                chains=chains,
+                step=step,
+                initvals=initvals,
+                random_seed=seed,
+                return_inferencedata=True,
+                progressbar=progressbar,
+            ))
+
+    trace.posterior.attrs['sampling_blocks'] = len(blocks)
+    trace.posterior.attrs['sampling_stop_reason'] = reason
+    return trace
+
+
+# ============================================================================
+# SEQUENTIAL UPDATING
+# ============================================================================
+
+def _tag_trace(trace: az.InferenceData, data: pd.DataFrame, groups=None):
+    """Record which rows (and, for grouped models, which group order) a trace was fitted on"""
+    attrs = trace.posterior.attrs
+    if 'Date' in data.columns and len(data):
+        attrs['data_end_date'] = str(pd.to_datetime(data['Date']).max().date())
+    attrs['n_observations'] = int(len(data))
+    if groups is not None:
+        attrs['retailers'] = json.dumps([str(g) for g in groups])
+
+
+def _rows_after(data: pd.DataFrame, trace: az.InferenceData) -> pd.DataFrame:
+    """Rows of `data` dated after the last date the previous posterior has already seen"""
+    end = trace.posterior.attrs.get('data_end_date')
+    if end is None:
+        raise ValueError("Previous trace has no 'data_end_date'; it must come from fit() or update()")
+    if 'Date' not in data.columns:
+        raise ValueError("Sequential updates need a 'Date' column to find the new rows")
+    new_rows = data[pd.to_datetime(data['Date']) > pd.Timestamp(end)]
+    if new_rows.empty:
+        raise ValueError(f"No rows dated after {end}; nothing to update")
+    return new_rows
+
+
+# Free RVs of the sequential model that are not model parameters
+_SEQUENTIAL_INTERNAL_VARS = ('prior_z',)
+
+
+def _moment_matched_prior(trace: az.InferenceData, required: List[str]):
+    """
+    Multivariate-normal approximation of a previous joint posterior.
+
+    Covers the model's named parameters only: non-centered offsets and the
+    `prior_z` innovations of an earlier update() are left out, so updates chain.
+    Scale parameters (`sigma*`) are matched on the log scale so the new prior
+    keeps them positive.
+
+    Returns:
+    -------
+    mean : np.ndarray (p,)
+    chol : np.ndarray (p, p)
+        Cholesky factor of the posterior covariance
+    layout : list of (name, shape, log_scale)
+        How the p-vector splits back into named parameters
+    """
+    posterior = trace.posterior
+    missing = [name for name in required if name not in posterior]
+    if missing:
+        raise ValueError(f"Previous posterior does not match the model structure (missing: {missing})")
+
+    cols, layout = [], []
+    for name in posterior.data_vars:
+        if name in _SEQUENTIAL_INTERNAL_VARS or name.endswith('_offset'):
+            continue
+        values = np.asarray(posterior[name].values, dtype=float)
+        flat = values.reshape(values.shape[0] * values.shape[1], -1)
+        log_scale = name.startswith('sigma')
+        cols.append(np.log(flat) if log_scale else flat)
+        layout.append((name, tuple(values.shape[2:]), log_scale))
+
+    draws = np.concatenate(cols, axis=1)
+    mean = draws.mean(axis=0)
+    cov = np.atleast_2d(np.cov(draws, rowvar=False))
+    jitter = 1e-10 * max(float(np.trace(cov)) / len(mean), 1e-12)
+    chol = np.linalg.cholesky(cov + jitter * np.eye(len(mean)))
+    return mean, chol, layout
+
+
+def _build_sequential_model(values: Dict[str, np.ndarray], layout, terms, likelihood: str, groups=None):
+    """
+    Model whose prior is the moment-matched previous posterior.
+
+    theta = prior_mean + prior_chol @ z with z ~ N(0, I); every previous parameter is
+    exposed under its original name as a Deterministic slice of theta, and the
+    likelihood of the new rows uses the same `terms` (name, group-specific?) as fit().
+    Group-specific parameters get the GROUP_DIM coords when `groups` is given.
+    """
+    n_groups = 1 if groups is None else len(groups)
+    coords = None if groups is None else {GROUP_DIM: [str(g) for g in groups]}
+    grouped_names = {name for name, grouped in terms if grouped}
+    with pm.Model(coords=coords) as model:
+        data_vars = {name: _data_container(name, value) for name, value in values.items()}
+        z = pm.Normal('prior_z', mu=0.0, sigma=1.0, shape=len(values['prior_mean']))
+        theta = data_vars['prior_mean'] + pt.dot(data_vars['prior_chol'], z)
+
+        params = {}
+        start = 0
+        for name, shape, log_scale in layout:
+            size = int(np.prod(shape)) if shape else 1
+            value = theta[start:start + size]
+            value = value.reshape(shape) if shape else value[0]
+            start += size
+            dims = GROUP_DIM if groups is not None and name in grouped_names else None
+            params[name] = pm.Deterministic(name, pt.exp(value) if log_scale else value, dims=dims)
+
+        _add_gaussian_likelihood(
+            [(params[name], grouped) for name, grouped in terms],
+            data_vars, params['sigma'], likelihood=likelihood, n_groups=n_groups,
+        )
+    return model
+
+
+# ============================================================================
+# INFERENCE METHODS
+# ============================================================================
+
+# Fast approximate posteriors (no R-hat / ESS / divergences)
+APPROXIMATE_INFERENCE_METHODS = ('advi', 'fullrank_advi', 'pathfinder')
+SIMPLE_INFERENCE_METHODS = ('nuts', 'gibbs') + APPROXIMATE_INFERENCE_METHODS
+HIERARCHICAL_INFERENCE_METHODS = ('nuts',) + APPROXIMATE_INFERENCE_METHODS
+
+
+def _validate_inference(inference: Optional[str], allowed) -> str:
+    """Normalize an inference method name and fail fast on unsupported values"""
+    name = str(inference or 'nuts').strip().lower()
+    if name not in allowed:
+        raise ValueError(f"Unsupported inference: {inference}. Options for this model: {list(allowed)}")
+    return name
+
+
+def _fit_approximate(
+    model: pm.Model,
+    method: str,
+    draws: int,
+    vi_iterations: int,
+    random_seed: Optional[int] = None,
+    progressbar: bool = True,
+) -> az.InferenceData:
+    """
+    Fit an approximate posterior and return `draws` samples as a single-chain trace.
+
+    - 'advi' / 'fullrank_advi': mean-field / full-rank Gaussian ADVI (`pm.fit`, started at the MAP)
+    - 'pathfinder': multi-path Pathfinder (optional install: pip install pymc-extras)
+
+    The posterior group uses the model's variable names, so the results classes
+    read it exactly like an MCMC trace. The method is recorded in
+    `trace.posterior.attrs['inference_method']`.
+    """
+    if method == 'pathfinder':
+        if importlib.util.find_spec('pymc_extras') is None:
+            raise ImportError(
+                "inference='pathfinder' requires the optional 'pymc-extras' package "
+                "(pip install pymc-extras)"
+            )
+        import pymc_extras as pmx
+
+        with model:
+            trace = pmx.fit(
+                method='pathfinder',
+                num_draws=draws,
+                random_seed=random_seed,
+                progressbar=progressbar,
+            )
+    else:
+        with model:
+            # Starting the optimisation at the MAP avoids ADVI stalling far from the
+            # mode when the intercept / trend sit on very different scales.
+            start = pm.find_MAP(progressbar=False, seed=random_seed)
+            approx = pm.fit(
+                n=vi_iterations,
+                method=method,
+                start=start,
+                random_seed=random_seed,
+                progressbar=progressbar,
+            )
+        trace = approx.sample(draws, random_seed=random_seed, return_inferencedata=True)
+
+    trace.posterior.attrs['inference_method'] = method
+    return trace
+
+
+def _sampling_message(model) -> str:
+    """One-line description of how a model instance is about to draw its posterior"""
+    if model.inference in APPROXIMATE_INFERENCE_METHODS:
+        return f"Approximating posterior ({model.inference}, {model.approx_draws} draws)"
+    if model.inference == 'gibbs':
+        return f"Sampling ({model.n_chains} chains × {model.n_samples} samples, gibbs)"
+    sampler = 'warm start' if model._warm_start is not None else f"backend={model.sampler_backend}"
+    if model.checkpoint_dir is not None:
+        sampler += f", checkpoints in {model.checkpoint_dir}"
+    if model.adaptive:
+        return (f"Adaptive sampling ({model.n_chains} chains, blocks of {model.n_samples} draws, "
+                f"ceiling {model.max_draws}, {sampler})")
+    return f"Sampling ({model.n_chains} chains × {model.n_samples} samples, tune={model.n_tune}, {sampler})"
+
+
+# ============================================================================
+# CONJUGATE GIBBS SAMPLER (SIMPLE MODEL)
+# ============================================================================
+
+def _gibbs_linear_gaussian(
+    X: np.ndarray,
+    y: np.ndarray,
+    prior_mu: np.ndarray,
+    prior_sigma: np.ndarray,
+    sigma_scale: float,
+    draws: int,
+    burn: int,
+    chains: int,
+    random_seed: Optional[int] = None,
+):
+    """
+    Blocked Gibbs sampler for y ~ Normal(X beta, sigma) with
+    beta_j ~ Normal(prior_mu_j, prior_sigma_j) and sigma ~ HalfNormal(sigma_scale).
+
+    Both conditionals are drawn exactly, with all chains advanced together:
+    - beta | sigma  : multivariate normal with precision X'X / sigma^2 + diag(1 / prior_sigma^2)
+    - sigma^2 | beta: GIG(-(n-1)/2, 1/sigma_scale^2, SSR), drawn by rejection from its
+      InverseGamma((n-1)/2, SSR/2) envelope with acceptance exp(-sigma^2 / (2 sigma_scale^2))
+      (close to 1 whenever the noise variance is small relative to the prior scale)
+
+    Returns:
+    -------
+    beta : np.ndarray (chains, draws, p)
+    sigma : np.ndarray (chains, draws)
+    """
+    rng = np.random.default_rng(random_seed)
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n, p = X.shape
+
+    XtX = X.T @ X
+    Xty = X.T @ y
+    prior_prec = 1.0 / np.asarray(prior_sigma, dtype=float) ** 2
+    prior_term = prior_prec * np.asarray(prior_mu, dtype=float)
+    shape = 0.5 * (n - 1)
+
+    beta_out = np.empty((chains, draws, p))
+    sigma_out = np.empty((chains, draws))
+
+    # Start each chain from a prior draw of sigma
+    sig2 = (sigma_scale * np.abs(rng.standard_normal(chains))) ** 2 + 1e-12
+
+    for it in range(burn + draws):
+        # beta | sigma (batched over chains)
+        prec = XtX[None, :, :] / sig2[:, None, None] + np.diag(prior_prec)[None, :, :]
+        rhs = Xty[None, :] / sig2[:, None] + prior_term[None, :]
+        chol = np.linalg.cholesky(prec)
+        mean = np.linalg.solve(prec, rhs[:, :, None])[:, :, 0]
+        z = rng.standard_normal((chains, p))
+        beta = mean + np.linalg.solve(np.transpose(chol, (0, 2, 1)), z[:, :, None])[:, :, 0]
+
+        # sigma^2 | beta
+        ssr = ((y[None, :] - beta @ X.T) ** 2).sum(axis=1)
+        pending = np.ones(chains, dtype=bool)
+        while pending.any():
+            k = int(pending.sum())
+            proposal = 0.5 * ssr[pending] / rng.gamma(shape, 1.0, size=k)
+            accept = rng.random(k) < np.exp(-proposal / (2.0 * sigma_scale ** 2))
+            idx = np.flatnonzero(pending)[accept]
+            sig2[idx] = proposal[accept]
+            pending[idx] = False
+
+        if it >= burn:
+            beta_out[:, it - burn, :] = beta
+            sigma_out[:, it - burn] = np.sqrt(sig2)
+
+    return beta_out, sigma_out
+
+
+# ============================================================================
+# SAMPLING BACKENDS
+# ============================================================================
+
+# backend name -> (pm.sample `nuts_sampler` value, optional package it needs)
+SAMPLER_BACKENDS = {
+    'pymc': ('pymc', None),
+    'nutpie': ('nutpie', 'nutpie'),
+    'numpyro': ('numpyro', 'numpyro'),
+}
+
+
+def _validate_sampler_backend(backend: Optional[str]) -> str:
+    """Normalize a sampler backend name and fail fast on unknown values"""
+    name = str(backend or 'pymc').strip().lower()
+    if name not in SAMPLER_BACKENDS:
+        raise ValueError(
+            f"Unknown sampler_backend: {backend}. Options: {sorted(SAMPLER_BACKENDS)}"
+        )
+    return name
+
+
+def _sampler_backend_kwargs(backend: str, n_chains: int) -> Dict:
+    """
+    Extra `pm.sample` kwargs for a compiled NUTS backend.
+
+    PyMC hands the model to nutpie (Numba) or NumPyro (JAX) itself and converts
+    the draws back to InferenceData, so results classes see the same layout
+    (posterior + sample_stats.diverging) regardless of backend.
+
+    'numpyro' sets the process-wide XLA_FLAGS environment variable to one CPU device
+    per chain when neither XLA_FLAGS nor JAX has been set up yet.
+    """
+    nuts_sampler, package = SAMPLER_BACKENDS[backend]
+    if package is not None and importlib.util.find_spec(package) is None:
+        raise ImportError(
+            f"sampler_backend='{backend}' requires the optional '{package}' package "
+            f"(pip install {package})"
+        )
+
+    kwargs = {}
+    if nuts_sampler != 'pymc':
+        kwargs['nuts_sampler'] = nuts_sampler
+
+    if backend == 'numpyro':
+        # JAX on CPU exposes a single device unless XLA_FLAGS asks for more, and reads
+        # the flag only when it is first imported. If JAX is not loaded yet and XLA_FLAGS
+        # is unset, set it for the process (one device per chain) and run chains in
+        # parallel; a user-set XLA_FLAGS is left alone. Without a device count flag,
+        # vectorize the chains on one device instead of running them sequentially.
+        if 'jax' not in sys.modules and 'XLA_FLAGS' not in os.environ:
+            os.environ['XLA_FLAGS'] = f'--xla_force_host_platform_device_count={max(int(n_chains), 1)}'
+        parallel = ('jax' not in sys.modules
+                    and '--xla_force_host_platform_device_count' in os.environ.get('XLA_FLAGS', ''))
+        kwargs['nuts_sampler_kwargs'] = {'chain_method': 'parallel' if parallel else 'vectorized'}
+
+    return kwargs
+
+
+# ============================================================================
+# SAMPLER CONFIGURATION (SHARED BY BOTH MODELS)
+# ============================================================================
+
+@dataclass
+class SamplerConfig:
+    """Sampling, inference and convergence options shared by both models"""
+
+    n_samples: int = 2000
+    n_tune: int = 1000
+    n_chains: int = 4
+    target_accept: float = 0.95
+    random_seed: int = 42
+    # NUTS implementation: 'pymc', 'nutpie' or 'numpyro' (same InferenceData layout).
+    # Block sampling (adaptive, checkpoint_dir) continues on PyMC's NUTS, so it needs 'pymc'.
+    sampler_backend: str = 'pymc'
+    # 'sufficient_stats' evaluates the Gaussian likelihood from X'X, X'y, y'y and n
+    # (same posterior, per-gradient cost independent of the rows; no y_obs in the trace)
+    likelihood: str = 'full'
+    # 'nuts', 'gibbs' (simple model: exact blocked Gibbs, n_tune burn-in draws) or an
+    # approximate preview ('advi', 'fullrank_advi', 'pathfinder': approx_draws draws
+    # after vi_iterations optimization steps)
+    inference: str = 'nuts'
+    approx_draws: int = 4000
+    vi_iterations: int = 30000
+    # adaptive: sample in blocks of n_samples draws until R-hat < max_rhat, bulk/tail
+    # ESS > min_ess and divergences <= max_divergences, or max_draws per chain /
+    # max_minutes of wall-clock time. max_rhat / min_ess also set results.converged.
+    adaptive: bool = False
+    max_rhat: float = 1.01
+    min_ess: float = 400
+    max_divergences: int = 0
+    max_draws: int = 20000
+    max_minutes: Optional[float] = None
+    # Write draws to checkpoint_dir in netCDF blocks of checkpoint_every draws;
+    # resume=True continues an interrupted run from the saved blocks.
+    checkpoint_dir: Optional[str] = None
+    checkpoint_every: int = 500
+    resume: bool = False
+
+    def __post_init__(self):
+        self.sampler_backend = _validate_sampler_backend(self.sampler_backend)
+        self.likelihood = _validate_likelihood(self.likelihood)
+        self.inference = _validate_inference(self.inference, SIMPLE_INFERENCE_METHODS)
+        self.checkpoint_dir = None if self.checkpoint_dir is None else str(self.checkpoint_dir)
+        if self.inference == 'nuts' and self.sampler_backend != 'pymc' and (
+                self.adaptive or self.checkpoint_dir is not None):
+            raise ValueError(
+                f"adaptive / checkpoint_dir sampling continues every block after the first on PyMC's NUTS; "
+                f"use sampler_backend='pymc' instead of '{self.sampler_backend}'"
+            )
+
+    @classmethod
+    def from_dict(cls, options: Dict) -> 'SamplerConfig':
+        """Config from a mapping such as the `model` section of config.yaml (other keys are ignored)"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in options.items() if key in names})
+
+
+def _explicit_options(**options) -> Dict:
+    """
+    Keyword overrides for a SamplerConfig: the model's positional sampling arguments
+    (n_samples ... random_seed, as before SamplerConfig existed) count only when given
+    """
+    core = ('n_samples', 'n_tune', 'n_chains', 'target_accept', 'random_seed')
+    return {key: value for key, value in options.items() if key not in core or value is not None}
+
+
+class _SamplerOptions:
+    """Copies a SamplerConfig (plus keyword overrides) onto the model as attributes"""
+
+    def _init_sampler(self, sampler: Optional[SamplerConfig], overrides: Dict, inference_methods):
+        config = replace(sampler or SamplerConfig(), **overrides)
+        _validate_inference(config.inference, inference_methods)
+        self.sampler_config = config
+        for f in fields(config):
+            setattr(self, f.name, getattr(config, f.name))
+
+
+# ============================================================================
+# SIMPLE BAYESIAN MODEL
+# ============================================================================
+
+class SimpleBayesianModel(_SamplerOptions):
+    """
+    Simple (non-hierarchical) Bayesian elasticity model
+    
+    Use for:
+    - Overall data (BJ's + Sam's combined)
+    - Single retailer analysis
+    
+    Example:
+    -------
+    >>> model = SimpleBayesianModel(priors='default')
+    >>> results = model.fit(df)
+    >>> quick = SimpleBayesianModel(n_samples=500, inference='gibbs')  # SamplerConfig fields as keywords
+
+    Sampling options come from `sampler` (a SamplerConfig), with keyword overrides;
+    n_samples / n_tune / n_chains / target_accept / random_seed can also be passed
+    positionally as before (None keeps the `sampler` value; for an unseeded run pass
+    `sampler=SamplerConfig(random_seed=None)`). Built models are cached by structure,
+    so refitting on new data of the same structure only swaps the pm.Data values (`clear_model_cache()` drops the cache).
+    """
+    
+    def __init__(
+        self,
+        priors: str = 'default',
+        n_samples: Optional[int] = None,
+        n_tune: Optional[int] = None,
+        n_chains: Optional[int] = None,
+        target_accept: Optional[float] = None,
+        random_seed: Optional[int] = None,
+        verbose: bool = True,
+        *,
+        sampler: Optional[SamplerConfig] = None,
+        **sampler_options
+    ):
+        """Initialize model"""
+        self.priors = PriorLibrary.get_priors(priors)
+        self.verbose = verbose
+        self._init_sampler(
+            sampler,
+            _explicit_options(n_samples=n_samples, n_tune=n_tune, n_chains=n_chains,
+                              target_accept=target_accept, random_seed=random_seed, **sampler_options),
+            SIMPLE_INFERENCE_METHODS,
+        )
+        
+        self.logger = self._setup_logger()
+        self.model = None
+        self._cache_entry = None
+        self._warm_start = None
+        self.trace = None
+    
+    def _setup_logger(self):
+        """Setup logging"""
+        logger = logging.getLogger('SimpleBayesianModel')
+        logger.setLevel(logging.INFO if self.verbose else logging.WARNING)
+        
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+        
+        return logger
+    
+    def fit(self, data: pd.DataFrame, warm_start=None) -> BayesianResults:
+        """
+        Fit Bayesian model
+        
+        Parameters:
+        ----------
+        data : pd.DataFrame
+            Model-ready data from data_prep.py
+        warm_start : str, path or InferenceData, optional
+            Previous trace (e.g. a run's trace.nc) of the same model structure. Chains
+            start from its last draws with its step size and mass matrix, so a short
+            `n_tune` is enough for incremental refreshes.
+        
+        Returns:
+        -------
+        BayesianResults
+            Results object
+        """
+        
+        self.logger.info("="*80)
+        self.logger.info("FITTING SIMPLE BAYESIAN MODEL")
+        self.logger.info("="*80)
+        
+        self._warm_start = self._prepare_warm_start(warm_start)
+        
+        # Build model
+        self.logger.info("\nBuilding model...")
+        self._build_model(data)
+        
+        # Sample
+        self.logger.info(f"\n{_sampling_message(self)}...")
+        try:
+            self._sample()
+        finally:
+            self.model = _checkin_model(self._cache_entry)
+        _tag_trace(self.trace, data)
+        
+        # Create results
+        self.logger.info("\nProcessing results...")
+        results = BayesianResults(
+            trace=self.trace,
+            model=self.model,
+            data=data,
+            config=_results_config(self),
+            priors=self.priors
+        )
+        
+        self.logger.info("\n" + "="*80)
+        self.logger.info("✓ FITTING COMPLETE")
+        self.logger.info("="*80)
+        
+        return results
+    
+    def update(self, data: pd.DataFrame, previous) -> BayesianResults:
+        """
+        Sequential Bayesian update from a previous fit.
+        
+        The previous joint posterior is moment-matched to a multivariate normal and
+        used as the prior; only rows dated after the previous fit's last `Date` are
+        fitted, so weekly refreshes cost the same however long the history grows.
+        
+        Parameters:
+        ----------
+        data : pd.DataFrame
+            Model-ready data (full history or just the new weeks)
+        previous : str, path, InferenceData or BayesianResults
+            Output of an earlier fit() / update() on the same model structure
+        
+        Returns:
+        -------
+        BayesianResults
+            Posterior given all data seen so far; `data` holds only the new rows
+        """
+        if self.inference == 'gibbs':
+            raise ValueError("update() needs inference='nuts' or an approximate method, not 'gibbs'")
+        
+        prior_trace = _load_trace(previous)
+        new_rows = _rows_after(data, prior_trace)
+        self.logger.info("="*80)
+        self.logger.info("SEQUENTIAL UPDATE (SIMPLE MODEL)")
+        self.logger.info("="*80)
+        self.logger.info(f"\nNew rows after {prior_trace.posterior.attrs['data_end_date']}: {len(new_rows)}")
+        
+        y, design = self._design_terms(new_rows)
+        names = [name for name, _ in design]
+        mean, chol, layout = _moment_matched_prior(prior_trace, names + ['sigma'])
+        values = _likelihood_data(y, np.column_stack([x for _, x in design]), likelihood=self.likelihood)
+        values.update(prior_mean=mean, prior_chol=chol)
+        terms = [(name, False) for name in names]
+        
+        key = _model_cache_key('sequential_simple', (tuple(terms), tuple(layout)), self.likelihood, {})
+        self._cache_entry = _checkout_model(
+            key, values, lambda: _build_sequential_model(values, layout, terms, self.likelihood)
+        )
+        self.model = self._cache_entry['model']
+        self._warm_start = None
+        
+        self.logger.info(f"\n{_sampling_message(self)}...")
+        try:
+            self._sample()
+        finally:
+            self.model = _checkin_model(self._cache_entry)
+        _tag_trace(self.trace, new_rows)
+        self.trace.posterior.attrs['sequential_updates'] = int(prior_trace.posterior.attrs.get('sequential_updates', 0)) + 1
+        
+        return BayesianResults(
+            trace=self.trace,
+            model=self.model,
+            data=new_rows,
+            config=_results_config(self),
+            priors=self.priors
+        )
+    
+    def _design_terms(self, data: pd.DataFrame):
+        """
+        Response and ordered (coefficient name, feature column) pairs of the linear predictor.
+
+        Coefficient names double as PyMC variable names and PriorLibrary keys.
+        """
+        
+        # Extract data
+        y = data['Log_Volume_Sales_SI'].values
+        use_dual = ('Log_Base_Price_SI' in data.columns) and ('Promo_Depth_SI' in data.columns)
+        X_base = data['Log_Base_Price_SI'].values if use_dual else data['Log_Price_SI'].values
+        X_cross = data['Log_Price_PL'].values
+        X_has_competitor = data['has_competitor'].values if 'has_competitor' in data else np.ones(len(data))
+
+        if use_dual:
+            X_promo = data['Promo_Depth_SI'].values
+            X_has_promo = data['has_promo'].values if 'has_promo' in data else np.ones(len(data))
+        else:
+            X_promo = data['Promo_Intensity_SI'].values if 'Promo_Intensity_SI' in data else None
+            X_has_promo = data['has_promo'].values if 'has_promo' in data else (np.ones(len(data)) if X_promo is not None else None)
+
+        # Safety: ensure no NaNs propagate into the linear predictor
+        X_cross = np.nan_to_num(X_cross, nan=0.0)
+        X_has_competitor = np.nan_to_num(X_has_competitor, nan=0.0)
+        if X_promo is not None:
+            X_promo = np.nan_to_num(X_promo, nan=0.0)
             X_has_promo = np.nan_to_num(X_has_promo, nan=0.0)
         X_spring = data['Spring'].values if 'Spring' in data else None
         X_summer = data['Summer'].values if 'Summer' in data else None
         X_fall = data['Fall'].values if 'Fall' in data else None
         X_time = data['Week_Number'].values if 'Week_Number' in data else None
-        
-        with pm.Model() as model:
-            # Priors
-            intercept = pm.Normal('intercept', 
-                                 mu=self.priors['intercept']['mu'],
-                                 sigma=self.priors['intercept']['sigma'])
 
-            base_elasticity = pm.Normal(
-                'base_elasticity',
-                mu=self.priors['base_elasticity']['mu'],
-                sigma=self.priors['base_elasticity']['sigma']
-            )
-            
-            elasticity_cross = pm.Normal('elasticity_cross',
-                                         mu=self.priors['elasticity_cross']['mu'],
-                                         sigma=self.priors['elasticity_cross']['sigma'])
-            
-            # Linear predictor
-            mu = intercept + base_elasticity * X_base + elasticity_cross * (X_cross * X_has_competitor)
-            
-            # Optional features
-            if X_promo is not None:
-                if use_dual:
-                    promo_elasticity = pm.Normal(
-                        'promo_elasticity',
-                        mu=self.priors['promo_elasticity']['mu'],
-                        sigma=self.priors['promo_elasticity']['sigma']
-                    )
-                    mu += promo_elasticity * (X_promo * X_has_promo)
-                else:
-                    beta_promo = pm.Normal('beta_promo',
-                                          mu=self.priors['beta_promo']['mu'],
-                                          sigma=self.priors['beta_promo']['sigma'])
-                    mu += beta_promo * (X_promo * X_has_promo)
-            
-            if X_spring is not None:
-                beta_spring = pm.Normal('beta_spring',
-                                       mu=self.priors['beta_spring']['mu'],
-                                       sigma=self.priors['beta_spring']['sigma'])
-                beta_summer = pm.Normal('beta_summer',
-                                       mu=self.priors['beta_summer']['mu'],
-                                       sigma=self.priors['beta_summer']['sigma'])
-                beta_fall = pm.Normal('beta_fall',
-                                     mu=self.priors['beta_fall']['mu'],
-                                     sigma=self.priors['beta_fall']['sigma'])
-                mu += beta_spring * X_spring + beta_summer * X_summer + beta_fall * X_fall
-            
-            if X_time is not None:
-                beta_time = pm.Normal('beta_time',
-                                     mu=self.priors['beta_time']['mu'],
-                                     sigma=self.priors['beta_time']['sigma'])
-                mu += beta_time * X_time
-            
-            # Likelihood
-            sigma = pm.HalfNormal('sigma', sigma=self.priors['sigma']['sigma'])
-            y_obs = pm.Normal('y_obs', mu=mu, sigma=sigma, observed=y)
+        terms = [
+            ('intercept', np.ones(len(y))),
+            ('base_elasticity', X_base),
+            ('elasticity_cross', X_cross * X_has_competitor),
+        ]
+
+        # Optional features
+        if X_promo is not None:
+            terms.append(('promo_elasticity' if use_dual else 'beta_promo', X_promo * X_has_promo))
+
+        if X_spring is not None:
+            terms += [('beta_spring', X_spring), ('beta_summer', X_summer), ('beta_fall', X_fall)]
+
+        if X_time is not None:
+            terms.append(('beta_time', X_time))
+
+        return y, terms
+    
+    def _build_model(self, data: pd.DataFrame):
+        """Build PyMC model (or reuse the cached graph with the same structure)"""
         
-        self.model = model
+        y, design = self._design_terms(data)
+        names = tuple(name for name, _ in design)
+        values = _likelihood_data(y, np.column_stack([x for _, x in design]), likelihood=self.likelihood)
+        
+        def build():
+            with pm.Model() as model:
+                data_vars = {name: _data_container(name, value) for name, value in values.items()}
+                
+                # Priors: independent Normals on every linear-predictor coefficient
+                terms = []
+                for name in names:
+                    coef = pm.Normal(name,
+                                     mu=self.priors[name]['mu'],
+                                     sigma=self.priors[name]['sigma'])
+                    terms.append((coef, False))
+                
+                # Likelihood
+                sigma = pm.HalfNormal('sigma', sigma=self.priors['sigma']['sigma'])
+                _add_gaussian_likelihood(terms, data_vars, sigma, likelihood=self.likelihood)
+            return model
+        
+        key = _model_cache_key('simple', names, self.likelihood, self.priors)
+        self._cache_entry = _checkout_model(key, values, build)
+        self.model = self._cache_entry['model']
+        self._design = (y, design)
+        if self._cache_entry['hits']:
+            self.logger.info("Reusing compiled model (structure unchanged; data updated via set_data)")
+    
+    def _prepare_warm_start(self, warm_start):
+        """Load a warm-start trace; only NUTS can continue from one"""
+        if warm_start is None:
+            return None
+        if self.inference != 'nuts':
+            raise ValueError(f"warm_start requires inference='nuts' (got '{self.inference}')")
+        if self.sampler_backend != 'pymc':
+            raise ValueError(
+                f"warm_start continues on PyMC's NUTS; use sampler_backend='pymc' (got '{self.sampler_backend}')"
+            )
+        trace = _load_trace(warm_start)
+        self.logger.info(f"Warm start: {warm_start if isinstance(warm_start, (str, os.PathLike)) else 'previous trace'} "
+                         f"({trace.posterior.sizes['chain']} chains × {trace.posterior.sizes['draw']} draws)")
+        return trace
     
     def _sample(self):
         """Run MCMC sampling"""
         
-        with self.model:
-            self.trace = pm.sample(
-                draws=self.n_samples,
+        if self.inference == 'gibbs':
+            self._sample_gibbs()
+            return
+        if self.inference in APPROXIMATE_INFERENCE_METHODS:
+            self._sample_approximate()
+            return
+        
+        if self.adaptive:
+            self.trace = _sample_in_blocks(
+                self._cache_entry,
+                block_draws=self.n_samples,
                 tune=self.n_tune,
                 chains=self.n_chains,
                 target_accept=self.target_accept,
                 random_seed=self.random_seed,
-                return_inferencedata=True,
-                progressbar=self.verbose
+                progressbar=self.verbose,
+                sampler_backend=self.sampler_backend,
+                max_draws=self.max_draws,
+                logger=self.logger,
+                thresholds={
+                    'max_rhat': self.max_rhat,
+                    'min_ess': self.min_ess,
+                    'max_divergences': self.max_divergences,
+                },
+                max_seconds=None if self.max_minutes is None else 60.0 * self.max_minutes,
+                warm_start=self._warm_start,
+                checkpoint_dir=self.checkpoint_dir,
+                resume=self.resume,
+            )
+            return
+        
+        if self.checkpoint_dir is not None:
+            self.trace = _sample_in_blocks(
+                self._cache_entry,
+                block_draws=min(self.checkpoint_every, self.n_samples),
+                tune=self.n_tune,
+                chains=self.n_chains,
+                target_accept=self.target_accept,
+                random_seed=self.random_seed,
+                progressbar=self.verbose,
+                sampler_backend=self.sampler_backend,
+                max_draws=self.n_samples,
+                logger=self.logger,
+                warm_start=self._warm_start,
+                checkpoint_dir=self.checkpoint_dir,
+                resume=self.resume,
             )
+            return
+        
+        self.trace = _sample_nuts(
+            self._cache_entry,
+            draws=self.n_samples,
+            tune=self.n_tune,
+            chains=self.n_chains,
+            target_accept=self.target_accept,
+            random_seed=self.random_seed,
+            progressbar=self.verbose,
+            sampler_backend=self.sampler_backend,
+            warm_start=self._warm_start,
+        )
+    
+    def _sample_approximate(self):
+        """Fast preview: draw `approx_draws` samples from an ADVI / Pathfinder approximation"""
+        
+        self.trace = _fit_approximate(
+            self.model,
+            method=self.inference,
+            draws=self.approx_draws,
+            vi_iterations=self.vi_iterations,
+            random_seed=self.random_seed,
+            progressbar=self.verbose,
+        )
+    
+    def _sample_gibbs(self):
+        """Draw from the exact posterior with the blocked Gibbs sampler (n_tune = burn-in)"""
+        
+        y, design = self._design
+        names = [name for name, _ in design]
+        beta, sigma = _gibbs_linear_gaussian(
+            X=np.column_stack([x for _, x in design]),
+            y=y,
+            prior_mu=np.array([self.priors[name]['mu'] for name in names]),
+            prior_sigma=np.array([self.priors[name]['sigma'] for name in names]),
+            sigma_scale=self.priors['sigma']['sigma'],
+            draws=self.n_samples,
+            burn=self.n_tune,
+            chains=self.n_chains,
+            random_seed=self.random_seed,
+        )
+        
+        posterior = {name: beta[:, :, j] for j, name in enumerate(names)}
+        posterior['sigma'] = sigma
+        self.trace = az.from_dict(
+            posterior=posterior,
+            sample_stats={'diverging': np.zeros(sigma.shape, dtype=bool)},
+            observed_data={'y_obs': y},
+            attrs={'inference_method': 'gibbs'},
+        )
+
+
+# ============================================================================
+# GROUP EFFECT PARAMETERIZATION (HIERARCHICAL MODEL)
+# ============================================================================
+
+PARAMETERIZATIONS = ('centered', 'non_centered', 'auto')
+
+# 'auto' threshold on (per-group standard error) / (prior scale of sigma_group_*).
+# Below 1 every retailer's coefficient is pinned down by its own data more tightly
+# than the group effects are expected to spread, so the centered posterior is close
+# to Gaussian; above it the effects are driven by sigma_group_* and the centered
+# form develops the funnel that non-centering removes (Betancourt & Girolami, 2015).
+AUTO_CENTERED_MAX_SE_RATIO = 1.0
+
+
+def _validate_parameterization(parameterization: Optional[str]) -> str:
+    """Normalize a parameterization name and fail fast on unsupported values"""
+    name = str(parameterization or 'centered').strip().lower().replace('-', '_')
+    if name not in PARAMETERIZATIONS:
+        raise ValueError(f"Unsupported parameterization: {parameterization}. Options: {list(PARAMETERIZATIONS)}")
+    return name
+
+
+def _group_effect(name: str, mu, sigma, centered: bool):
+    """
+    Group-level effect `name ~ Normal(mu, sigma, dims=GROUP_DIM)`.
+
+    The non-centered form samples standard-normal offsets `{name}_offset` and
+    exposes `name = mu + sigma * offset` as a Deterministic, so the trace keeps
+    the same variable names either way while NUTS avoids the funnel between
+    `sigma` and the group effects when there are only a few groups.
+    """
+    if centered:
+        return pm.Normal(name, mu=mu, sigma=sigma, dims=GROUP_DIM)
+    offset = pm.Normal(f'{name}_offset', mu=0.0, sigma=1.0, dims=GROUP_DIM)
+    return pm.Deterministic(name, mu + sigma * offset, dims=GROUP_DIM)
+
+
+def _identification_ratios(
+    y: np.ndarray,
+    grouped: Dict[str, np.ndarray],
+    shared: List[np.ndarray],
+    group_idx: np.ndarray,
+    n_groups: int,
+    group_scales: Dict[str, float],
+) -> Dict[str, float]:
+    """
+    Largest (per-group standard error) / (prior scale of sigma_group_*) of each grouped effect.
+
+    Standard errors come from an unpooled least-squares fit (group-specific columns
+    for every grouped effect plus the shared columns), so they grow with fewer weeks
+    per retailer, less price / promo variation and collinearity between intercepts
+    and price columns.
+    """
+    onehot = np.eye(n_groups)[group_idx]
+    blocks = [onehot * x[:, None] for x in grouped.values()]
+    X = np.column_stack(blocks + list(shared))
+
+    XtX_inv = np.linalg.pinv(X.T @ X)
+    beta = XtX_inv @ (X.T @ y)
+    dof = max(len(y) - X.shape[1], 1)
+    sigma2 = float(((y - X @ beta) ** 2).sum() / dof)
+    se = np.sqrt(np.clip(np.diag(XtX_inv) * sigma2, 0.0, None))
+
+    return {
+        name: float(se[k * n_groups:(k + 1) * n_groups].max() / group_scales[name])
+        for k, name in enumerate(grouped)
+    }
+
+
+def _choose_parameterization(ratios: Dict[str, float]) -> Dict[str, str]:
+    """
+    'auto' rule: centered when every group's standard error is below
+    AUTO_CENTERED_MAX_SE_RATIO times the prior scale of the group effects,
+    non-centered otherwise (see _identification_ratios).
+    """
+    return {
+        name: 'centered' if ratio < AUTO_CENTERED_MAX_SE_RATIO else 'non_centered'
+        for name, ratio in ratios.items()
+    }
 
 
 # ============================================================================
 # HIERARCHICAL BAYESIAN MODEL
 # ============================================================================
 
-class HierarchicalBayesianModel:
+class HierarchicalBayesianModel(_SamplerOptions):
     """
     Hierarchical Bayesian model with partial pooling
     
@@ -847,29 +2715,49 @@ class HierarchicalBayesianModel:
     -------
     >>> model = HierarchicalBayesianModel()
     >>> results = model.fit(df)  # df must have 'Retailer' column
+
+    Sampling options come from `sampler` (a SamplerConfig), with keyword or positional
+    overrides, and built models are cached by structure, as for SimpleBayesianModel.
+
+    `parameterization` controls the base / promo / intercept group effects:
+    'centered' (default), 'non_centered' (standard-normal offsets; removes the
+    funnel with few retailers) or 'auto' (centered for an effect when every
+    retailer's standard error is below AUTO_CENTERED_MAX_SE_RATIO times the
+    sigma_group prior scale). The chosen forms are kept in
+    `group_parameterization` and the ratios behind them in `identification_ratios`.
     """
     
     def __init__(
         self,
         priors: str = 'default',
-        n_samples: int = 2000,
-        n_tune: int = 1000,
-        n_chains: int = 4,
-        target_accept: float = 0.95,
-        random_seed: int = 42,
-        verbose: bool = True
+        n_samples: Optional[int] = None,
+        n_tune: Optional[int] = None,
+        n_chains: Optional[int] = None,
+        target_accept: Optional[float] = None,
+        random_seed: Optional[int] = None,
+        verbose: bool = True,
+        *,
+        sampler: Optional[SamplerConfig] = None,
+        parameterization: str = 'centered',
+        **sampler_options
     ):
         """Initialize model"""
         self.priors = PriorLibrary.get_priors(priors)
-        self.n_samples = n_samples
-        self.n_tune = n_tune
-        self.n_chains = n_chains
-        self.target_accept = target_accept
-        self.random_seed = random_seed
         self.verbose = verbose
+        self._init_sampler(
+            sampler,
+            _explicit_options(n_samples=n_samples, n_tune=n_tune, n_chains=n_chains,
+                              target_accept=target_accept, random_seed=random_seed, **sampler_options),
+            HIERARCHICAL_INFERENCE_METHODS,
+        )
+        self.parameterization = _validate_parameterization(parameterization)
+        self.group_parameterization = None
+        self.identification_ratios = None
         
         self.logger = self._setup_logger()
         self.model = None
+        self._cache_entry = None
+        self._warm_start = None
         self.trace = None
         self.groups = None
     
@@ -886,7 +2774,7 @@ class HierarchicalBayesianModel:
         
         return logger
     
-    def fit(self, data: pd.DataFrame) -> HierarchicalResults:
+    def fit(self, data: pd.DataFrame, warm_start=None) -> HierarchicalResults:
         """
         Fit hierarchical Bayesian model
         
@@ -894,6 +2782,9 @@ class HierarchicalBayesianModel:
         ----------
         data : pd.DataFrame
             Must have 'Retailer' column
+        warm_start : str, path or InferenceData, optional
+            Previous trace (e.g. a run's trace.nc) with the same retailers and model
+            structure; see `SimpleBayesianModel.fit`.
         
         Returns:
         -------
@@ -908,17 +2799,23 @@ class HierarchicalBayesianModel:
         self.logger.info("FITTING HIERARCHICAL BAYESIAN MODEL")
         self.logger.info("="*80)
         
-        # Get groups
-        self.groups = data['Retailer'].unique()
+        # Get groups (sorted, the order of the group index and the `retailer` coords)
+        self.groups = np.asarray(pd.Categorical(data['Retailer'].astype(str)).categories, dtype=object)
         self.logger.info(f"\nGroups: {list(self.groups)}")
         
+        self._warm_start = self._prepare_warm_start(warm_start)
+        
         # Build model
         self.logger.info("\nBuilding hierarchical model...")
         self._build_model(data)
         
         # Sample
-        self.logger.info(f"\nSampling ({self.n_chains} chains × {self.n_samples} samples)...")
-        self._sample()
+        self.logger.info(f"\n{_sampling_message(self)}...")
+        try:
+            self._sample()
+        finally:
+            self.model = _checkin_model(self._cache_entry)
+        _tag_trace(self.trace, data, groups=self.groups)
         
         # Create results
         self.logger.info("\nProcessing results...")
@@ -926,7 +2823,7 @@ class HierarchicalBayesianModel:
             trace=self.trace,
             model=self.model,
             data=data,
-            config=self.__dict__,
+            config=_results_config(self),
             priors=self.priors,
             groups=self.groups
         )
@@ -937,8 +2834,71 @@ class HierarchicalBayesianModel:
         
         return results
     
-    def _build_model(self, data: pd.DataFrame):
-        """Build hierarchical PyMC model"""
+    def update(self, data: pd.DataFrame, previous) -> HierarchicalResults:
+        """
+        Sequential Bayesian update from a previous fit.
+        
+        Same as `SimpleBayesianModel.update`: the previous joint posterior (group
+        effects, global means, group spreads, shared effects, sigma) becomes a
+        moment-matched multivariate normal prior, and only the new `Date` rows are
+        fitted. Retailers keep the previous fit's order; new retailers are rejected.
+        """
+        prior_trace = _load_trace(previous)
+        if 'retailers' not in prior_trace.posterior.attrs:
+            raise ValueError("Previous trace has no retailer order; it must come from fit() or update()")
+        new_rows = _rows_after(data, prior_trace)
+        self.groups = np.array(json.loads(prior_trace.posterior.attrs['retailers']), dtype=object)
+        group_idx = pd.Categorical(new_rows['Retailer'], categories=self.groups).codes
+        if (group_idx < 0).any():
+            unknown = sorted(set(new_rows['Retailer'][group_idx < 0].astype(str)))
+            raise ValueError(f"Retailers not in the previous posterior: {unknown}")
+        n_groups = len(self.groups)
+        
+        self.logger.info("="*80)
+        self.logger.info("SEQUENTIAL UPDATE (HIERARCHICAL MODEL)")
+        self.logger.info("="*80)
+        self.logger.info(f"\nNew rows after {prior_trace.posterior.attrs['data_end_date']}: {len(new_rows)}")
+        
+        y, design, _ = self._design_terms(new_rows)
+        terms = [(name, grouped) for name, _, grouped in design]
+        mean, chol, layout = _moment_matched_prior(prior_trace, [name for name, _ in terms] + ['sigma'])
+        values = _likelihood_data(
+            y, np.column_stack([x for _, x, _ in design]), likelihood=self.likelihood,
+            group_idx=group_idx, n_groups=n_groups,
+        )
+        values.update(prior_mean=mean, prior_chol=chol)
+        
+        key = _model_cache_key('sequential_hierarchical', (tuple(terms), tuple(layout), tuple(self.groups)),
+                               self.likelihood, {})
+        self._cache_entry = _checkout_model(
+            key, values, lambda: _build_sequential_model(values, layout, terms, self.likelihood, self.groups)
+        )
+        self.model = self._cache_entry['model']
+        self._warm_start = None
+        
+        self.logger.info(f"\n{_sampling_message(self)}...")
+        try:
+            self._sample()
+        finally:
+            self.model = _checkin_model(self._cache_entry)
+        _tag_trace(self.trace, new_rows, groups=self.groups)
+        self.trace.posterior.attrs['sequential_updates'] = int(prior_trace.posterior.attrs.get('sequential_updates', 0)) + 1
+        
+        return HierarchicalResults(
+            trace=self.trace,
+            model=self.model,
+            data=new_rows,
+            config=_results_config(self),
+            priors=self.priors,
+            groups=self.groups
+        )
+    
+    def _design_terms(self, data: pd.DataFrame):
+        """
+        Response and ordered (coefficient name, feature column, group-specific?) triples.
+
+        Returns (y, terms, use_dual); coefficient names double as PyMC variable names.
+        """
         
         # Extract data
         y = data['Log_Volume_Sales_SI'].values
@@ -946,8 +2906,6 @@ class HierarchicalBayesianModel:
         X_base = data['Log_Base_Price_SI'].values if use_dual else data['Log_Price_SI'].values
         X_cross = data['Log_Price_PL'].values
         X_has_competitor = data['has_competitor'].values if 'has_competitor' in data else np.ones(len(data))
-        group_idx = pd.Categorical(data['Retailer']).codes
-        n_groups = len(self.groups)
         
         if use_dual:
             X_promo = data['Promo_Depth_SI'].values
@@ -967,135 +2925,324 @@ class HierarchicalBayesianModel:
             X_promo = np.nan_to_num(X_promo, nan=0.0)
             X_has_promo = np.nan_to_num(X_has_promo, nan=0.0)
         
-        with pm.Model() as model:
-            if use_dual:
-                # GLOBAL (POPULATION) PARAMETERS
-                mu_global_base = pm.Normal(
-                    'mu_global_base',
-                    mu=self.priors['base_elasticity']['mu'],
-                    sigma=self.priors['base_elasticity']['sigma'],
-                )
-                sigma_group_base = pm.HalfNormal(
-                    'sigma_group_base',
-                    sigma=self.priors['sigma_group']['sigma'],
-                )
+        terms = [
+            ('intercept', np.ones(len(y)), True),
+            ('base_elasticity' if use_dual else 'elasticity_own', X_base, True),
+            ('elasticity_cross', X_cross * X_has_competitor, False),
+        ]
+        
+        # Optional features (promo is group-specific only in the dual model)
+        if X_promo is not None:
+            terms.append(('promo_elasticity', X_promo * X_has_promo, True) if use_dual
+                         else ('beta_promo', X_promo * X_has_promo, False))
+        
+        if X_spring is not None:
+            terms += [('beta_spring', X_spring, False), ('beta_summer', X_summer, False), ('beta_fall', X_fall, False)]
+        
+        if X_time is not None:
+            terms.append(('beta_time', X_time, False))
+        
+        return y, terms, use_dual
+    
+    def _build_model(self, data: pd.DataFrame):
+        """Build hierarchical PyMC model (or reuse the cached graph with the same structure)"""
+        
+        y, design, use_dual = self._design_terms(data)
+        group_idx = pd.Categorical(data['Retailer'], categories=self.groups).codes
+        n_groups = len(self.groups)
+        
+        # Centered vs non-centered form of each group effect
+        grouped_cols = {name: x for name, x, grouped in design if grouped}
+        if self.parameterization == 'auto':
+            shared_cols = [x for _, x, grouped in design if not grouped]
+            group_scales = {name: self.priors['sigma_group']['sigma'] for name in grouped_cols}
+            group_scales['intercept'] = 1.0
+            self.identification_ratios = _identification_ratios(
+                y, grouped_cols, shared_cols, group_idx, n_groups, group_scales
+            )
+            self.group_parameterization = _choose_parameterization(self.identification_ratios)
+        else:
+            self.group_parameterization = {name: self.parameterization for name in grouped_cols}
+        self.logger.info(f"Group effect parameterization: {self.group_parameterization}")
+        centered = {name: form == 'centered' for name, form in self.group_parameterization.items()}
+        
+        values = _likelihood_data(
+            y, np.column_stack([x for _, x, _ in design]), likelihood=self.likelihood,
+            group_idx=group_idx, n_groups=n_groups,
+        )
+        
+        def build():
+            with pm.Model(coords={GROUP_DIM: list(self.groups)}) as model:
+                data_vars = {name: _data_container(name, value) for name, value in values.items()}
+                coefs = {}
+                
+                if use_dual:
+                    # GLOBAL (POPULATION) PARAMETERS
+                    mu_global_base = pm.Normal(
+                        'mu_global_base',
+                        mu=self.priors['base_elasticity']['mu'],
+                        sigma=self.priors['base_elasticity']['sigma'],
+                    )
+                    sigma_group_base = pm.HalfNormal(
+                        'sigma_group_base',
+                        sigma=self.priors['sigma_group']['sigma'],
+                    )
 
-                mu_global_promo = pm.Normal(
-                    'mu_global_promo',
-                    mu=self.priors['promo_elasticity']['mu'],
-                    sigma=self.priors['promo_elasticity']['sigma'],
-                )
-                sigma_group_promo = pm.HalfNormal(
-                    'sigma_group_promo',
-                    sigma=self.priors['sigma_group']['sigma'],
-                )
+                    mu_global_promo = pm.Normal(
+                        'mu_global_promo',
+                        mu=self.priors['promo_elasticity']['mu'],
+                        sigma=self.priors['promo_elasticity']['sigma'],
+                    )
+                    sigma_group_promo = pm.HalfNormal(
+                        'sigma_group_promo',
+                        sigma=self.priors['sigma_group']['sigma'],
+                    )
 
-                # GROUP-SPECIFIC PARAMETERS (partial pooling)
-                base_elasticity = pm.Normal(
-                    'base_elasticity',
-                    mu=mu_global_base,
-                    sigma=sigma_group_base,
-                    shape=n_groups,
-                )
-                promo_elasticity = pm.Normal(
-                    'promo_elasticity',
-                    mu=mu_global_promo,
-                    sigma=sigma_group_promo,
-                    shape=n_groups,
-                )
-            else:
-                # Legacy V1 global/group parameters
-                mu_global_own = pm.Normal('mu_global_own',
-                                          mu=self.priors['elasticity_own']['mu'],
-                                          sigma=self.priors['elasticity_own']['sigma'])
+                    # GROUP-SPECIFIC PARAMETERS (partial pooling)
+                    coefs['base_elasticity'] = _group_effect(
+                        'base_elasticity', mu_global_base, sigma_group_base,
+                        centered=centered['base_elasticity'],
+                    )
+                    coefs['promo_elasticity'] = _group_effect(
+                        'promo_elasticity', mu_global_promo, sigma_group_promo,
+                        centered=centered['promo_elasticity'],
+                    )
+                else:
+                    # Legacy V1 global/group parameters
+                    mu_global_own = pm.Normal('mu_global_own',
+                                              mu=self.priors['elasticity_own']['mu'],
+                                              sigma=self.priors['elasticity_own']['sigma'])
+                    
+                    sigma_group_own = pm.HalfNormal('sigma_group_own',
+                                                   sigma=self.priors['sigma_group']['sigma'])
+                    
+                    coefs['elasticity_own'] = _group_effect('elasticity_own', mu_global_own, sigma_group_own,
+                                                            centered=centered['elasticity_own'])
                 
-                sigma_group_own = pm.HalfNormal('sigma_group_own',
-                                               sigma=self.priors['sigma_group']['sigma'])
+                # Group-specific intercepts
+                mu_global_intercept = pm.Normal('mu_global_intercept',
+                                               mu=self.priors['intercept']['mu'],
+                                               sigma=self.priors['intercept']['sigma'])
                 
-                elasticity_own = pm.Normal('elasticity_own',
-                                           mu=mu_global_own,
-                                           sigma=sigma_group_own,
-                                           shape=n_groups)
-            
-            # Group-specific intercepts
-            mu_global_intercept = pm.Normal('mu_global_intercept',
-                                           mu=self.priors['intercept']['mu'],
-                                           sigma=self.priors['intercept']['sigma'])
-            
-            sigma_group_intercept = pm.HalfNormal('sigma_group_intercept',
-                                                 sigma=1.0)
-            
-            intercept = pm.Normal('intercept',
-                                 mu=mu_global_intercept,
-                                 sigma=sigma_group_intercept,
-                                 shape=n_groups)
-            
-            # SHARED PARAMETERS (not group-specific)
-            elasticity_cross = pm.Normal('elasticity_cross',
-                                         mu=self.priors['elasticity_cross']['mu'],
-                                         sigma=self.priors['elasticity_cross']['sigma'])
-            
-            # Linear predictor
-            if use_dual:
-                mu = (
-                    intercept[group_idx]
-                    + base_elasticity[group_idx] * X_base
-                    + elasticity_cross * (X_cross * X_has_competitor)
-                )
-            else:
-                mu = (
-                    intercept[group_idx]
-                    + elasticity_own[group_idx] * X_base
-                    + elasticity_cross * (X_cross * X_has_competitor)
-                )
-            
-            # Optional shared features
-            if X_promo is not None:
-                if use_dual:
-                    mu += promo_elasticity[group_idx] * (X_promo * X_has_promo)
-                else:
-                    beta_promo = pm.Normal('beta_promo',
-                                          mu=self.priors['beta_promo']['mu'],
-                                          sigma=self.priors['beta_promo']['sigma'])
-                    mu += beta_promo * (X_promo * X_has_promo)
-            
-            if X_spring is not None:
-                beta_spring = pm.Normal('beta_spring',
-                                       mu=self.priors['beta_spring']['mu'],
-                                       sigma=self.priors['beta_spring']['sigma'])
-                beta_summer = pm.Normal('beta_summer',
-                                       mu=self.priors['beta_summer']['mu'],
-                                       sigma=self.priors['beta_summer']['sigma'])
-                beta_fall = pm.Normal('beta_fall',
-                                     mu=self.priors['beta_fall']['mu'],
-                                     sigma=self.priors['beta_fall']['sigma'])
-                mu += beta_spring * X_spring + beta_summer * X_summer + beta_fall * X_fall
-            
-            if X_time is not None:
-                beta_time = pm.Normal('beta_time',
-                                     mu=self.priors['beta_time']['mu'],
-                                     sigma=self.priors['beta_time']['sigma'])
-                mu += beta_time * X_time
-            
-            # Likelihood
-            sigma = pm.HalfNormal('sigma', sigma=self.priors['sigma']['sigma'])
-            y_obs = pm.Normal('y_obs', mu=mu, sigma=sigma, observed=y)
+                sigma_group_intercept = pm.HalfNormal('sigma_group_intercept',
+                                                     sigma=1.0)
+                
+                coefs['intercept'] = _group_effect('intercept', mu_global_intercept, sigma_group_intercept,
+                                                   centered=centered['intercept'])
+                
+                # SHARED PARAMETERS (not group-specific), in design order
+                for name, _, grouped in design:
+                    if not grouped:
+                        coefs[name] = pm.Normal(name,
+                                                mu=self.priors[name]['mu'],
+                                                sigma=self.priors[name]['sigma'])
+                
+                # Likelihood
+                sigma = pm.HalfNormal('sigma', sigma=self.priors['sigma']['sigma'])
+                terms = [(coefs[name], grouped) for name, _, grouped in design]
+                _add_gaussian_likelihood(terms, data_vars, sigma, likelihood=self.likelihood, n_groups=n_groups)
+            return model
         
-        self.model = model
+        structure = (
+            tuple((name, grouped) for name, _, grouped in design),
+            tuple(self.groups),
+            tuple(sorted(self.group_parameterization.items())),
+        )
+        key = _model_cache_key('hierarchical', structure, self.likelihood, self.priors)
+        self._cache_entry = _checkout_model(key, values, build)
+        self.model = self._cache_entry['model']
+        if self._cache_entry['hits']:
+            self.logger.info("Reusing compiled model (structure unchanged; data updated via set_data)")
+    
+    def _prepare_warm_start(self, warm_start):
+        """Load a warm-start trace; only NUTS can continue from one"""
+        if warm_start is None:
+            return None
+        if self.inference != 'nuts':
+            raise ValueError(f"warm_start requires inference='nuts' (got '{self.inference}')")
+        if self.sampler_backend != 'pymc':
+            raise ValueError(
+                f"warm_start continues on PyMC's NUTS; use sampler_backend='pymc' (got '{self.sampler_backend}')"
+            )
+        trace = _load_trace(warm_start)
+        self.logger.info(f"Warm start: {warm_start if isinstance(warm_start, (str, os.PathLike)) else 'previous trace'} "
+                         f"({trace.posterior.sizes['chain']} chains × {trace.posterior.sizes['draw']} draws)")
+        return trace
     
     def _sample(self):
         """Run MCMC sampling"""
         
-        with self.model:
-            self.trace = pm.sample(
-                draws=self.n_samples,
+        if self.inference in APPROXIMATE_INFERENCE_METHODS:
+            self._sample_approximate()
+            return
+        
+        if self.adaptive:
+            self.trace = _sample_in_blocks(
+                self._cache_entry,
+                block_draws=self.n_samples,
                 tune=self.n_tune,
                 chains=self.n_chains,
                 target_accept=self.target_accept,
                 random_seed=self.random_seed,
-                return_inferencedata=True,
-                progressbar=self.verbose
+                progressbar=self.verbose,
+                sampler_backend=self.sampler_backend,
+                max_draws=self.max_draws,
+                logger=self.logger,
+                thresholds={
+                    'max_rhat': self.max_rhat,
+                    'min_ess': self.min_ess,
+                    'max_divergences': self.max_divergences,
+                },
+                max_seconds=None if self.max_minutes is None else 60.0 * self.max_minutes,
+                warm_start=self._warm_start,
+                checkpoint_dir=self.checkpoint_dir,
+                resume=self.resume,
+            )
+            return
+        
+        if self.checkpoint_dir is not None:
+            self.trace = _sample_in_blocks(
+                self._cache_entry,
+                block_draws=min(self.checkpoint_every, self.n_samples),
+                tune=self.n_tune,
+                chains=self.n_chains,
+                target_accept=self.target_accept,
+                random_seed=self.random_seed,
+                progressbar=self.verbose,
+                sampler_backend=self.sampler_backend,
+                max_draws=self.n_samples,
+                logger=self.logger,
+                warm_start=self._warm_start,
+                checkpoint_dir=self.checkpoint_dir,
+                resume=self.resume,
             )
+            return
+        
+        self.trace = _sample_nuts(
+            self._cache_entry,
+            draws=self.n_samples,
+            tune=self.n_tune,
+            chains=self.n_chains,
+            target_accept=self.target_accept,
+            random_seed=self.random_seed,
+            progressbar=self.verbose,
+            sampler_backend=self.sampler_backend,
+            warm_start=self._warm_start,
+        )
+    
+    def _sample_approximate(self):
+        """Fast preview: draw `approx_draws` samples from an ADVI / Pathfinder approximation"""
+        
+        self.trace = _fit_approximate(
+            self.model,
+            method=self.inference,
+            draws=self.approx_draws,
+            vi_iterations=self.vi_iterations,
+            random_seed=self.random_seed,
+            progressbar=self.verbose,
+        )
+
+
+# ============================================================================
+# TRACE EXPORT
+# ============================================================================
+
+TRACE_COMPRESSIONS = ('zlib', 'blosc', 'none')
+
+
+def _compression_encoding(compression: str, complevel: int) -> Dict:
+    """netCDF (h5netcdf) encoding keys for a compression name"""
+    if compression == 'zlib':
+        return {'zlib': True, 'complevel': int(complevel)}
+    if compression == 'blosc':
+        if importlib.util.find_spec('hdf5plugin') is None:
+            raise ImportError("compression='blosc' requires hdf5plugin (pip install hdf5plugin)")
+        import hdf5plugin
+        return dict(hdf5plugin.Blosc(cname='zstd', clevel=int(complevel), shuffle=hdf5plugin.Blosc.SHUFFLE))
+    return {}
+
+
+def export_trace(
+    trace: az.InferenceData,
+    path: str,
+    groups=('posterior', 'sample_stats'),
+    float32: bool = False,
+    compression: str = 'zlib',
+    complevel: int = 4,
+    thin: int = 1,
+    chunk_draws: int = 1000,
+) -> Dict:
+    """
+    Write a trimmed, compressed trace.nc for archiving / report-only reloads.
+
+    Parameters:
+    ----------
+    groups : sequence of str
+        InferenceData groups to keep (e.g. add 'log_likelihood' or 'observed_data');
+        groups missing from the trace are skipped
+    float32 : bool
+        Downcast float variables to float32 (halves the size; ample for summaries)
+    compression : str
+        'zlib' (default), 'blosc' (needs hdf5plugin) or 'none'
+    thin : int
+        Keep every `thin`-th draw
+    chunk_draws : int
+        Chunk length along the draw axis (one chain per chunk), so a reload of a
+        few variables or chains reads only the chunks it needs
+
+    Returns:
+    -------
+    Dict
+        path, groups written, size_mb, write_seconds, load_seconds (lazy open +
+        reading the posterior back)
+    """
+    compression = str(compression or 'none').lower()
+    if compression not in TRACE_COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}. Options: {list(TRACE_COMPRESSIONS)}")
+    if int(thin) < 1:
+        raise ValueError(f"thin must be >= 1 (got {thin})")
+    path = os.fspath(path)
+    written = [group for group in groups if group in trace.groups()]
+    if not written:
+        raise ValueError(f"None of the groups {list(groups)} are in the trace ({trace.groups()})")
+
+    started = time.perf_counter()
+    tmp_path = path + '.tmp'
+    for i, group in enumerate(written):
+        ds = getattr(trace, group).copy(deep=False)
+        if int(thin) > 1 and 'draw' in ds.dims:
+            ds = ds.isel(draw=slice(None, None, int(thin)))
+
+        encoding = {}
+        for name, da in ds.data_vars.items():
+            if float32 and da.dtype.kind == 'f':
+                ds[name] = da = da.astype(np.float32)
+            if da.dtype.kind not in 'biuf' or da.ndim == 0:
+                continue
+            enc = _compression_encoding(compression, complevel)
+            if enc and {'chain', 'draw'} <= set(da.dims):
+                enc['chunksizes'] = tuple(
+                    1 if dim == 'chain' else min(int(chunk_draws), size) if dim == 'draw' else size
+                    for dim, size in zip(da.dims, da.shape)
+                )
+            encoding[name] = enc
+        ds.to_netcdf(tmp_path, mode='w' if i == 0 else 'a', group=group, engine='h5netcdf', encoding=encoding)
+    os.replace(tmp_path, path)
+    write_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with az.rc_context({'data.load': 'lazy'}):
+        reloaded = az.from_netcdf(path)
+    reloaded.posterior.load()
+    load_seconds = time.perf_counter() - started
+
+    return {
+        'path': path,
+        'groups': written,
+        'size_mb': os.path.getsize(path) / 1e6,
+        'write_seconds': write_seconds,
+        'load_seconds': load_seconds,
+    }
 
 
 # ============================================================================
@@ -8,6 +8,11 @@ Features:
 - Per-retailer data contracts: column names, date formats, price calculations
 - No hardcoded retailer logic — all behavior driven by YAML configuration
 - Loads heterogeneous CSV files with different schemas
+- Contract-driven ingestion: only the columns the pipeline uses, with explicit
+  dtypes, all retailer files read concurrently (optional pyarrow CSV engine)
+- On-disk cache of parsed retailer extracts, keyed by file content + contract,
+  with age/size eviction, and of the whole prepared dataset (skips all of prep
+  when the raw files and PrepConfig are unchanged)
 - Filters to brand-level data via fuzzy matching
 - Creates log transformations
 - Handles missing features via availability masks
@@ -27,10 +32,16 @@ Usage:
 import pandas as pd
 import numpy as np
 import re
+import hashlib
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Union, Optional, Dict, List
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 
 
 # ============================================================================
@@ -75,9 +86,56 @@ class PrepConfig:
     # Keyed by retailer name (must match the retailer label assigned during load).
     # See config_template.yaml for full schema.
     retailer_data_contracts: Optional[Dict] = None
+    # CSV ingestion: read only the columns the contracts (and the legacy Circana
+    # defaults) reference, with explicit dtypes; 'pyarrow' engine needs pyarrow.
+    # Retailer files are read concurrently by up to `load_workers` threads.
+    prune_columns: bool = True
+    csv_engine: str = 'c'  # 'c' or 'pyarrow'
+    load_workers: int = 4
+    # On-disk cache of loaded + validated retailer frames (Parquet when pyarrow is
+    # installed, pickle otherwise). Keyed by the CSV's content hash and the
+    # retailer's contract; None disables it. Entries unused for longer than
+    # cache_max_age_days, or beyond cache_max_mb (least recently used first), are evicted.
+    cache_dir: Optional[str] = None
+    cache_max_age_days: float = 30.0
+    cache_max_mb: float = 2000.0
     verbose: bool = True
 
 
+CSV_ENGINES = ('c', 'pyarrow')
+
+# Text columns read by the pipeline when no contract overrides them (Circana layout)
+_TEXT_COLUMNS = ['Product', 'Time']
+
+# Numeric columns read by the pipeline regardless of contract: sales, Circana base
+# sales, promo unit splits, and the CRX (Costco v2) integrity-check columns
+_NUMERIC_COLUMNS = [
+    'Dollar Sales', 'Unit Sales', 'Volume Sales',
+    'Base Dollar Sales', 'Base Unit Sales',
+    'Unit Sales Any Merch', 'Unit Sales Feature Only',
+    'Unit Sales Display Only', 'Unit Sales Feature and Display',
+    'Gross Dollars', 'Gross Units', 'Coupon Dollars', 'Coupon Units',
+    'Refund Dollars', 'Refund Units', 'Total Discount Dollars',
+    'Promoted Units', 'Avg Net Price',
+]
+
+
+# Bump when the prep logic changes in a way that invalidates cached frames
+CACHE_VERSION = 2
+
+# PrepConfig fields that do not affect the prepared data (left out of cache keys)
+_OPERATIONAL_FIELDS = ('verbose', 'load_workers', 'cache_dir', 'cache_max_age_days', 'cache_max_mb')
+
+
+def _file_digest(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 # ============================================================================
 # MAIN DATA PREP CLASS
 # ============================================================================
@@ -89,15 +147,22 @@ class ElasticityDataPrep:
     Transforms raw retail data into model-ready format.
     Supports heterogeneous data sources (Circana, CRX, etc.) via
     config-driven retailer data contracts.
+
+    After `transform`, `final_data` holds the prepared frame. `raw_data` and
+    `cleaned_data` are the intermediate frames of that run; they are None when
+    the prepared data came from the cache (config.cache_dir), since the
+    pipeline did not run.
     """
 
     def __init__(self, config: Optional[PrepConfig] = None):
         """Initialize with configuration"""
         self.config = config or PrepConfig()
         self.logger = self._setup_logger()
-        self.raw_data = None
-        self.cleaned_data = None
+        self.raw_data = None      # loaded extracts (None after a prepared-data cache hit)
+        self.cleaned_data = None  # filtered / cleaned rows (None after a prepared-data cache hit)
         self.final_data = None
+        self._digests = {}
+        self._date_memo = {}  # (rule kind, pattern, format) -> Series of Timestamps by Time string
 
     def _setup_logger(self):
         """Setup logging"""
@@ -147,6 +212,55 @@ class ElasticityDataPrep:
             .strip()
         )
 
+    def _match_retailer_key(self, retailer_label: str) -> Optional[str]:
+        """Find the contract key that matches a retailer label."""
+        norm = self._norm_retailer(retailer_label)
+        for key in (self.config.retailer_data_contracts or {}):
+            if self._norm_retailer(key) == norm:
+                return key
+        return None
+
+    def _classify_products(
+        self,
+        df: pd.DataFrame,
+        brand_filters: Dict[str, str],
+        competitor_filters: Dict[str, Optional[str]],
+    ) -> pd.Series:
+        """
+        Assign Product_Short ('Sparkling Ice' / 'Private Label' / None) per row.
+
+        Retailers with a contract brand_filter match its substring (then the
+        competitor_filter); others fall back to 'sparkling ice' / 'private label'.
+        Contract keys are resolved once per distinct retailer and substrings are
+        matched on that retailer's distinct Product values, then mapped back to rows.
+        """
+        n = len(df)
+        products = df['Product'] if 'Product' in df.columns else pd.Series('', index=df.index)
+        retailers = df['Retailer'] if 'Retailer' in df.columns else pd.Series('', index=df.index)
+
+        labels = np.full(n, None, dtype=object)
+        retailer_codes, retailer_values = pd.factorize(retailers, use_na_sentinel=False)
+        for code, retailer in enumerate(retailer_values):
+            rows = np.flatnonzero(retailer_codes == code)
+            product_codes, unique_products = pd.factorize(products.iloc[rows], use_na_sentinel=False)
+            # str() per distinct value, as the row-wise matching did (missing -> 'nan' / 'none')
+            unique_products = pd.Series([str(p).lower() for p in unique_products], dtype=object)
+            retailer = str(retailer)
+
+            contract_key = self._match_retailer_key(retailer)
+            if contract_key and contract_key in brand_filters:
+                brand_sub, comp_sub = brand_filters[contract_key], competitor_filters.get(contract_key)
+            else:
+                brand_sub, comp_sub = 'sparkling ice', 'private label'
+
+            is_brand = unique_products.str.contains(brand_sub, regex=False).to_numpy()
+            is_comp = unique_products.str.contains(comp_sub, regex=False).to_numpy() if comp_sub \
+                else np.zeros(len(unique_products), dtype=bool)
+            unique_labels = np.select([is_brand, is_comp], ['Sparkling Ice', 'Private Label'], default=None)
+            labels[rows] = unique_labels[product_codes]
+
+        return pd.Series(labels, index=df.index, dtype=object)
+
     # ========================================================================
     # MAIN PIPELINE
     # ========================================================================
@@ -155,17 +269,39 @@ class ElasticityDataPrep:
         self,
         bjs_path: Union[str, Path],
         sams_path: Union[str, Path],
-        costco_path: Optional[Union[str, Path]] = None
+        costco_path: Optional[Union[str, Path]] = None,
+        additional_paths: Optional[Dict[str, Union[str, Path]]] = None
     ) -> pd.DataFrame:
-        """Main transformation pipeline"""
+        """
+        Main transformation pipeline.
+
+        `additional_paths` maps further retailer labels to their CSV files; each
+        is loaded with the matching entry in retailer_data_contracts.
+        """
 
         self.logger.info("=" * 80)
         self.logger.info("STARTING DATA TRANSFORMATION")
         self.logger.info("=" * 80)
 
+        sources = self._sources(bjs_path, sams_path, costco_path, additional_paths)
+
+        # Whole-pipeline cache: unchanged raw files + PrepConfig -> reuse the prepared data
+        cache_path = fingerprint = None
+        if self.config.cache_dir:
+            fingerprint = self._prepared_fingerprint(sources)
+            cache_path = self._cache_path('prepared', 'all', fingerprint)
+            cached = self._cache_read(cache_path)
+            if cached is not None and cached.attrs.pop('prep_fingerprint', None) == json.dumps(fingerprint, sort_keys=True, default=str):
+                # No intermediate frames: clear any left over from an earlier transform
+                self.raw_data = self.cleaned_data = None
+                self.final_data = cached
+                self.logger.info(f"\n✓ Prepared data loaded from cache: {cache_path.name} "
+                                 f"({len(cached)} rows x {len(cached.columns)} columns)")
+                return self.final_data
+
         # Load
         self.logger.info("\nStep 1: Loading data...")
-        self.raw_data = self._load_data(bjs_path, sams_path, costco_path)
+        self.raw_data = self._load_sources(sources)
         self.logger.info(f"  Loaded {len(self.raw_data)} rows")
 
         # Clean
@@ -184,16 +320,74 @@ class ElasticityDataPrep:
         self._validate_output(self.final_data)
         self.logger.info("  ✓ Validation passed")
 
+        if cache_path is not None:
+            stamped = self.final_data.copy(deep=False)
+            stamped.attrs['prep_fingerprint'] = json.dumps(fingerprint, sort_keys=True, default=str)
+            self._cache_write(stamped, cache_path)
+            self._evict_cache()
+
         self.logger.info("\n" + "=" * 80)
         self.logger.info("✓ TRANSFORMATION COMPLETE")
         self.logger.info("=" * 80)
 
         return self.final_data
 
+    def _prepared_fingerprint(self, sources) -> Dict:
+        """Everything the prepared data depends on: raw file hashes + the PrepConfig"""
+        config = {k: v for k, v in asdict(self.config).items() if k not in _OPERATIONAL_FIELDS}
+        return {
+            'files': [[label, self._digest(path)] for path, label in sources],
+            'config': config,
+        }
+
     # ========================================================================
     # DATA LOADING (config-driven per retailer)
     # ========================================================================
 
+    def _contract_columns(self, contract: Optional[Dict]) -> Dict[str, str]:
+        """
+        Columns the pipeline reads for a retailer, mapped to their dtype: the
+        contract's product/date/volume columns and price_calc operands plus the
+        legacy Circana / CRX columns used during cleaning.
+        """
+        contract = contract or {}
+        text_cols = [contract.get('product_column') or 'Product', contract.get('date_column') or 'Time']
+        numeric_cols = list(_NUMERIC_COLUMNS)
+        if contract.get('volume_column'):
+            numeric_cols.append(contract['volume_column'])
+        price_calc = contract.get('price_calc') or {}
+        for key in ('avg_price', 'base_price', 'base_price_fallback'):
+            rule = price_calc.get(key)
+            if rule:
+                numeric_cols.extend(part.strip() for part in str(rule).split('/'))
+
+        dtypes = {col: 'float64' for col in numeric_cols}
+        dtypes.update({col: 'str' for col in text_cols + _TEXT_COLUMNS})
+        return dtypes
+
+    def _read_retailer_csv(self, path: Union[str, Path], skiprows: int, contract: Optional[Dict]) -> pd.DataFrame:
+        """Read a retailer CSV, pruned to the contract's columns when configured."""
+        engine = self.config.csv_engine
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Unknown csv_engine: {engine}. Options: {list(CSV_ENGINES)}")
+        if engine == 'pyarrow' and importlib.util.find_spec('pyarrow') is None:
+            raise ImportError("csv_engine='pyarrow' requires pyarrow (pip install pyarrow)")
+
+        if not self.config.prune_columns:
+            return pd.read_csv(path, skiprows=skiprows, engine=engine)
+
+        # Intersect with the header so optional columns (e.g. CRX v2) may be absent
+        header = pd.read_csv(path, skiprows=skiprows, nrows=0).columns
+        wanted = self._contract_columns(contract)
+        usecols = [col for col in header if col in wanted]
+        return pd.read_csv(
+            path,
+            skiprows=skiprows,
+            usecols=usecols,
+            dtype={col: wanted[col] for col in usecols},
+            engine=engine,
+        )
+
     def _load_single_retailer(self, path: Union[str, Path], retailer_label: str) -> pd.DataFrame:
         """
         Load a single retailer CSV using its data contract (if configured).
@@ -204,8 +398,21 @@ class ElasticityDataPrep:
         # Determine skiprows from contract or default to 2 (Circana legacy)
         skiprows = contract.get('skiprows', 2) if contract else 2
 
+        cache_path = None
+        if self.config.cache_dir:
+            cache_path = self._cache_path('raw', retailer_label, {
+                'file_sha256': self._digest(path),
+                'retailer': retailer_label,
+                'contract': contract,
+                'prune_columns': self.config.prune_columns,
+            })
+            cached = self._cache_read(cache_path)
+            if cached is not None:
+                self.logger.info(f"  Loading {retailer_label}... (cache hit: {cache_path.name})")
+                return cached
+
         self.logger.info(f"  Loading {retailer_label}... (skiprows={skiprows})")
-        df = pd.read_csv(path, skiprows=skiprows)
+        df = self._read_retailer_csv(path, skiprows, contract)
         df['Retailer'] = retailer_label
 
         # If the contract specifies a product_column that differs from 'Product',
@@ -222,8 +429,80 @@ class ElasticityDataPrep:
         if self._norm_retailer(retailer_label) == 'costco':
             self._validate_costco_data_integrity(df, retailer_label)
 
+        if cache_path is not None:
+            self._cache_write(df, cache_path)
         return df
 
+    # ========================================================================
+    # ON-DISK CACHE
+    # ========================================================================
+
+    def _digest(self, path: Union[str, Path]) -> str:
+        """Content hash of a raw file, memoized per (path, size, mtime)"""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._digests:
+            self._digests[key] = _file_digest(path)
+        return self._digests[key]
+
+    @staticmethod
+    def _cache_suffix() -> str:
+        return '.parquet' if importlib.util.find_spec('pyarrow') is not None else '.pkl'
+
+    def _cache_path(self, kind: str, label: str, key: Dict) -> Path:
+        """Cache file for `key` (any JSON-serializable description of the inputs)"""
+        payload = json.dumps({'version': CACHE_VERSION, **key}, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+        slug = re.sub(r'[^a-z0-9]+', '_', self._norm_retailer(label)).strip('_') or 'all'
+        return Path(self.config.cache_dir) / f"{kind}_{slug}_{digest}{self._cache_suffix()}"
+
+    def _cache_read(self, path: Path) -> Optional[pd.DataFrame]:
+        if not path.exists():
+            return None
+        try:
+            df = pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_pickle(path)
+        except Exception as e:
+            self.logger.warning(f"    ⚠️ Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        return df
+
+    def _cache_write(self, df: pd.DataFrame, path: Path):
+        """Best-effort: a failed write only costs the next run a re-parse."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f'.{os.getpid()}.tmp')
+        try:
+            if path.suffix == '.parquet':
+                df.to_parquet(tmp_path)  # keeps the index (RangeIndex as metadata only)
+            else:
+                df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            self.logger.warning(f"    ⚠️ Could not write cache entry {path.name}: {e}")
+
+    def _evict_cache(self):
+        """Drop entries unused for cache_max_age_days, then the least recently used beyond cache_max_mb."""
+        cache_dir = Path(self.config.cache_dir)
+        if not cache_dir.is_dir():
+            return
+        entries = sorted(
+            (f for f in cache_dir.iterdir() if f.is_file() and f.suffix in ('.parquet', '.pkl')),
+            key=lambda f: f.stat().st_mtime,
+            reverse=True,
+        )
+        cutoff = time.time() - float(self.config.cache_max_age_days) * 86400
+        budget = float(self.config.cache_max_mb) * 1e6
+        used, evicted = 0.0, 0
+        for f in entries:
+            stat = f.stat()
+            used += stat.st_size
+            if stat.st_mtime < cutoff or used > budget:
+                f.unlink(missing_ok=True)
+                evicted += 1
+        if evicted:
+            self.logger.info(f"  Cache: evicted {evicted} stale entr{'y' if evicted == 1 else 'ies'} from {cache_dir}")
+
     # ========================================================================
     # COSTCO DATA INTEGRITY VALIDATION (v2 columns)
     # ========================================================================
@@ -359,21 +638,28 @@ class ElasticityDataPrep:
 
         self.logger.info(f"    {retailer_label}: {checks_passed}/{checks_total} integrity checks passed")
 
-    def _load_data(self, bjs_path, sams_path, costco_path=None) -> pd.DataFrame:
-        """Load CSV files for all retailers"""
-
-        dfs = []
-
-        # BJ's
-        dfs.append(self._load_single_retailer(bjs_path, "BJ's"))
+    @staticmethod
+    def _sources(bjs_path, sams_path, costco_path=None, additional_paths=None) -> List[tuple]:
+        """(path, retailer label) for every retailer file, in load order"""
+        sources = [(bjs_path, "BJ's"), (sams_path, "Sam's Club")]
+        if costco_path:
+            sources.append((costco_path, "Costco"))
+        for retailer_label, path in (additional_paths or {}).items():
+            sources.append((path, retailer_label))
+        return sources
 
-        # Sam's
-        dfs.append(self._load_single_retailer(sams_path, "Sam's Club"))
+    def _load_data(self, bjs_path, sams_path, costco_path=None, additional_paths=None) -> pd.DataFrame:
+        """Load CSV files for all retailers"""
+        return self._load_sources(self._sources(bjs_path, sams_path, costco_path, additional_paths))
 
-        # Costco
-        if costco_path:
-            dfs.append(self._load_single_retailer(costco_path, "Costco"))
+    def _load_sources(self, sources: List[tuple]) -> pd.DataFrame:
+        """Load (path, retailer label) sources concurrently; row order follows `sources`"""
+        workers = max(1, min(int(self.config.load_workers), len(sources)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            dfs = list(pool.map(lambda source: self._load_single_retailer(*source), sources))
 
+        if self.config.cache_dir:
+            self._evict_cache()
         return pd.concat(dfs, ignore_index=True)
 
     # ========================================================================
@@ -384,25 +670,38 @@ class ElasticityDataPrep:
         """
         Parse date column using retailer-specific rules from the data contract.
         Falls back to legacy Circana format if no contract is found.
+
+        Time strings repeat once per product row, so only distinct strings are
+        parsed (and only those not already in the per-rule memo, which persists
+        across calls); results are mapped back to rows by factor codes.
         """
         contract = self._get_contract(retailer)
 
         if contract and 'date_regex' in contract:
             # Regex extraction (e.g., Costco: "1 week ending 01-08-2023")
-            pattern = contract['date_regex']
-            date_fmt = contract.get('date_format', '%m-%d-%Y')
-            extracted = time_series.str.extract(pattern, expand=False)
-            return pd.to_datetime(extracted, format=date_fmt)
+            rule = ('regex', contract['date_regex'], contract.get('date_format', '%m-%d-%Y'))
         elif contract and 'date_prefix' in contract:
             # Prefix stripping (e.g., BJ's/Sam's: "Week Ending 01-08-23")
-            prefix = contract['date_prefix']
-            date_fmt = contract.get('date_format', '%m-%d-%y')
-            stripped = time_series.str.replace(prefix, '', regex=False)
-            return pd.to_datetime(stripped, format=date_fmt)
+            rule = ('prefix', contract['date_prefix'], contract.get('date_format', '%m-%d-%y'))
         else:
             # Legacy default: Circana format
-            stripped = time_series.str.replace('Week Ending ', '', regex=False)
-            return pd.to_datetime(stripped, format='%m-%d-%y')
+            rule = ('prefix', 'Week Ending ', '%m-%d-%y')
+
+        codes, uniques = pd.factorize(time_series)
+        memo = self._date_memo.get(rule)
+        new = pd.Series(uniques) if memo is None else pd.Series(uniques[~pd.Index(uniques).isin(memo.index)])
+        if len(new) or memo is None:
+            kind, pattern, date_fmt = rule
+            if kind == 'regex':
+                text = new.str.extract(pattern, expand=False)
+            else:
+                text = new.str.replace(pattern, '', regex=False)
+            parsed = pd.Series(pd.to_datetime(text, format=date_fmt).array, index=new.array)
+            memo = parsed if memo is None else pd.concat([memo, parsed])
+            self._date_memo[rule] = memo
+
+        values = memo.reindex(uniques).array.take(codes, allow_fill=True)
+        return pd.Series(values, index=time_series.index)
 
     def _compute_avg_price_for_retailer(self, df: pd.DataFrame, retailer: str) -> pd.Series:
         """
@@ -504,39 +803,6 @@ class ElasticityDataPrep:
                     retailer_brand_filters[r_key] = bf.lower()
                 retailer_competitor_filters[r_key] = cf.lower() if cf else None
 
-        def _match_retailer_key(retailer_label: str) -> Optional[str]:
-            """Find the contract key that matches a retailer label."""
-            norm = self._norm_retailer(retailer_label)
-            for key in (self.config.retailer_data_contracts or {}):
-                if self._norm_retailer(key) == norm:
-                    return key
-            return None
-
-        # Assign Product_Short using retailer-aware fuzzy matching
-        def _assign_product_short(row) -> Optional[str]:
-            product = str(row.get('Product', '')).lower()
-            retailer = str(row.get('Retailer', ''))
-            contract_key = _match_retailer_key(retailer)
-
-            # Try retailer-specific brand filter first
-            if contract_key and contract_key in retailer_brand_filters:
-                brand_sub = retailer_brand_filters[contract_key]
-                if brand_sub in product:
-                    return 'Sparkling Ice'
-
-                comp_sub = retailer_competitor_filters.get(contract_key)
-                if comp_sub and comp_sub in product:
-                    return 'Private Label'
-
-                return None
-
-            # Fallback: global fuzzy matching (original logic)
-            if 'sparkling ice' in product:
-                return 'Sparkling Ice'
-            if 'private label' in product:
-                return 'Private Label'
-            return None
-
         # Product filtering strategy:
         # - If retailer_data_contracts are provided, prefer retailer-aware fuzzy matching.
         #   This avoids dropping retailers whose product labels differ from the legacy
@@ -545,7 +811,8 @@ class ElasticityDataPrep:
 
         if self.config.retailer_data_contracts:
             df2 = self._apply_retailer_filter(df_all.copy())
-            df2['Product_Short'] = df2.apply(_assign_product_short, axis=1)
+            df2['Product_Short'] = self._classify_products(
+                df2, retailer_brand_filters, retailer_competitor_filters)
             df2 = df2[df2['Product_Short'].isin(['Sparkling Ice', 'Private Label'])]
             df = df2
         else:
@@ -573,7 +840,8 @@ class ElasticityDataPrep:
                         "attempting fuzzy Product matching (retailer-aware)."
                     )
                     df2 = self._apply_retailer_filter(df_all.copy())
-                    df2['Product_Short'] = df2.apply(_assign_product_short, axis=1)
+                    df2['Product_Short'] = self._classify_products(
+                        df2, retailer_brand_filters, retailer_competitor_filters)
                     df2 = df2[df2['Product_Short'].isin(['Sparkling Ice', 'Private Label'])]
                     df = df2
 
@@ -609,10 +877,7 @@ class ElasticityDataPrep:
             df['Date'] = pd.concat(date_parts)
         else:
             # Single retailer fallback
-            df['Date'] = pd.to_datetime(
-                df['Time'].str.replace('Week Ending ', '', regex=False),
-                format='%m-%d-%y'
-            )
+            df['Date'] = self._parse_date_for_retailer(df['Time'], '')
 
         # ----------------------------------------------------------------
         # Price calculations: per-retailer avg price
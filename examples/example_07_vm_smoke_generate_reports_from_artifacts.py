@@ -7,9 +7,8 @@ When you SSH into the Azure VM, you often want a *fast* verification that the la
 reporting changes work, without spending time on sampling.
 
 This script:
-- Loads an existing `trace.nc` (ArviZ InferenceData) from a prior run
-- Loads the corresponding `prepared_data.csv`
-- Reconstructs a Results object (HierarchicalResults or BayesianResults)
+- Loads an existing `trace.nc` (opened lazily) and `prepared_data.csv` from a prior run
+  via `BayesianResults.from_artifacts` (HierarchicalResults for hierarchical traces)
 - Generates the two contract-driven HTML reports:
     - statistical_validation_report.html
     - business_decision_brief.html
@@ -27,9 +26,6 @@ import argparse
 import sys
 from pathlib import Path
 
-import arviz as az
-import pandas as pd
-
 # Allow running this file directly: `python examples/...`
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
@@ -39,29 +35,6 @@ from bayesian_models import BayesianResults, HierarchicalResults
 from visualizations import generate_business_report, generate_statistical_report
 
 
-def _canonicalize_group_name(name: str) -> str:
-    s = str(name)
-    if s == "BJs":
-        return "BJ's"
-    if s == "Sams":
-        return "Sam's Club"
-    return s
-
-
-def _infer_group_order_from_prepared_data(df: pd.DataFrame) -> list[str]:
-    """
-    Match the group-indexing used during model build:
-      group_idx = pd.Categorical(data['Retailer']).codes
-
-    Pandas Categorical categories are sorted, so we mirror that here to ensure
-    posterior group indices map to the correct retailer labels.
-    """
-    if "Retailer" not in df.columns:
-        return []
-    cats = list(pd.Categorical(df["Retailer"].astype(str)).categories)
-    return [_canonicalize_group_name(x) for x in cats]
-
-
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Generate reports from existing trace.nc + prepared_data.csv (no MCMC)")
     p.add_argument(
@@ -91,35 +64,12 @@ def main() -> None:
     print(f"Trace: {trace_path.name}")
     print(f"Data:  {data_path.name}")
 
-    df = pd.read_csv(data_path)
-    idata = az.from_netcdf(trace_path)
-
-    # Determine if the trace looks hierarchical by presence of group-shaped variables
-    posterior_vars = set(list(idata.posterior.data_vars))
-    is_hier = "base_elasticity" in posterior_vars and any(k.endswith("_dim_0") for k in idata.posterior.dims.keys())
-
-    if is_hier:
-        groups = _infer_group_order_from_prepared_data(df)
-        if not groups:
-            raise ValueError("Could not infer retailer groups from prepared_data.csv (missing Retailer column).")
-
-        results = HierarchicalResults(
-            trace=idata,
-            model=None,
-            data=df,
-            config={"loaded_from": str(trace_path)},
-            priors={},
-            groups=groups,
-        )
-        print(f"Detected hierarchical trace. Groups: {groups}")
+    results = BayesianResults.from_artifacts(results_dir)
+    df = results.data
+
+    if isinstance(results, HierarchicalResults):
+        print(f"Detected hierarchical trace. Groups: {list(results.groups)}")
     else:
-        results = BayesianResults(
-            trace=idata,
-            model=None,
-            data=df,
-            config={"loaded_from": str(trace_path)},
-            priors={},
-        )
         print("Detected simple trace (non-hierarchical).")
 
     # Generate contract-driven reports into the same results directory
@@ -0,0 +1,138 @@
+"""
+Example 08: Benchmark NUTS Sampler Backends (ESS per second)
+
+Purpose
+-------
+Compare the NUTS implementations available through `sampler_backend` on the SAME
+prepared dataset, so we can pick the fastest one for long VM runs:
+
+- pymc    : default PyMC/PyTensor NUTS
+- nutpie  : Numba-compiled NUTS (optional install: pip install nutpie)
+- numpyro : JAX NUTS on CPU (optional install: pip install numpyro)
+
+For each backend the script fits the model and reports:
+- wall-clock time of `fit()` (includes compilation, which is part of the real cost)
+- minimum bulk/tail ESS across parameters
+- ESS per second (minimum bulk ESS / wall-clock seconds)
+- divergences and max R-hat
+
+Backends that are not installed are reported as skipped.
+
+Run (example):
+-------------
+python examples/example_08_benchmark_sampler_backends.py --data ./results_v4_tune3000/prepared_data.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import arviz as az
+import numpy as np
+import pandas as pd
+
+# Allow running this file directly: `python examples/...`
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from bayesian_models import SAMPLER_BACKENDS, HierarchicalBayesianModel, SimpleBayesianModel
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark NUTS backends (ESS/sec) on a prepared_data.csv")
+    p.add_argument(
+        "--data",
+        default=str(REPO_ROOT / "results_v4_tune3000" / "prepared_data.csv"),
+        help="Path to prepared_data.csv from a previous run",
+    )
+    p.add_argument("--model", choices=["simple", "hierarchical"], default="hierarchical")
+    p.add_argument("--backends", nargs="+", default=list(SAMPLER_BACKENDS), choices=list(SAMPLER_BACKENDS))
+    p.add_argument("--samples", type=int, default=1000)
+    p.add_argument("--tune", type=int, default=1000)
+    p.add_argument("--chains", type=int, default=4)
+    p.add_argument("--target-accept", type=float, default=0.95)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--output", default=None, help="Optional CSV path for the benchmark table")
+    return p.parse_args()
+
+
+def _benchmark_backend(df: pd.DataFrame, backend: str, args: argparse.Namespace) -> dict:
+    model_cls = HierarchicalBayesianModel if args.model == "hierarchical" else SimpleBayesianModel
+    model = model_cls(
+        priors="default",
+        n_samples=args.samples,
+        n_tune=args.tune,
+        n_chains=args.chains,
+        target_accept=args.target_accept,
+        random_seed=args.seed,
+        verbose=False,
+        sampler_backend=backend,
+    )
+
+    start = time.perf_counter()
+    results = model.fit(df)
+    elapsed = time.perf_counter() - start
+
+    ess_bulk = float(np.nanmin(az.ess(results.trace, method="bulk").to_array().values))
+    ess_tail = float(np.nanmin(az.ess(results.trace, method="tail").to_array().values))
+
+    return {
+        "backend": backend,
+        "status": "ok",
+        "seconds": elapsed,
+        "ess_bulk_min": ess_bulk,
+        "ess_tail_min": ess_tail,
+        "ess_bulk_per_sec": ess_bulk / elapsed if elapsed > 0 else np.nan,
+        "rhat_max": results.rhat_max,
+        "divergences": results.n_divergences,
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    data_path = Path(args.data).resolve()
+    if not data_path.exists():
+        raise FileNotFoundError(f"Missing prepared data: {data_path}")
+
+    df = pd.read_csv(data_path)
+    if args.model == "hierarchical" and "Retailer" not in df.columns:
+        raise ValueError("Hierarchical benchmark requires a 'Retailer' column in prepared_data.csv")
+
+    print("=" * 80)
+    print("EXAMPLE 08: SAMPLER BACKEND BENCHMARK (ESS / SEC)")
+    print("=" * 80)
+    print(f"Data:     {data_path} ({len(df)} rows)")
+    print(f"Model:    {args.model}")
+    print(f"Settings: {args.chains} chains × {args.samples} draws (tune={args.tune})")
+
+    rows = []
+    for backend in args.backends:
+        print(f"\n→ {backend} ...")
+        try:
+            row = _benchmark_backend(df, backend, args)
+            print(f"  {row['seconds']:.1f}s | min ESS bulk {row['ess_bulk_min']:.0f} | "
+                  f"{row['ess_bulk_per_sec']:.1f} ESS/s | divergences {row['divergences']}")
+        except ImportError as e:
+            row = {"backend": backend, "status": f"skipped ({e})"}
+            print(f"  skipped: {e}")
+        rows.append(row)
+
+    table = pd.DataFrame(rows)
+    print("\n" + "=" * 80)
+    print("RESULTS")
+    print("=" * 80)
+    print(table.to_string(index=False))
+
+    if args.output:
+        out_path = Path(args.output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        table.to_csv(out_path, index=False)
+        print(f"\n✓ Benchmark table saved to: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
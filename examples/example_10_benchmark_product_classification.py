@@ -0,0 +1,147 @@
+"""
+Example 10: Benchmark Product Classification in Data Prep
+
+Purpose
+-------
+`ElasticityDataPrep._clean_data` labels every row as 'Sparkling Ice',
+'Private Label' or neither (Product_Short). It used to do this with a row-wise
+`DataFrame.apply`, resolving the retailer's contract key and lower-casing the
+product string once per row. It now resolves contract keys once per distinct
+retailer and matches brand/competitor substrings on each retailer's distinct
+Product values (`_classify_products`).
+
+This script builds a synthetic item-level extract (Costco CRX style: many
+items x many weeks, plus Circana-style BJ's / Sam's rows and a retailer with
+no contract), times the old row-wise classifier against the vectorized one and
+reports the speedup. That both give identical labels is checked in
+tests/test_data_prep.py.
+
+Run (example):
+-------------
+python examples/example_10_benchmark_product_classification.py --rows 20000 50000 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import yaml
+
+# Allow running this file directly: `python examples/...`
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from data_prep import ElasticityDataPrep, PrepConfig
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark row-wise vs vectorized product classification")
+    p.add_argument("--rows", nargs="+", type=int, default=[20000, 50000, 200000], help="Synthetic row counts")
+    p.add_argument("--items", type=int, default=400, help="Distinct Costco items")
+    p.add_argument("--repeats", type=int, default=3, help="Timing repeats (best of)")
+    p.add_argument("--seed", type=int, default=42)
+    return p.parse_args()
+
+
+def _synthetic_extract(n_rows: int, n_items: int, rng: np.random.Generator) -> pd.DataFrame:
+    costco_items = (
+        ["SPARKLING ICE CORE 24PK"]
+        + [f"SPARKLING ICE {flavor} 17OZ UPC {i:05d}" for i, flavor in
+           enumerate(rng.choice(["BLACK RASPBERRY", "ORANGE MANGO", "KIWI STRAWBERRY", "LEMON LIME"], n_items // 2))]
+        + [f"OTHER SELTZER ITEM {i:05d}" for i in range(n_items - 1 - n_items // 2)]
+    )
+    circana_products = [
+        "Total Sparkling Ice Core Brand",
+        "PRIVATE LABEL-BOTTLED WATER-SELTZER/SPARKLING/MINERAL WATER",
+        "LaCroix Sparkling Water",
+        None,
+    ]
+    retailers = rng.choice(["Costco", "BJ's", "Sam's Club", "Walmart"], n_rows, p=[0.7, 0.1, 0.1, 0.1])
+    products = np.where(
+        retailers == "Costco",
+        rng.choice(np.array(costco_items, dtype=object), n_rows),
+        rng.choice(np.array(circana_products, dtype=object), n_rows),
+    )
+    return pd.DataFrame({"Retailer": retailers, "Product": products})
+
+
+def _filters(prep: ElasticityDataPrep):
+    brand, competitor = {}, {}
+    for key, contract in (prep.config.retailer_data_contracts or {}).items():
+        if contract.get("brand_filter"):
+            brand[key] = contract["brand_filter"].lower()
+        competitor[key] = contract["competitor_filter"].lower() if contract.get("competitor_filter") else None
+    return brand, competitor
+
+
+def _rowwise(prep: ElasticityDataPrep, df: pd.DataFrame, brand: dict, competitor: dict) -> pd.Series:
+    """The previous per-row classifier, kept here as the timing baseline."""
+    def _assign_product_short(row) -> Optional[str]:
+        product = str(row.get("Product", "")).lower()
+        contract_key = prep._match_retailer_key(str(row.get("Retailer", "")))
+        if contract_key and contract_key in brand:
+            if brand[contract_key] in product:
+                return "Sparkling Ice"
+            comp_sub = competitor.get(contract_key)
+            if comp_sub and comp_sub in product:
+                return "Private Label"
+            return None
+        if "sparkling ice" in product:
+            return "Sparkling Ice"
+        if "private label" in product:
+            return "Private Label"
+        return None
+
+    return df.apply(_assign_product_short, axis=1)
+
+
+def _best_of(fn, repeats: int):
+    best, out = np.inf, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main() -> None:
+    args = parse_args()
+    with open(REPO_ROOT / "config_template.yaml", "r") as f:
+        contracts = ((yaml.safe_load(f) or {}).get("data") or {}).get("retailer_data_contracts")
+
+    prep = ElasticityDataPrep(PrepConfig(retailer_data_contracts=contracts, verbose=False))
+    brand, competitor = _filters(prep)
+    rng = np.random.default_rng(args.seed)
+
+    print("=" * 80)
+    print("EXAMPLE 10: PRODUCT CLASSIFICATION BENCHMARK")
+    print("=" * 80)
+    print(f"Contracts: {list(contracts or {})} | Costco items: {args.items} | best of {args.repeats}")
+
+    rows = []
+    for n_rows in args.rows:
+        df = _synthetic_extract(n_rows, args.items, rng)
+        t_old, _ = _best_of(lambda: _rowwise(prep, df, brand, competitor), args.repeats)
+        t_new, new = _best_of(lambda: prep._classify_products(df, brand, competitor), args.repeats)
+        rows.append({
+            "rows": n_rows,
+            "rowwise_s": t_old,
+            "vectorized_s": t_new,
+            "speedup": t_old / t_new if t_new > 0 else np.nan,
+            "sparkling_ice_rows": int((new == "Sparkling Ice").sum()),
+        })
+        print(f"  {n_rows:>8} rows | row-wise {t_old:.3f}s | vectorized {t_new:.4f}s | "
+              f"{rows[-1]['speedup']:.0f}x")
+
+    print("\n" + pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
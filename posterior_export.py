@@ -0,0 +1,287 @@
+"""
+Posterior Export Module
+
+Writes posterior draws and scenario grids as Parquet or Arrow IPC datasets, so
+BI / downstream consumers can memory-map and query draws without ArviZ,
+xarray or netCDF.
+
+Features:
+- Long format: one row per (variable, group, element, chain, draw)
+- Hive-partitioned by variable and retailer (variable=.../group=...), so a
+  reader touches only the files for the parameters it filters on
+- Group-specific (hierarchical) draws land in their retailer's partition
+  (labelled from results.groups for traces saved without retailer coords);
+  pooled / global parameters use group='all'
+- Optional wide draw matrix (one row per chain/draw, one column per parameter)
+- Scenario grid (base price + promo revenue impacts) alongside the draws
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    from posterior_export import export_posterior
+
+    export_posterior(results, './results/posterior', file_format='parquet')
+
+    # Consumer side (no ArviZ needed):
+    import pyarrow.dataset as ds
+    draws = ds.dataset('./results/posterior/draws', format='parquet', partitioning='hive')
+    base = draws.to_table(filter=(ds.field('variable') == 'base_elasticity')).to_pandas()
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import itertools
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from bayesian_models import GROUP_DIM
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+EXPORT_FORMATS = ('parquet', 'arrow')
+EXPORT_LAYOUTS = ('long', 'wide', 'both')
+
+# Partition value for parameters shared by all retailers
+ALL_GROUPS = 'all'
+
+_EXTENSIONS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+
+def _require_pyarrow():
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError("Posterior export requires pyarrow (pip install pyarrow)")
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+    return pa, pads
+
+
+# ============================================================================
+# FRAMES
+# ============================================================================
+
+def _posterior_vars(results, var_names: Optional[List[str]]) -> List[str]:
+    posterior = results.trace.posterior
+    if var_names is None:
+        return list(posterior.data_vars)
+    missing = [name for name in var_names if name not in posterior]
+    if missing:
+        raise ValueError(f"Variables not in the posterior: {missing}")
+    return list(var_names)
+
+
+def _group_axis(results, da) -> Optional[str]:
+    """
+    The retailer axis of a variable: GROUP_DIM, or for traces saved without named
+    group coords the default `<var>_dim_0` axis of a group-sized variable
+    (the same size rule HierarchicalResults uses to look up groups).
+    """
+    if GROUP_DIM in da.dims:
+        return GROUP_DIM
+    groups = getattr(results, 'groups', None)
+    rest = [dim for dim in da.dims if dim not in ('chain', 'draw')]
+    if groups and len(rest) == 1 and rest[0] == f'{da.name}_dim_0' and da.sizes[rest[0]] == len(groups):
+        return rest[0]
+    return None
+
+
+def _element_labels(da, group_axis: Optional[str] = None) -> List[str]:
+    """Labels for the non-(chain, draw, group) positions of a variable ('' for scalars)"""
+    dims = [dim for dim in da.dims if dim not in ('chain', 'draw', group_axis)]
+    if not dims:
+        return ['']
+    axes = [
+        [str(v) for v in da.coords[dim].values] if dim in da.coords else [str(i) for i in range(da.sizes[dim])]
+        for dim in dims
+    ]
+    return [','.join(parts) for parts in itertools.product(*axes)]
+
+
+def posterior_frame(results, var_names: Optional[List[str]] = None, float32: bool = True) -> pd.DataFrame:
+    """
+    Posterior draws in long (tidy) format.
+
+    Parameters:
+    ----------
+    results : BayesianResults or HierarchicalResults
+    var_names : list of str, optional
+        Posterior variables to include (default: all)
+    float32 : bool
+        Store draws as float32 (halves the size; ample for BI use)
+
+    Returns:
+    -------
+    pd.DataFrame
+        Columns: variable, group (retailer or 'all'), element ('' for scalars),
+        chain, draw, value. variable/group/element are categoricals.
+    """
+    posterior = results.trace.posterior
+    dtype = np.float32 if float32 else np.float64
+    frames = []
+    for name in _posterior_vars(results, var_names):
+        da = posterior[name]
+        axis = _group_axis(results, da)
+        rest = [dim for dim in da.dims if dim not in ('chain', 'draw', axis)]
+        da = da.transpose(*((axis,) if axis else ()), 'chain', 'draw', *rest)
+
+        if axis == GROUP_DIM:
+            groups = [str(g) for g in da.coords[GROUP_DIM].values]
+        elif axis is not None:
+            groups = [str(g) for g in results.groups]
+        else:
+            groups = [ALL_GROUPS]
+        elements = _element_labels(da, axis)
+        n_chain, n_draw = da.sizes['chain'], da.sizes['draw']
+        values = np.asarray(da.values, dtype=dtype).reshape(len(groups), n_chain * n_draw, len(elements))
+        # (group, chain*draw, element) -> rows ordered by group, element, chain, draw
+        values = values.transpose(0, 2, 1).ravel()
+
+        per_element = n_chain * n_draw
+        per_group = per_element * len(elements)
+        frames.append(pd.DataFrame({
+            'variable': name,
+            'group': np.repeat(groups, per_group),
+            'element': np.tile(np.repeat(elements, per_element), len(groups)),
+            'chain': np.tile(np.repeat(np.arange(n_chain, dtype=np.int16), n_draw), len(groups) * len(elements)),
+            'draw': np.tile(np.arange(n_draw, dtype=np.int32), len(groups) * len(elements) * n_chain),
+            'value': values,
+        }))
+
+    frame = pd.concat(frames, ignore_index=True)
+    for column in ('variable', 'group', 'element'):
+        frame[column] = frame[column].astype('category')
+    return frame
+
+
+def wide_posterior_frame(results, var_names: Optional[List[str]] = None, float32: bool = True) -> pd.DataFrame:
+    """
+    Posterior draws as a draw matrix: one row per (chain, draw), one column per
+    parameter position, named 'var', 'var[group]' or 'var[group,element]'.
+    """
+    long = posterior_frame(results, var_names=var_names, float32=float32)
+    labels = long['variable'].astype(str)
+    suffix = long['group'].astype(str).where(long['group'] != ALL_GROUPS, '')
+    element = long['element'].astype(str)
+    suffix = np.where((suffix != '') & (element != ''), suffix + ',' + element, suffix + element)
+    long['column'] = np.where(suffix != '', labels + '[' + suffix + ']', labels)
+
+    order = list(dict.fromkeys(long['column']))
+    wide = long.pivot(index=['chain', 'draw'], columns='column', values='value')
+    return wide[order].reset_index().rename_axis(columns=None)
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def _write_table(frame: pd.DataFrame, path: Path, file_format: str, partition_cols=None):
+    pa, pads = _require_pyarrow()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if partition_cols:
+        # A previous export's partitions (variables / groups this run no longer has)
+        # would otherwise stay in the dataset; start from an empty directory
+        if path.exists():
+            shutil.rmtree(path)
+        pads.write_dataset(
+            table, str(path), format='ipc' if file_format == 'arrow' else 'parquet',
+            partitioning=list(partition_cols), partitioning_flavor='hive',
+        )
+    elif file_format == 'arrow':
+        import pyarrow.feather as feather
+        feather.write_feather(table, str(path), compression='uncompressed')  # memory-mappable as-is
+    else:
+        import pyarrow.parquet as pq
+        pq.write_table(table, str(path), compression='zstd')
+
+
+def _dir_size_mb(path: Path) -> float:
+    if path.is_file():
+        return path.stat().st_size / 1e6
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file()) / 1e6
+
+
+def export_posterior(
+    results,
+    output_dir: str,
+    file_format: str = 'parquet',
+    layout: str = 'long',
+    var_names: Optional[List[str]] = None,
+    float32: bool = True,
+    include_scenarios: bool = True,
+    scenario_kwargs: Optional[Dict] = None,
+) -> Dict:
+    """
+    Export posterior draws (and the scenario grid) for BI consumers.
+
+    Writes under `output_dir`:
+    - draws/variable=<name>/group=<retailer|all>/...  (layout 'long' or 'both')
+    - draws_wide.<ext>                                  (layout 'wide' or 'both')
+    - scenarios.<ext>                                   (include_scenarios)
+
+    Parameters:
+    ----------
+    results : BayesianResults or HierarchicalResults
+    output_dir : str
+        Directory for the export (created if needed)
+    file_format : str
+        'parquet' (zstd-compressed) or 'arrow' (uncompressed IPC, memory-mappable)
+    layout : str
+        'long' (partitioned by variable and retailer), 'wide' or 'both'
+    var_names : list of str, optional
+        Posterior variables to export (default: all)
+    float32 : bool
+        Store draws as float32
+    include_scenarios : bool
+        Also write results.scenario_grid(**scenario_kwargs)
+
+    Returns:
+    -------
+    Dict
+        Written paths by artifact, row counts, size_mb and write_seconds
+    """
+    file_format = str(file_format).lower()
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown file_format: {file_format}. Options: {list(EXPORT_FORMATS)}")
+    if layout not in EXPORT_LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}. Options: {list(EXPORT_LAYOUTS)}")
+    _require_pyarrow()
+
+    started = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ext = _EXTENSIONS[file_format]
+    paths, rows = {}, {}
+
+    if layout in ('long', 'both'):
+        long = posterior_frame(results, var_names=var_names, float32=float32)
+        paths['draws'] = output_dir / 'draws'
+        _write_table(long, paths['draws'], file_format, partition_cols=('variable', 'group'))
+        rows['draws'] = len(long)
+
+    if layout in ('wide', 'both'):
+        wide = wide_posterior_frame(results, var_names=var_names, float32=float32)
+        paths['draws_wide'] = output_dir / f'draws_wide.{ext}'
+        _write_table(wide, paths['draws_wide'], file_format)
+        rows['draws_wide'] = len(wide)
+
+    if include_scenarios:
+        grid = results.scenario_grid(**(scenario_kwargs or {}))
+        paths['scenarios'] = output_dir / f'scenarios.{ext}'
+        _write_table(grid, paths['scenarios'], file_format)
+        rows['scenarios'] = len(grid)
+
+    return {
+        'paths': {key: os.fspath(path) for key, path in paths.items()},
+        'rows': rows,
+        'size_mb': sum(_dir_size_mb(path) for path in paths.values()),
+        'write_seconds': time.perf_counter() - started,
+    }
@@ -4,8 +4,12 @@ Report generation package (contract-driven).
 Exports two public entry points used by `visualizations.py` / `run_analysis.py`:
 - generate_statistical_report
 - generate_business_report
+
+`build_report_payload` builds the data both reports embed, so a caller producing
+both can build it once and pass it as `payload=`.
 """
 
 from reporting.statistical_report import generate_statistical_report
 from reporting.business_report import generate_business_report
+from reporting.report_data import build_report_payload
 
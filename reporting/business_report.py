@@ -7,7 +7,7 @@ import re
 import numpy as np
 import pandas as pd
 
-from reporting.report_data import build_report_payload
+from reporting.report_data import build_report_payload, with_plots
 from reporting.utils import (
     embed_image_as_img_tag,
     fmt1,
@@ -528,11 +528,14 @@ def generate_business_report(
     output_dir: str,
     *,
     template_path: Optional[str] = None,
+    payload: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Generate Business Decision Brief (contract §3).
 
     Writes: {output_dir}/business_decision_brief.html
+    `payload` (from `build_report_payload`) lets the caller build the report data once
+    for both reports; it is built here when omitted.
     """
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
@@ -548,7 +551,9 @@ def generate_business_report(
         if p.exists():
             plot_img_tags[name.replace(".png", "")] = embed_image_as_img_tag(p, alt=name)
 
-    payload = build_report_payload(results, data, include_plots=bool(plot_img_tags), plot_img_tags=plot_img_tags)
+    if payload is None:
+        payload = build_report_payload(results, data, include_plots=False)
+    payload = with_plots(payload, plot_img_tags)
 
     tpl = read_text(template_file)
 
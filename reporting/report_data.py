@@ -8,6 +8,8 @@ import numpy as np
 import pandas as pd
 import arviz as az
 
+from bayesian_models import scenario_impacts
+
 
 RetailerName = str
 
@@ -37,19 +39,25 @@ def _safe_unique_retailers(data: pd.DataFrame) -> List[RetailerName]:
     return ordered
 
 
-def _get_group_index(results: Any, retailer: str) -> Optional[int]:
+_GROUP_NAME_MAP = {"BJs": "BJ's", "Sams": "Sam's Club"}
+
+
+def _group_index_map(results: Any) -> Dict[str, int]:
+    """Display retailer name -> position on the results' group axis, built once per report."""
     groups = getattr(results, "groups", None)
     if groups is None:
-        return None
-    # groups can be list/Index-like
-    groups_list = [str(g) for g in list(groups)]
-    # normalize common variants
-    norm_map = {"BJs": "BJ's", "Sams": "Sam's Club"}
-    groups_list_norm = [norm_map.get(g, g) for g in groups_list]
-    try:
-        return groups_list_norm.index(retailer)
-    except ValueError:
-        return None
+        return {}
+    return {_GROUP_NAME_MAP.get(str(g), str(g)): i for i, g in enumerate(groups)}
+
+
+def _get_group_index(results: Any, retailer: str) -> Optional[int]:
+    # Results objects keep a precomputed label index; fall back for duck-typed results.
+    lookup = getattr(results, "group_position", None)
+    if lookup is not None:
+        idx = lookup(retailer)
+        if idx is not None:
+            return idx
+    return _group_index_map(results).get(retailer)
 
 
 def _flatten_samples(x: np.ndarray) -> np.ndarray:
@@ -98,11 +106,13 @@ def _get_scalar_samples(results: Any, var: str) -> Optional[np.ndarray]:
     return _flatten_samples(x)
 
 
-def _get_group_samples(results: Any, var: str, retailer: str) -> Optional[np.ndarray]:
+def _get_group_samples(
+    results: Any, var: str, retailer: str, group_index: Optional[Mapping[str, int]] = None
+) -> Optional[np.ndarray]:
     posterior = _get_posterior(results)
     if var not in posterior:
         return None
-    idx = _get_group_index(results, retailer)
+    idx = group_index.get(retailer) if group_index is not None else _get_group_index(results, retailer)
     if idx is None:
         return None
     # Expect dims: (chain, draw, group)
@@ -112,6 +122,25 @@ def _get_group_samples(results: Any, var: str, retailer: str) -> Optional[np.nda
     return _flatten_samples(arr[:, :, idx])
 
 
+def _scenario_records(
+    samples: Mapping[str, Optional[np.ndarray]],
+    names: List[str],
+    scenarios: List[float],
+    *,
+    discount: bool = False,
+) -> List[Dict[str, Any]]:
+    """Scenario rows (Retailer-major) for every name with samples, via `scenario_impacts`."""
+    available = {nm: samples[nm] for nm in names if samples.get(nm) is not None and len(samples[nm])}
+    if not available:
+        return []
+    pct = [-abs(float(d)) for d in scenarios] if discount else [float(p) for p in scenarios]
+    table = scenario_impacts(available, pct, exponential=discount).rename(columns={"group": "Retailer"})
+    if discount:
+        table.insert(1, "discount_depth_pct", np.tile([float(d) for d in scenarios], len(available)))
+        table = table.drop(columns="price_change_pct")
+    return table.to_dict("records")
+
+
 def compute_evidence_table(
     data: pd.DataFrame,
     base_elasticity_by_retailer_mean: Mapping[str, float],
@@ -249,8 +278,12 @@ def build_report_payload(
     summaries: Dict[str, Dict[str, Any]] = {"base": {}, "promo": {}, "cross": {}}
 
     # Overall samples: hierarchical uses mu_global_* when present; otherwise scalar base_elasticity
-    base_overall = _get_scalar_samples(results, "mu_global_base") or _get_scalar_samples(results, "base_elasticity")
-    promo_overall = _get_scalar_samples(results, "mu_global_promo") or _get_scalar_samples(results, "promo_elasticity")
+    base_overall = _get_scalar_samples(results, "mu_global_base")
+    if base_overall is None:
+        base_overall = _get_scalar_samples(results, "base_elasticity")
+    promo_overall = _get_scalar_samples(results, "mu_global_promo")
+    if promo_overall is None:
+        promo_overall = _get_scalar_samples(results, "promo_elasticity")
     cross_overall = _get_scalar_samples(results, "elasticity_cross")
 
     if base_overall is not None:
@@ -276,9 +309,10 @@ def build_report_payload(
     promo_by_retailer_mean: Dict[str, float] = {}
     base_by_retailer_samples: Dict[str, np.ndarray] = {}
     promo_by_retailer_samples: Dict[str, np.ndarray] = {}
+    group_index = {r: _get_group_index(results, r) for r in retailers}
     for r in retailers:
-        base_s = _get_group_samples(results, "base_elasticity", r)
-        promo_s = _get_group_samples(results, "promo_elasticity", r)
+        base_s = _get_group_samples(results, "base_elasticity", r, group_index)
+        promo_s = _get_group_samples(results, "promo_elasticity", r, group_index)
 
         if base_s is not None:
             summaries["base"][r] = _summary_from_samples(base_s)
@@ -339,12 +373,21 @@ def build_report_payload(
         "rhat_max": getattr(results, "rhat_max", None),
         "ess_min": getattr(results, "ess_min", None),
         "n_divergences": getattr(results, "n_divergences", None),
+        "inference_method": getattr(results, "inference_method", "nuts"),
     }
-    az_sum = az.summary(results.trace, round_to=None)
+    # Per-parameter diagnostics are computed once on the results object and shared by
+    # both reports; fall back to ArviZ for results objects without the cached table.
+    if hasattr(results, "diagnostics"):
+        az_sum = results.diagnostics()
+    else:
+        # Approximate posteriors (ADVI / Pathfinder) carry no chain diagnostics
+        az_kind = "all" if diag["rhat_max"] is not None else "stats"
+        az_sum = az.summary(results.trace, kind=az_kind, round_to=None)
     # Normalize column names across arviz versions
     rhat_col = "r_hat" if "r_hat" in az_sum.columns else ("rhat" if "rhat" in az_sum.columns else None)
     essb_col = "ess_bulk" if "ess_bulk" in az_sum.columns else None
     esst_col = "ess_tail" if "ess_tail" in az_sum.columns else None
+    mcse_col = "mcse_mean" if "mcse_mean" in az_sum.columns else None
 
     diag_rows = []
     for param, row in az_sum.iterrows():
@@ -354,6 +397,7 @@ def build_report_payload(
                 "rhat": float(row[rhat_col]) if rhat_col and pd.notna(row.get(rhat_col)) else None,
                 "ess_bulk": float(row[essb_col]) if essb_col and pd.notna(row.get(essb_col)) else None,
                 "ess_tail": float(row[esst_col]) if esst_col and pd.notna(row.get(esst_col)) else None,
+                "mcse_mean": float(row[mcse_col]) if mcse_col and pd.notna(row.get(mcse_col)) else None,
             }
         )
 
@@ -380,51 +424,18 @@ def build_report_payload(
     base_scenarios = [-5, -3, -1, 1, 3, 5]
     promo_scenarios = [5, 10, 15, 20]
 
-    base_impacts = []
-    for nm in ["Overall"] + retailers:
-        s = base_by_retailer_samples.get(nm) if nm != "Overall" else (_flatten_samples(base_overall) if base_overall is not None else None)
-        if s is None or len(s) == 0:
-            continue
-        for pct in base_scenarios:
-            vol = s * float(pct)
-            rev = ((1 + vol / 100.0) * (1 + float(pct) / 100.0) - 1) * 100.0
-            base_impacts.append(
-                {
-                    "Retailer": nm,
-                    "price_change_pct": float(pct),
-                    "volume_impact_mean": float(np.mean(vol)),
-                    "volume_impact_ci_lower": float(np.percentile(vol, 2.5)),
-                    "volume_impact_ci_upper": float(np.percentile(vol, 97.5)),
-                    "revenue_impact_mean": float(np.mean(rev)),
-                    "revenue_impact_ci_lower": float(np.percentile(rev, 2.5)),
-                    "revenue_impact_ci_upper": float(np.percentile(rev, 97.5)),
-                    "probability_positive": float(np.mean(rev > 0)),
-                }
-            )
+    # One broadcast over draws x scenarios x (Overall + retailers); the report keeps the
+    # exact log-sales volume response for promotions.
+    scenario_names = ["Overall"] + retailers
+    base_samples = {"Overall": _flatten_samples(base_overall) if base_overall is not None else None}
+    base_samples.update(base_by_retailer_samples)
+    base_impacts = _scenario_records(base_samples, scenario_names, base_scenarios)
 
     promo_impacts = []
     if promo_overall is not None:
-        for nm in ["Overall"] + retailers:
-            s = promo_by_retailer_samples.get(nm) if nm != "Overall" else _flatten_samples(promo_overall)
-            if s is None or len(s) == 0:
-                continue
-            for disc in promo_scenarios:
-                depth = -abs(float(disc)) / 100.0
-                vol = (np.exp(s * depth) - 1.0) * 100.0
-                rev = ((1 + vol / 100.0) * (1 - abs(float(disc)) / 100.0) - 1) * 100.0
-                promo_impacts.append(
-                    {
-                        "Retailer": nm,
-                        "discount_depth_pct": float(disc),
-                        "volume_impact_mean": float(np.mean(vol)),
-                        "volume_impact_ci_lower": float(np.percentile(vol, 2.5)),
-                        "volume_impact_ci_upper": float(np.percentile(vol, 97.5)),
-                        "revenue_impact_mean": float(np.mean(rev)),
-                        "revenue_impact_ci_lower": float(np.percentile(rev, 2.5)),
-                        "revenue_impact_ci_upper": float(np.percentile(rev, 97.5)),
-                        "probability_positive": float(np.mean(rev > 0)),
-                    }
-                )
+        promo_samples = {"Overall": _flatten_samples(promo_overall)}
+        promo_samples.update(promo_by_retailer_samples)
+        promo_impacts = _scenario_records(promo_samples, scenario_names, promo_scenarios, discount=True)
 
     payload: Dict[str, Any] = {
         "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -451,8 +462,15 @@ def build_report_payload(
         },
     }
 
-    if include_plots and plot_img_tags:
-        payload["plots"] = dict(plot_img_tags)
+    return with_plots(payload, plot_img_tags if include_plots else None)
 
-    return payload
+
+def with_plots(payload: Mapping[str, Any], plot_img_tags: Optional[Mapping[str, str]]) -> Dict[str, Any]:
+    """
+    A report's own copy of a (possibly shared) payload with its embedded plots.
+    """
+    out = {k: v for k, v in payload.items() if k != "plots"}
+    if plot_img_tags:
+        out["plots"] = dict(plot_img_tags)
+    return out
 
@@ -6,7 +6,7 @@ from typing import Any, Dict, Optional
 import pandas as pd
 import re
 
-from reporting.report_data import build_report_payload
+from reporting.report_data import build_report_payload, with_plots
 from reporting.utils import (
     embed_image_as_img_tag,
     json_for_script_tag,
@@ -22,11 +22,14 @@ def generate_statistical_report(
     output_dir: str,
     *,
     template_path: Optional[str] = None,
+    payload: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Generate Statistical Validation Report (contract §2).
 
     Writes: {output_dir}/statistical_validation_report.html
+    `payload` (from `build_report_payload`) lets the caller build the report data once
+    for both reports; it is built here when omitted.
     """
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
@@ -74,7 +77,9 @@ def generate_statistical_report(
         # Plotting should never fail report generation; template placeholders will remain.
         plot_img_tags = {}
 
-    payload = build_report_payload(results, data, include_plots=bool(plot_img_tags), plot_img_tags=plot_img_tags)
+    if payload is None:
+        payload = build_report_payload(results, data, include_plots=False)
+    payload = with_plots(payload, plot_img_tags)
 
     # Read base template and inject data + small JS hooks.
     tpl = read_text(template_file)
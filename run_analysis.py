@@ -26,7 +26,7 @@ from datetime import datetime
 
 # Import our modules
 from data_prep import ElasticityDataPrep, PrepConfig
-from bayesian_models import SimpleBayesianModel, HierarchicalBayesianModel
+from bayesian_models import SimpleBayesianModel, HierarchicalBayesianModel, SamplerConfig, export_trace
 from visualizations import generate_statistical_report, generate_business_report
 
 
@@ -151,6 +151,8 @@ def append_run_log(config: dict, results, output_dir: Path, repo_root: Path = No
     chains = model.get("n_chains", "?")
     target = model.get("target_accept", "?")
     seed = model.get("random_seed", "?")
+    backend = model.get("sampler_backend", "pymc")
+    inference = model.get("inference", "nuts")
 
     converged = getattr(results, "converged", None)
     rhat = getattr(results, "rhat_max", None)
@@ -167,7 +169,7 @@ def append_run_log(config: dict, results, output_dir: Path, repo_root: Path = No
 
     line = (
         f"{timestamp} | tune={tune} samples={samples} chains={chains} "
-        f"target_accept={target} seed={seed} | "
+        f"target_accept={target} seed={seed} backend={backend} inference={inference} | "
         f"output={output_dir} | {conv_str}\n"
     )
 
@@ -235,6 +237,41 @@ Examples:
                        help='Number of MCMC chains (default: 4)')
     parser.add_argument('--tune', type=int, default=1000,
                        help='Number of tuning steps (default: 1000)')
+    parser.add_argument('--sampler-backend', type=str, default='pymc',
+                       choices=['pymc', 'nutpie', 'numpyro'],
+                       help='NUTS implementation (default: pymc). nutpie/numpyro must be installed separately '
+                            'and cannot be combined with --adaptive or --checkpoint/--resume.')
+    parser.add_argument('--inference', type=str, default='nuts',
+                       choices=['nuts', 'gibbs', 'advi', 'fullrank_advi', 'pathfinder'],
+                       help='Inference method (default: nuts). gibbs = exact conjugate sampler, simple model only; '
+                            'advi/fullrank_advi/pathfinder = fast approximate preview (no R-hat/ESS).')
+    parser.add_argument('--parameterization', type=str, default='centered',
+                       choices=['centered', 'non_centered', 'auto'],
+                       help='Hierarchical group effects parameterization (default: centered)')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Sample in blocks of --samples draws until R-hat/ESS/divergence thresholds are met')
+    parser.add_argument('--max-draws', type=int, default=20000,
+                       help='Adaptive mode: ceiling on draws per chain (default: 20000)')
+    parser.add_argument('--max-minutes', type=float, default=None,
+                       help='Adaptive mode: wall-clock ceiling in minutes (default: none)')
+    parser.add_argument('--warm-start', type=str, default=None,
+                       help="Previous run's trace.nc to start NUTS from (positions, step size, mass matrix); "
+                            "pair with a much smaller --tune for weekly refreshes (PyMC backend only)")
+    parser.add_argument('--update-from', type=str, default=None,
+                       help="Previous run's trace.nc to update sequentially: its posterior becomes the prior "
+                            "and only rows dated after that run are fitted")
+    parser.add_argument('--checkpoint', action='store_true',
+                       help='Write draws to <output>/checkpoints in blocks as they are produced. Tuning '
+                            'runs inside the first block and is not checkpointed; later blocks run PyMC NUTS '
+                            'with a kernel estimated from the first block')
+    parser.add_argument('--checkpoint-every', type=int, default=500,
+                       help='Draws per chain between checkpoints (default: 500)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted run from <output>/checkpoints (implies --checkpoint; '
+                            'also applies on top of --config). A run interrupted before its first block '
+                            'finished (tuning included) starts over')
+    parser.add_argument('--approx-draws', type=int, default=4000,
+                       help='Posterior draws for advi/fullrank_advi/pathfinder (default: 4000)')
     
     # Data options
     parser.add_argument('--retailer-filter', type=str, default='All',
@@ -324,6 +361,12 @@ def run_pipeline(config: dict, logger):
         brand_filters=(config['data'].get('brand_filters') or PrepConfig().brand_filters),
         enable_brand_fuzzy_match=bool(config['data'].get('enable_brand_fuzzy_match', True)),
         retailers=config['data'].get('retailers'),
+        prune_columns=bool(config['data'].get('prune_columns', True)),
+        csv_engine=config['data'].get('csv_engine', 'c'),
+        load_workers=int(config['data'].get('load_workers', 4)),
+        cache_dir=config['data'].get('cache_dir'),
+        cache_max_age_days=float(config['data'].get('cache_max_age_days', 30)),
+        cache_max_mb=float(config['data'].get('cache_max_mb', 2000)),
         verbose=_get_verbose_flag(config, default=True)
     )
     
@@ -334,7 +377,8 @@ def run_pipeline(config: dict, logger):
     data = prep.transform(
         bjs_path=config['data']['bjs_path'],
         sams_path=config['data']['sams_path'],
-        costco_path=config['data'].get('costco_path')
+        costco_path=config['data'].get('costco_path'),
+        additional_paths=config['data'].get('additional_paths')
     )
     
     logger.info(f"\n✓ Data preparation complete")
@@ -358,36 +402,49 @@ def run_pipeline(config: dict, logger):
     logger.info(f"\nModel type: {model_type}")
     logger.info(f"Prior specification: {config['model']['priors']}")
     logger.info(f"MCMC settings: {config['model']['n_samples']} samples × {config['model']['n_chains']} chains")
-    
-    # Create model
+    logger.info(f"Sampler backend: {config['model'].get('sampler_backend', 'pymc')}")
+    logger.info(f"Inference: {config['model'].get('inference', 'nuts')}")
+    
+    # Checkpointing: draws are written to output_dir/checkpoints as they are produced,
+    # so an interrupted VM run can be continued with --resume
+    resume = bool(config['model'].get('resume', False))
+    checkpoint_dir = None
+    if config['model'].get('checkpoint', False) or resume:
+        checkpoint_dir = str(output_dir / 'checkpoints')
+        logger.info(f"Checkpoints: {checkpoint_dir}" + (" (resuming)" if resume else ""))
+    
+    # Create model (sampling options: every SamplerConfig field in the `model` section)
+    sampler = SamplerConfig.from_dict({**config['model'], 'checkpoint_dir': checkpoint_dir, 'resume': resume})
+    verbose = config.get('logging', {}).get('verbose', True)
     if model_type == 'hierarchical':
         model = HierarchicalBayesianModel(
             priors=config['model']['priors'],
-            n_samples=config['model']['n_samples'],
-            n_tune=config['model']['n_tune'],
-            n_chains=config['model']['n_chains'],
-            target_accept=config['model']['target_accept'],
-            random_seed=config['model']['random_seed'],
-            verbose=config.get('logging', {}).get('verbose', True)
+            verbose=verbose,
+            sampler=sampler,
+            parameterization=config['model'].get('parameterization', 'centered'),
         )
     else:
-        model = SimpleBayesianModel(
-            priors=config['model']['priors'],
-            n_samples=config['model']['n_samples'],
-            n_tune=config['model']['n_tune'],
-            n_chains=config['model']['n_chains'],
-            target_accept=config['model']['target_accept'],
-            random_seed=config['model']['random_seed'],
-            verbose=config.get('logging', {}).get('verbose', True)
-        )
+        model = SimpleBayesianModel(priors=config['model']['priors'], verbose=verbose, sampler=sampler)
     
     # Fit model
-    results = model.fit(data)
+    warm_start = config['model'].get('warm_start')
+    update_from = config['model'].get('update_from')
+    if update_from:
+        # Sequential update: previous posterior becomes the prior, only new weeks are fitted
+        logger.info(f"Sequential update from: {update_from}")
+        results = model.update(data, previous=update_from)
+    else:
+        if warm_start:
+            logger.info(f"Warm start from: {warm_start}")
+        results = model.fit(data, warm_start=warm_start or None)
     
     logger.info(f"\n✓ Model fitting complete")
-    logger.info(f"  Convergence: {'✓ Passed' if results.converged else '⚠️ Warnings'}")
-    logger.info(f"  Max R-hat: {results.rhat_max:.4f}")
-    logger.info(f"  Min ESS: {results.ess_min:.0f}")
+    if results.converged is None:
+        logger.info(f"  Convergence: n/a (approximate inference: {results.inference_method})")
+    else:
+        logger.info(f"  Convergence: {'✓ Passed' if results.converged else '⚠️ Warnings'}")
+        logger.info(f"  Max R-hat: {results.rhat_max:.4f}")
+        logger.info(f"  Min ESS: {results.ess_min:.0f}")
     
     # ========================================================================
     # STEP 3: SAVE RESULTS
@@ -406,10 +463,12 @@ def run_pipeline(config: dict, logger):
     
     # Save trace (optional)
     if config['output']['save_trace']:
-        import arviz as az
         trace_path = output_dir / 'trace.nc'
-        results.trace.to_netcdf(trace_path)
-        logger.info(f"✓ Trace saved to: {trace_path}")
+        export = export_trace(results.trace, trace_path, **(config['output'].get('trace_export') or {}))
+        logger.info(f"✓ Trace saved to: {trace_path} ({', '.join(export['groups'])}; "
+                    f"{export['size_mb']:.1f} MB, reload {export['load_seconds']:.2f}s)")
+        # Per-parameter diagnostics next to the trace, so from_artifacts() needn't recompute them
+        results.diagnostics().to_csv(output_dir / 'diagnostics.csv')
     
     # Create results table (V2 prefers base + promo elasticities)
     params = []
@@ -455,6 +514,15 @@ def run_pipeline(config: dict, logger):
     results_csv = output_dir / 'results_summary.csv'
     results_df.to_csv(results_csv, index=False)
     logger.info(f"✓ Results table saved to: {results_csv}")
+
+    # Posterior draws + scenario grid for BI consumers (optional, needs pyarrow)
+    posterior_export = dict(config['output'].get('posterior_export') or {})
+    if posterior_export.pop('enabled', False):
+        from posterior_export import export_posterior
+
+        export = export_posterior(results, output_dir / 'posterior', **posterior_export)
+        logger.info(f"✓ Posterior exported to: {output_dir / 'posterior'} "
+                    f"({', '.join(export['paths'])}; {export['size_mb']:.1f} MB)")
     
     # ========================================================================
     # STEP 4: GENERATE VISUALIZATIONS
@@ -486,11 +554,16 @@ def run_pipeline(config: dict, logger):
         logger.info("STEP 5: GENERATING HTML REPORTS")
         logger.info("="*80)
 
+        # Report data (summaries, probabilities, scenarios) is built once for both reports
+        from reporting import build_report_payload
+        payload = build_report_payload(results, data, include_plots=False)
+
         if generate_stat:
             stat_path = generate_statistical_report(
                 results=results,
                 data=data,
                 output_dir=str(output_dir),
+                payload=payload,
             )
             logger.info(f"\n✓ Statistical Validation Report generated: {stat_path}")
 
@@ -499,6 +572,7 @@ def run_pipeline(config: dict, logger):
                 results=results,
                 data=data,
                 output_dir=str(output_dir),
+                payload=payload,
             )
             logger.info(f"\n✓ Business Decision Brief generated: {biz_path}")
     
@@ -562,6 +636,8 @@ def main():
     if args.config:
         # Load from config file
         config = load_config(args.config)
+        if args.resume:
+            config['model']['resume'] = True
     else:
         # Create from command-line arguments
         if not args.bjs or not args.sams:
@@ -592,8 +668,20 @@ def main():
                 'n_tune': args.tune,
                 'n_chains': args.chains,
                 'target_accept': 0.95,
+                'sampler_backend': args.sampler_backend,
+                'inference': args.inference,
+                'approx_draws': args.approx_draws,
+                'parameterization': args.parameterization,
                 'max_rhat': 1.01,
                 'min_ess': 400,
+                'adaptive': args.adaptive,
+                'warm_start': args.warm_start,
+                'update_from': args.update_from,
+                'max_draws': args.max_draws,
+                'max_minutes': args.max_minutes,
+                'checkpoint': args.checkpoint or args.resume,
+                'checkpoint_every': args.checkpoint_every,
+                'resume': args.resume,
                 'random_seed': args.seed
             },
             'output': {
@@ -0,0 +1,74 @@
+"""
+Shared fixtures for the test suite.
+
+Tests build small synthetic datasets in the prepared_data.csv schema so they do
+not depend on the (untracked) client extracts, and keep sampling short.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _at_least_one_core():
+    # pymc guesses cores as cpu_count() // 2, which is 0 on single-CPU runners
+    import pymc.sampling.mcmc as mcmc
+    original = mcmc._cpu_count
+    mcmc._cpu_count = lambda: max(1, original())
+    yield
+    mcmc._cpu_count = original
+
+
+def make_prepared_data(
+    n_weeks: int = 60,
+    retailers=("BJ's", "Costco", "Sam's Club"),
+    base_elasticity: float = -2.0,
+    promo_elasticity: float = -3.0,
+    promo_rate: float = 0.3,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Model-ready rows (one per retailer-week) with known elasticities"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-08', periods=n_weeks, freq='W-SUN')
+    rows = []
+    for r, retailer in enumerate(retailers):
+        log_base = np.log(18.0) + rng.normal(0, 0.1, n_weeks)
+        promo_depth = np.where(rng.random(n_weeks) < promo_rate, -rng.uniform(0.05, 0.25, n_weeks), 0.0)
+        log_pl = np.log(10.0) + rng.normal(0, 0.05, n_weeks)
+        month = dates.month
+        y = (
+            10.0 + 0.3 * r
+            + base_elasticity * (log_base - log_base.mean())
+            + promo_elasticity * promo_depth
+            + 0.5 * (log_pl - log_pl.mean())
+            + rng.normal(0, 0.05, n_weeks)
+        )
+        rows.append(pd.DataFrame({
+            'Date': dates,
+            'Retailer': retailer,
+            'Log_Volume_Sales_SI': y,
+            'Log_Base_Price_SI': log_base,
+            'Log_Price_SI': log_base + np.log1p(promo_depth),
+            'Promo_Depth_SI': promo_depth,
+            'Log_Price_PL': log_pl,
+            'Spring': month.isin([3, 4, 5]).astype(int),
+            'Summer': month.isin([6, 7, 8]).astype(int),
+            'Fall': month.isin([9, 10, 11]).astype(int),
+            'Week_Number': np.arange(n_weeks),
+            'has_promo': 1,
+            'has_competitor': 1,
+        }))
+    return pd.concat(rows, ignore_index=True)
+
+
+@pytest.fixture
+def prepared_data() -> pd.DataFrame:
+    return make_prepared_data()
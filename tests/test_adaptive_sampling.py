@@ -0,0 +1,37 @@
+"""Adaptive block sampling: every stopping rule and the backend restriction"""
+
+import pytest
+
+import bayesian_models as bm
+from bayesian_models import SamplerConfig
+
+from conftest import make_prepared_data
+
+ADAPTIVE = dict(verbose=False, adaptive=True, n_samples=40, n_tune=100, n_chains=2, random_seed=5)
+NEVER_CONVERGED = dict(max_rhat=0.0, max_divergences=10**6)
+
+
+@pytest.fixture(scope='module')
+def data():
+    return make_prepared_data()
+
+
+@pytest.mark.parametrize('thresholds, reason, blocks', [
+    (dict(max_rhat=10.0, min_ess=0, max_divergences=10**6), 'converged', 1),
+    (dict(max_rhat=10.0, min_ess=0, max_divergences=-1), 'divergences', 1),
+    (dict(NEVER_CONVERGED, max_draws=100), 'max_draws', 2),
+    (dict(NEVER_CONVERGED, max_minutes=0.0), 'max_time', 1),
+])
+def test_stopping_rules(data, thresholds, reason, blocks):
+    trace = bm.SimpleBayesianModel(**ADAPTIVE, **thresholds).fit(data).trace
+    assert trace.posterior.attrs['sampling_stop_reason'] == reason
+    assert trace.posterior.attrs['sampling_blocks'] == blocks
+    assert trace.posterior.sizes['draw'] == blocks * ADAPTIVE['n_samples']
+
+
+@pytest.mark.parametrize('options', [{'adaptive': True}, {'checkpoint_dir': 'checkpoints'}])
+def test_block_sampling_requires_pymc_backend(options):
+    with pytest.raises(ValueError, match="sampler_backend='pymc'"):
+        SamplerConfig(sampler_backend='nutpie', **options)
+    # Block sampling is a NUTS option; other inference methods ignore it
+    SamplerConfig(sampler_backend='nutpie', inference='gibbs', **options)
@@ -0,0 +1,58 @@
+"""Checkpointed block sampling: an interrupted run resumes to the same draws"""
+
+import json
+
+import numpy as np
+import pytest
+
+import bayesian_models as bm
+from bayesian_models import CHECKPOINT_MANIFEST
+
+from conftest import make_prepared_data
+
+CHECKPOINTED = dict(verbose=False, n_samples=90, n_tune=100, n_chains=2, checkpoint_every=30, random_seed=3)
+
+
+class _Killed(Exception):
+    pass
+
+
+def test_resume_after_interruption_matches_uninterrupted_run(tmp_path, monkeypatch):
+    data = make_prepared_data()
+    full = bm.SimpleBayesianModel(checkpoint_dir=tmp_path / 'full', **CHECKPOINTED).fit(data)
+    assert full.trace.posterior.attrs['sampling_blocks'] == 3
+
+    manifest = json.loads((tmp_path / 'full' / CHECKPOINT_MANIFEST).read_text())
+    assert manifest['settings']['block_draws'] == 30
+    assert len(manifest['kernel']['mean']) == len(manifest['kernel']['var']) > 0
+    assert manifest['kernel']['step_scale'] > 0
+
+    # The VM dies right after the first block (tuning included) reached the disk
+    save = bm._save_checkpoint_block
+
+    def save_then_die(checkpoint_dir, index, block):
+        save(checkpoint_dir, index, block)
+        if index == 0:
+            raise _Killed
+
+    monkeypatch.setattr(bm, '_save_checkpoint_block', save_then_die)
+    with pytest.raises(_Killed):
+        bm.SimpleBayesianModel(checkpoint_dir=tmp_path / 'run', **CHECKPOINTED).fit(data)
+    monkeypatch.setattr(bm, '_save_checkpoint_block', save)
+    assert sorted(p.name for p in (tmp_path / 'run').glob('block_*')) == ['block_0000.nc']
+
+    # Resuming must not tune again
+    monkeypatch.setattr(bm, '_sample_nuts', lambda *a, **k: pytest.fail('first block re-sampled on resume'))
+    resumed = bm.SimpleBayesianModel(checkpoint_dir=tmp_path / 'run', resume=True, **CHECKPOINTED).fit(data)
+
+    assert resumed.trace.posterior.attrs['sampling_blocks'] == 3
+    for name in full.trace.posterior.data_vars:
+        np.testing.assert_array_equal(resumed.trace.posterior[name].values, full.trace.posterior[name].values)
+
+
+def test_resume_rejects_changed_settings(tmp_path):
+    data = make_prepared_data()
+    bm.SimpleBayesianModel(checkpoint_dir=tmp_path, **{**CHECKPOINTED, 'n_samples': 30}).fit(data)
+    with pytest.raises(ValueError, match='different settings.*target_accept'):
+        bm.SimpleBayesianModel(checkpoint_dir=tmp_path, resume=True, target_accept=0.9,
+                               **{**CHECKPOINTED, 'n_samples': 30}).fit(data)
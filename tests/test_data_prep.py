@@ -0,0 +1,224 @@
+"""Raw extract loading in ElasticityDataPrep: pruning, worker threads, caches and date parsing"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from data_prep import ElasticityDataPrep, PrepConfig
+
+from conftest import REPO_ROOT
+
+WEEKS = pd.date_range('2023-01-08', periods=30, freq='W-SUN')
+
+
+def _circana(path, rng):
+    products = ['Total Sparkling Ice Core Brand',
+                'PRIVATE LABEL-BOTTLED WATER-SELTZER/SPARKLING/MINERAL WATER',
+                'Other Brand 1', 'Other Brand 2']
+    rows = []
+    for week in WEEKS:
+        for product in products:
+            units, price = rng.uniform(5000, 20000), rng.uniform(4, 6)
+            rows.append({
+                'Geography': 'Total US', 'Product': product, 'Time': 'Week Ending ' + week.strftime('%m-%d-%y'),
+                'Dollar Sales': units * price, 'Unit Sales': units, 'Volume Sales': units * 2,
+                'Base Dollar Sales': units * 0.8 * price * 1.05, 'Base Unit Sales': units * 0.8,
+                'Unit Sales Any Merch': units * 0.1, 'ACV Weighted Distribution': rng.uniform(50, 99),
+                'Unused Metric': rng.normal(),
+            })
+    with open(path, 'w') as f:
+        f.write('Circana export\nGenerated\n')
+        pd.DataFrame(rows).to_csv(f, index=False)
+
+
+def _costco(path, rng):
+    items = ['Sparkling Ice Core Brand'] + [f'SPARKLING ICE FLAVOR UPC {i}' for i in range(5)]
+    rows = []
+    for week in WEEKS:
+        for item in items:
+            units, price = rng.uniform(1000, 90000), rng.uniform(4, 6)
+            non_promo = units * rng.uniform(0.001, 0.9)
+            rows.append({
+                'Item': item, 'Time': '1 week ending ' + week.strftime('%m-%d-%Y'),
+                'Dollar Sales': units * price, 'Unit Sales': units, 'Avg Net Price': price,
+                'Non Promoted Dollars': non_promo * price * 1.1, 'Non Promoted Units': non_promo,
+                'Average Price per Unit': price * 1.1, 'Gross Dollars': units * price, 'Refund Dollars': 0.0,
+                'Gross Units': units, 'Refund Units': 0.0, 'Unused Metric': rng.normal(),
+            })
+    with open(path, 'w') as f:
+        f.write('CRX export\n')
+        pd.DataFrame(rows).to_csv(f, index=False)
+
+
+@pytest.fixture
+def raw_paths(tmp_path):
+    rng = np.random.default_rng(0)
+    paths = tuple(tmp_path / name for name in ('bjs.csv', 'sams.csv', 'costco.csv'))
+    _circana(paths[0], rng)
+    _circana(paths[1], rng)
+    _costco(paths[2], rng)
+    return paths
+
+
+@pytest.fixture(scope='module')
+def contracts():
+    with open(REPO_ROOT / 'config_template.yaml') as f:
+        return yaml.safe_load(f)['data']['retailer_data_contracts']
+
+
+@pytest.fixture
+def make_prep(contracts):
+    def make(**kwargs):
+        kwargs.setdefault('volume_sales_factor_by_retailer', {'Costco': 2.0})
+        return ElasticityDataPrep(PrepConfig(retailer_data_contracts=contracts, verbose=False, **kwargs))
+    return make
+
+
+def test_pruned_concurrent_load_matches_full_read(make_prep, raw_paths):
+    full = make_prep(prune_columns=False, load_workers=1)
+    pruned = make_prep(prune_columns=True, load_workers=3)
+
+    raw = pruned._load_data(*raw_paths)
+    assert 'Unused Metric' not in raw.columns
+    assert list(raw['Retailer'].unique()) == ["BJ's", "Sam's Club", 'Costco']
+    prepared = full.transform(*raw_paths)
+    assert len(prepared) == 3 * len(WEEKS)
+    pd.testing.assert_frame_equal(prepared, pruned.transform(*raw_paths))
+
+
+def _fail_on_read(monkeypatch):
+    monkeypatch.setattr(ElasticityDataPrep, '_read_retailer_csv',
+                        lambda *a, **k: pytest.fail('raw CSV re-read despite a cache hit'))
+
+
+def test_raw_cache_hit(make_prep, raw_paths, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    first = make_prep(cache_dir=str(cache_dir))._load_data(*raw_paths)
+    assert len(list(cache_dir.glob('raw_*'))) == 3
+
+    _fail_on_read(monkeypatch)
+    pd.testing.assert_frame_equal(first, make_prep(cache_dir=str(cache_dir))._load_data(*raw_paths))
+
+
+def test_raw_cache_invalidated_by_file_content(make_prep, raw_paths, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    make_prep(cache_dir=str(cache_dir))._load_data(*raw_paths)
+
+    # Same size, new content: only BJ's is re-read
+    bjs = raw_paths[0]
+    text = bjs.read_text()
+    bjs.write_text(text.replace('Other Brand 2', 'Other Brand 9'))
+    reads = []
+    original = ElasticityDataPrep._read_retailer_csv
+    monkeypatch.setattr(ElasticityDataPrep, '_read_retailer_csv',
+                        lambda self, path, *a: reads.append(path) or original(self, path, *a))
+
+    raw = make_prep(cache_dir=str(cache_dir))._load_data(*raw_paths)
+    assert reads == [bjs]
+    assert 'Other Brand 9' in set(raw.loc[raw['Retailer'] == "BJ's", 'Product'])
+    assert len(list(cache_dir.glob('raw_*'))) == 4
+
+
+def test_prepared_cache_round_trip(make_prep, raw_paths, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    uncached = make_prep().transform(*raw_paths)
+    make_prep(cache_dir=cache_dir).transform(*raw_paths)
+
+    monkeypatch.setattr(ElasticityDataPrep, '_load_sources',
+                        lambda *a, **k: pytest.fail('pipeline re-run despite a prepared-data cache hit'))
+    cached = make_prep(cache_dir=cache_dir, load_workers=2).transform(*raw_paths)
+    pd.testing.assert_frame_equal(uncached, cached)
+    assert 'prep_fingerprint' not in cached.attrs
+
+
+def test_prepared_cache_hit_has_no_intermediate_frames(make_prep, raw_paths, tmp_path):
+    prep = make_prep(cache_dir=str(tmp_path / 'cache'))
+    first = prep.transform(*raw_paths)
+    assert prep.raw_data is not None and prep.cleaned_data is not None
+
+    # Same object, cache hit: the earlier run's intermediates are not kept around
+    second = prep.transform(*raw_paths)
+    assert prep.raw_data is None and prep.cleaned_data is None
+    assert prep.final_data is second
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_prepared_cache_keyed_on_config_and_files(make_prep, raw_paths, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    with_trend = make_prep(cache_dir=str(cache_dir)).transform(*raw_paths)
+    without_trend = make_prep(cache_dir=str(cache_dir), include_time_trend=False).transform(*raw_paths)
+    assert 'Week_Number' in with_trend and 'Week_Number' not in without_trend
+
+    costco = raw_paths[2]
+    costco.write_text(costco.read_text().replace('CRX export', 'CRX export v2'))
+    make_prep(cache_dir=str(cache_dir)).transform(*raw_paths)
+    assert len(list(cache_dir.glob('prepared_*'))) == 3
+
+
+@pytest.mark.parametrize('retailer, texts, reference', [
+    ("BJ's", ['Week Ending ' + w.strftime('%m-%d-%y') for w in WEEKS],
+     lambda s: pd.to_datetime(s.str.replace('Week Ending ', '', regex=False), format='%m-%d-%y')),
+    ('Costco', ['1 week ending ' + w.strftime('%m-%d-%Y') for w in WEEKS] + [None, 'no date'],
+     lambda s: pd.to_datetime(s.str.extract(r'ending (\d{2}-\d{2}-\d{4})', expand=False), format='%m-%d-%Y')),
+])
+def test_memo_date_parse_matches_direct_parse(make_prep, retailer, texts, reference):
+    rng = np.random.default_rng(1)
+    prep = make_prep()
+    first = pd.Series(rng.choice(np.array(texts[:20] + texts[-2:], dtype=object), 500), index=np.arange(500) * 3)
+    second = pd.Series(rng.choice(np.array(texts, dtype=object), 800))
+
+    pd.testing.assert_series_equal(prep._parse_date_for_retailer(first, retailer), reference(first))
+    # Second call mixes memoized and unseen strings
+    pd.testing.assert_series_equal(prep._parse_date_for_retailer(second, retailer), reference(second))
+    assert prep._parse_date_for_retailer(second.iloc[:0], retailer).empty
+
+
+def _rowwise_labels(prep, df, brand, competitor):
+    """The previous per-row classifier: the reference for _classify_products"""
+    def label(row):
+        product = str(row.get('Product', '')).lower()
+        contract_key = prep._match_retailer_key(str(row.get('Retailer', '')))
+        if contract_key and contract_key in brand:
+            if brand[contract_key] in product:
+                return 'Sparkling Ice'
+            comp_sub = competitor.get(contract_key)
+            if comp_sub and comp_sub in product:
+                return 'Private Label'
+            return None
+        if 'sparkling ice' in product:
+            return 'Sparkling Ice'
+        if 'private label' in product:
+            return 'Private Label'
+        return None
+
+    return df.apply(label, axis=1)
+
+
+def test_classify_products_matches_rowwise(make_prep, contracts):
+    assert not contracts['Costco'].get('competitor_filter')
+    prep = make_prep()
+    brand = {key: c['brand_filter'].lower() for key, c in contracts.items() if c.get('brand_filter')}
+    competitor = {key: c['competitor_filter'].lower() if c.get('competitor_filter') else None
+                  for key, c in contracts.items()}
+
+    products = np.array([
+        'Total Sparkling Ice Core Brand', 'PRIVATE LABEL-BOTTLED WATER-SELTZER/SPARKLING/MINERAL WATER',
+        'SPARKLING ICE CORE 24PK', 'SPARKLING ICE LEMON LIME 17OZ', 'Kirkland Private Label Seltzer',
+        'LaCroix Sparkling Water', 'nan', None, np.nan,
+    ], dtype=object)
+    # Walmart and a missing retailer have no contract and use the generic substrings
+    retailers = np.array(["BJ's", "Sam's Club", 'Costco', 'Walmart', None], dtype=object)
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({'Retailer': rng.choice(retailers, 3000), 'Product': rng.choice(products, 3000)},
+                      index=np.arange(3000) * 2)
+
+    labels = prep._classify_products(df, brand, competitor)
+    reference = _rowwise_labels(prep, df, brand, competitor)
+    pd.testing.assert_series_equal(labels, reference.astype(object).where(reference.notna(), None))
+
+    costco = df['Retailer'] == 'Costco'
+    assert set(labels[costco].dropna()) == {'Sparkling Ice'}
+    assert labels[(df['Retailer'] == 'Walmart') & (df['Product'] == 'Kirkland Private Label Seltzer')].eq(
+        'Private Label').all()
+    assert labels[df['Product'].isna()].isna().all()
@@ -0,0 +1,22 @@
+"""Diagnostics table of approximate (ADVI) results"""
+
+import arviz as az
+import pytest
+
+import bayesian_models as bm
+
+from conftest import make_prepared_data
+
+
+def test_approximate_labels_without_summary(monkeypatch):
+    results = bm.HierarchicalBayesianModel(
+        verbose=False, inference='advi', vi_iterations=1000, approx_draws=100, random_seed=1
+    ).fit(make_prepared_data())
+    expected = list(az.summary(results.trace, kind='stats', round_to=None).index)
+
+    monkeypatch.setattr(az, 'summary', lambda *a, **k: pytest.fail('az.summary called'))
+    table = results.diagnostics()
+    assert list(table.index) == expected
+    assert "base_elasticity[Sam's Club]" in table.index
+    assert table.isna().all().all()
+    assert table.attrs['n_divergences'] is None
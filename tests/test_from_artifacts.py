@@ -0,0 +1,78 @@
+"""Results restored from a run directory compute summaries and diagnostics lazily"""
+
+import arviz as az
+import numpy as np
+import pytest
+
+import bayesian_models as bm
+from bayesian_models import BayesianResults, HierarchicalResults
+
+from conftest import make_prepared_data
+
+FAST_GIBBS = dict(verbose=False, inference='gibbs', n_samples=300, n_tune=100, n_chains=2, random_seed=1)
+
+
+def _save_run(results, run_dir, diagnostics=True):
+    results.trace.to_netcdf(run_dir / 'trace.nc')
+    results.data.to_csv(run_dir / 'prepared_data.csv', index=False)
+    if diagnostics:
+        results.diagnostics().to_csv(run_dir / 'diagnostics.csv')
+
+
+@pytest.fixture
+def fitted(prepared_data):
+    return bm.SimpleBayesianModel(**FAST_GIBBS).fit(prepared_data)
+
+
+def test_construction_summarizes_nothing(fitted, tmp_path, monkeypatch):
+    _save_run(fitted, tmp_path)
+    monkeypatch.setattr(az, 'summary', lambda *a, **k: pytest.fail('az.summary called'))
+
+    restored = BayesianResults.from_artifacts(tmp_path)
+    assert restored._posterior_stats == {}
+
+    # One requested variable summarizes only that variable
+    assert restored.base_elasticity.mean == pytest.approx(fitted.base_elasticity.mean)
+    assert set(restored._posterior_stats) == {'base_elasticity'}
+
+    # Convergence comes from the saved diagnostics table
+    assert restored.rhat_max == pytest.approx(fitted.rhat_max)
+    assert restored.converged == fitted.converged
+    assert restored.n_divergences == fitted.n_divergences
+
+
+def test_diagnostics_recomputed_without_artifact(fitted, tmp_path):
+    _save_run(fitted, tmp_path, diagnostics=False)
+    restored = BayesianResults.from_artifacts(tmp_path)
+    assert restored._diagnostics is None
+
+    assert restored.ess_min == pytest.approx(fitted.ess_min)
+    np.testing.assert_allclose(restored.diagnostics()['r_hat'], fitted.diagnostics()['r_hat'])
+
+
+def test_hierarchical_group_summaries_on_access(prepared_data, tmp_path):
+    fitted = bm.HierarchicalBayesianModel(
+        verbose=False, inference='advi', vi_iterations=2000, approx_draws=200, random_seed=1
+    ).fit(prepared_data)
+    _save_run(fitted, tmp_path)
+
+    restored = BayesianResults.from_artifacts(tmp_path)
+    assert isinstance(restored, HierarchicalResults)
+    assert restored.converged is None
+    assert restored._posterior_stats == {}
+
+    groups = restored.group_base_elasticities
+    assert list(groups) == fitted.groups
+    assert set(restored._posterior_stats) == {'base_elasticity'}
+    for group, summary in groups.items():
+        assert summary.mean == pytest.approx(fitted.group_base_elasticities[group].mean)
+
+
+def test_prepared_data_required(fitted, tmp_path):
+    fitted.trace.to_netcdf(tmp_path / 'trace.nc')
+    with pytest.raises(FileNotFoundError, match='prepared_data.csv'):
+        BayesianResults.from_artifacts(tmp_path)
+
+    restored = BayesianResults.from_artifacts(tmp_path, data=fitted.data)
+    assert restored.data is fitted.data
+    assert restored.base_elasticity.mean == pytest.approx(fitted.base_elasticity.mean)
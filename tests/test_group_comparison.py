@@ -0,0 +1,44 @@
+"""Pairwise group comparisons of hierarchical results"""
+
+import numpy as np
+import pytest
+
+import bayesian_models as bm
+
+from conftest import make_prepared_data
+
+
+@pytest.fixture(scope='module')
+def hierarchical():
+    return bm.HierarchicalBayesianModel(
+        verbose=False, inference='advi', vi_iterations=2000, approx_draws=400, random_seed=1
+    ).fit(make_prepared_data())
+
+
+def test_pairwise_matrix_is_antisymmetric(hierarchical):
+    matrix = hierarchical.compare_all_groups()
+    groups = [str(g) for g in hierarchical.groups]
+    assert set(matrix.index.get_level_values('type')) == {'base', 'promo'}
+
+    for kind in ('base', 'promo'):
+        prob = matrix.loc[(kind, 'probability')].loc[groups, groups].values
+        diff = matrix.loc[(kind, 'difference_mean')].loc[groups, groups].values
+        lower = matrix.loc[(kind, 'ci_lower')].loc[groups, groups].values
+        upper = matrix.loc[(kind, 'ci_upper')].loc[groups, groups].values
+
+        assert np.isnan(np.diag(prob)).all() and np.isnan(np.diag(diff)).all()
+        off = ~np.eye(len(groups), dtype=bool)
+        np.testing.assert_allclose(prob[off], 1.0 - prob.T[off])
+        np.testing.assert_allclose(diff[off], -diff.T[off])
+        np.testing.assert_allclose(lower[off], -upper.T[off])
+
+    single = hierarchical.compare_groups('Costco', "BJ's", elasticity_type='promo')
+    assert single['probability'] == pytest.approx(matrix.loc[('promo', 'probability', 'Costco'), "BJ's"])
+    assert single['difference_mean'] == pytest.approx(matrix.loc[('promo', 'difference_mean', 'Costco'), "BJ's"])
+
+
+def test_unknown_elasticity_type_rejected(hierarchical):
+    with pytest.raises(ValueError, match=r"Unknown elasticity_type: cross\. Options: \['base', 'promo'\]"):
+        hierarchical.compare_all_groups(types=('base', 'cross'))
+    with pytest.raises(ValueError, match='Unknown elasticity_type'):
+        hierarchical.compare_groups('Costco', "BJ's", elasticity_type='own')
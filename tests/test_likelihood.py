@@ -0,0 +1,27 @@
+"""Sufficient-statistics likelihood: the same log-probability as the row-wise Normal"""
+
+import numpy as np
+import pytest
+
+import bayesian_models as bm
+
+from conftest import make_prepared_data
+
+BUILD_ONLY = dict(verbose=False, inference='advi', vi_iterations=10, approx_draws=5, random_seed=1)
+
+
+@pytest.mark.parametrize('model_class', [bm.SimpleBayesianModel, bm.HierarchicalBayesianModel])
+def test_sufficient_stats_logp_matches_full(model_class):
+    data = make_prepared_data()
+    full = model_class(likelihood='full', **BUILD_ONLY).fit(data).model
+    suff = model_class(likelihood='sufficient_stats', **BUILD_ONLY).fit(data).model
+    assert [rv.name for rv in full.observed_RVs] == ['y_obs'] and not suff.observed_RVs
+
+    full_logp, suff_logp = full.compile_logp(), suff.compile_logp()
+    reference = full.initial_point()
+    assert set(reference) == set(suff.initial_point())
+
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        point = {name: value + rng.normal(scale=0.3, size=np.shape(value)) for name, value in reference.items()}
+        assert suff_logp(point) == pytest.approx(full_logp(point), rel=1e-9, abs=1e-6)
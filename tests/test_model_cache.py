@@ -0,0 +1,60 @@
+"""Compiled-model cache: reuse across fits without sharing state between results"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import bayesian_models as bm
+
+from conftest import make_prepared_data
+
+FAST_NUTS = dict(verbose=False, n_samples=50, n_tune=50, n_chains=1, random_seed=1)
+FAST_VI = dict(verbose=False, inference='advi', vi_iterations=500, approx_draws=50, random_seed=1)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    bm.clear_model_cache()
+    yield
+    bm.clear_model_cache()
+
+
+def _rows(results):
+    return results.model['y'].get_value().shape[0]
+
+
+def test_refit_reuses_compiled_model():
+    data = make_prepared_data(n_weeks=80)
+    bm.SimpleBayesianModel(**FAST_NUTS).fit(data.iloc[:200])
+    (entry,) = bm._MODEL_CACHE.values()
+    compiled = entry['logp_dlogp']
+
+    bm.SimpleBayesianModel(**FAST_NUTS).fit(data.iloc[:120])
+    (entry,) = bm._MODEL_CACHE.values()
+    assert entry['hits'] == 1
+    assert entry['logp_dlogp'] is compiled
+
+
+def test_earlier_results_keep_their_data():
+    data = make_prepared_data(n_weeks=160)
+    first = bm.SimpleBayesianModel(**FAST_NUTS).fit(data.iloc[:479])
+    second = bm.SimpleBayesianModel(**FAST_NUTS).fit(data.iloc[:239])
+
+    assert _rows(first) == 479
+    assert _rows(second) == 239
+    assert first.model is not second.model
+
+
+def test_concurrent_fits_of_one_structure():
+    data = make_prepared_data(n_weeks=80)
+    sizes = [60, 120, 180, 240]
+
+    def fit(n):
+        return bm.SimpleBayesianModel(**FAST_VI).fit(data.iloc[:n])
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(fit, sizes))
+
+    assert [_rows(r) for r in results] == sizes
+    assert [r.n_observations for r in results] == sizes
+    assert len(bm._MODEL_CACHE) == 1
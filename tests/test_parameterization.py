@@ -0,0 +1,34 @@
+"""'auto' parameterization of hierarchical group effects"""
+
+import bayesian_models as bm
+from bayesian_models import AUTO_CENTERED_MAX_SE_RATIO
+
+from conftest import make_prepared_data
+
+
+def _auto_model(data):
+    model = bm.HierarchicalBayesianModel(verbose=False, parameterization='auto')
+    model.groups = sorted(data['Retailer'].unique())
+    model._build_model(data)
+    return model
+
+
+def test_rule_is_per_effect():
+    ratios = {'intercept': 0.5, 'base_elasticity': AUTO_CENTERED_MAX_SE_RATIO, 'promo_elasticity': 2.0}
+    assert bm._choose_parameterization(ratios) == {
+        'intercept': 'centered', 'base_elasticity': 'non_centered', 'promo_elasticity': 'non_centered',
+    }
+
+
+def test_well_identified_effects_are_centered():
+    model = _auto_model(make_prepared_data(n_weeks=60))
+    assert set(model.group_parameterization.values()) == {'centered'}
+    assert max(model.identification_ratios.values()) < AUTO_CENTERED_MAX_SE_RATIO
+
+
+def test_sparse_promos_are_non_centered():
+    # Two years of base price variation, but only a few promo weeks per retailer
+    model = _auto_model(make_prepared_data(n_weeks=104, promo_rate=0.03))
+    assert model.group_parameterization['promo_elasticity'] == 'non_centered'
+    assert model.group_parameterization['base_elasticity'] == 'centered'
+    assert model.group_parameterization['intercept'] == 'centered'
@@ -0,0 +1,80 @@
+"""Posterior export: retailer labels and the Parquet dataset layout"""
+
+import arviz as az
+import numpy as np
+import pytest
+import xarray as xr
+
+import bayesian_models as bm
+from bayesian_models import GROUP_DIM, HierarchicalResults
+from posterior_export import ALL_GROUPS, export_posterior, posterior_frame, wide_posterior_frame
+
+pytest.importorskip('pyarrow')
+import pyarrow.dataset as pads
+
+
+@pytest.fixture(scope='module')
+def hierarchical():
+    from conftest import make_prepared_data
+    return bm.HierarchicalBayesianModel(
+        verbose=False, inference='advi', vi_iterations=2000, approx_draws=100, random_seed=1
+    ).fit(make_prepared_data())
+
+
+def _without_group_coords(results):
+    """The same results as a trace saved before variables carried the retailer dim"""
+    posterior = results.trace.posterior
+    variables = {}
+    for name, da in posterior.data_vars.items():
+        if GROUP_DIM in da.dims:
+            da = da.rename({GROUP_DIM: f'{name}_dim_0'}).drop_vars(f'{name}_dim_0')
+        variables[name] = da
+    trace = az.InferenceData(posterior=xr.Dataset(variables, attrs=posterior.attrs))
+    return HierarchicalResults(trace, None, results.data, {}, {}, groups=results.groups)
+
+
+def test_unnamed_group_axis_labelled_from_groups(hierarchical):
+    legacy = _without_group_coords(hierarchical)
+    assert GROUP_DIM not in legacy.trace.posterior.dims
+
+    frame = posterior_frame(legacy, var_names=['base_elasticity', 'mu_global_base'])
+    expected = posterior_frame(hierarchical, var_names=['base_elasticity', 'mu_global_base'])
+    assert set(frame['group'].astype(str)) == set(hierarchical.groups) | {ALL_GROUPS}
+    assert (frame['element'].astype(str) == '').all()
+    np.testing.assert_array_equal(frame['value'].values, expected['value'].values)
+
+    wide = wide_posterior_frame(legacy, var_names=['base_elasticity'])
+    assert [c for c in wide.columns if c.startswith('base_elasticity')] == [
+        f'base_elasticity[{group}]' for group in hierarchical.groups
+    ]
+
+
+def test_parquet_export_partitions_by_variable_and_group(hierarchical, tmp_path):
+    out = export_posterior(hierarchical, tmp_path, file_format='parquet', layout='both',
+                           var_names=['base_elasticity', 'mu_global_base'])
+    assert set(out['paths']) == {'draws', 'draws_wide', 'scenarios'}
+
+    draws = pads.dataset(out['paths']['draws'], format='parquet', partitioning='hive')
+    costco = draws.to_table(filter=(pads.field('variable') == 'base_elasticity')
+                            & (pads.field('group') == 'Costco')).to_pandas()
+    position = hierarchical.groups.index('Costco')
+    np.testing.assert_allclose(
+        costco.sort_values(['chain', 'draw'])['value'].values,
+        hierarchical.trace.posterior['base_elasticity'].values[..., position].reshape(-1),
+        rtol=1e-6,
+    )
+    assert draws.count_rows() == out['rows']['draws']
+
+    wide = pads.dataset(out['paths']['draws_wide'], format='parquet').to_table().to_pandas()
+    assert 'base_elasticity[Costco]' in wide.columns
+    assert len(wide) == out['rows']['draws_wide']
+
+
+def test_re_export_drops_stale_partitions(hierarchical, tmp_path):
+    export_posterior(hierarchical, tmp_path, var_names=['base_elasticity', 'mu_global_base'],
+                     include_scenarios=False)
+    out = export_posterior(hierarchical, tmp_path, var_names=['mu_global_base'], include_scenarios=False)
+
+    assert sorted(p.name for p in (tmp_path / 'draws').iterdir()) == ['variable=mu_global_base']
+    draws = pads.dataset(out['paths']['draws'], format='parquet', partitioning='hive')
+    assert draws.count_rows() == out['rows']['draws'] == hierarchical.trace.posterior['mu_global_base'].size
@@ -0,0 +1,68 @@
+"""Probability statements: compound and vectorized evaluation, rejected expressions"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bayesian_models as bm
+
+from conftest import make_prepared_data
+
+
+@pytest.fixture(scope='module')
+def hierarchical():
+    return bm.HierarchicalBayesianModel(
+        verbose=False, inference='advi', vi_iterations=2000, approx_draws=400, random_seed=1
+    ).fit(make_prepared_data())
+
+
+def _flat(results, name, group=None):
+    da = results.trace.posterior[name]
+    if group is not None:
+        da = da.sel({bm.GROUP_DIM: group})
+    return da.values.reshape(da.sizes['chain'] * da.sizes['draw'], -1)
+
+
+def test_compound_statements(hierarchical):
+    costco, bjs = _flat(hierarchical, 'base_elasticity', 'Costco'), _flat(hierarchical, 'base_elasticity', "BJ's")
+    promo = _flat(hierarchical, 'mu_global_promo')
+    threshold = float(np.median(promo))
+
+    assert hierarchical.probability(f'base_elasticity[Costco] < base_elasticity[BJs] and mu_global_promo < {threshold}') \
+        == pytest.approx(np.mean((costco < bjs) & (promo < threshold)))
+    assert hierarchical.probability(f'not (base_elasticity[2] > -2) or mu_global_promo >= {threshold}') \
+        == pytest.approx(np.mean(~(_flat(hierarchical, 'base_elasticity', "Sam's Club") > -2) | (promo >= threshold)))
+    assert hierarchical.probability('-2.1 < base_elasticity["Costco"] <= -1.9') \
+        == pytest.approx(np.mean((-2.1 < costco) & (costco <= -1.9)))
+    assert hierarchical.probability('abs(base_elasticity[Costco] - base_elasticity[BJs]) ** 2 < exp(-4)') \
+        == pytest.approx(np.mean(np.abs(costco - bjs) ** 2 < np.exp(-4)))
+
+
+def test_vectorized_evaluation(hierarchical):
+    pooled = _flat(hierarchical, 'base_elasticity')
+    assert pooled.shape[1] == len(hierarchical.groups)
+    assert hierarchical.probability('base_elasticity < -2') == pytest.approx(np.mean(pooled < -2))
+
+    statements = ['base_elasticity < -2', 'base_elasticity[Costco] < -2', 'mu_global_base > 0']
+    probs = hierarchical.probability(statements)
+    assert isinstance(probs, pd.Series) and list(probs.index) == statements
+    assert probs.iloc[1] == pytest.approx(np.mean(_flat(hierarchical, 'base_elasticity', 'Costco') < -2))
+    assert probs.iloc[2] == pytest.approx(np.mean(_flat(hierarchical, 'mu_global_base') > 0))
+
+
+@pytest.mark.parametrize('statement, match', [
+    ('__import__("os").system("true")', 'Unsupported expression'),
+    ('base_elasticity.__class__ is None', 'Unsupported expression'),
+    ('base_elasticity.mean() < 0', 'Unsupported expression'),
+    ('base_elasticity == -2', 'Unsupported expression'),
+    ('(lambda: 1)() < 2', 'Unsupported expression'),
+    ('exp(base_elasticity, 2) < 1', 'Unsupported expression'),
+    ('base_elasticity[0:2] < -2', 'Unsupported index'),
+    ('base_elasticity <', 'Cannot parse'),
+    ('base_elasticity + 1', 'must be a comparison'),
+    ('unknown_variable < 0', 'Unknown variable'),
+    ('base_elasticity[Walmart] < 0', 'Unknown group'),
+])
+def test_rejected_statements(hierarchical, statement, match):
+    with pytest.raises(ValueError, match=match):
+        hierarchical.probability(statement)
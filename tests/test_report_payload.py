@@ -0,0 +1,37 @@
+"""Both HTML reports can share one report payload"""
+
+import pytest
+
+import bayesian_models as bm
+import reporting.business_report
+import reporting.statistical_report
+from reporting import build_report_payload, generate_business_report, generate_statistical_report
+
+from conftest import REPO_ROOT, make_prepared_data
+
+REPORTS = [
+    (generate_statistical_report, reporting.statistical_report, 'statistical_report_v3.html'),
+    (generate_business_report, reporting.business_report, 'business_report_v3.html'),
+]
+
+
+@pytest.fixture(scope='module')
+def hierarchical():
+    return bm.HierarchicalBayesianModel(
+        verbose=False, inference='advi', vi_iterations=2000, approx_draws=200, random_seed=1
+    ).fit(make_prepared_data())
+
+
+@pytest.mark.parametrize('generate, module, template', REPORTS)
+def test_shared_payload_gives_the_same_report(hierarchical, tmp_path, monkeypatch, generate, module, template):
+    template_path = str(REPO_ROOT / 'mock_references' / template)
+    own = generate(hierarchical, hierarchical.data, str(tmp_path / 'own'), template_path=template_path)
+
+    payload = build_report_payload(hierarchical, hierarchical.data, include_plots=False)
+    monkeypatch.setattr(module, 'build_report_payload', lambda *a, **k: pytest.fail('payload rebuilt'))
+    shared = generate(hierarchical, hierarchical.data, str(tmp_path / 'shared'),
+                      template_path=template_path, payload=payload)
+
+    with open(own) as f_own, open(shared) as f_shared:
+        assert f_own.read() == f_shared.read()
+    assert 'plots' not in payload
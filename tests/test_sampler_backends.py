@@ -0,0 +1,51 @@
+"""Sampler backend selection: validation, optional packages and the NumPyro device setup"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+import bayesian_models as bm
+from bayesian_models import SamplerConfig, _sampler_backend_kwargs
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    """Pretend the given optional packages are (True) or are not (False) installed"""
+    find_spec = importlib.util.find_spec
+
+    def set_installed(**packages):
+        monkeypatch.setattr(importlib.util, 'find_spec', lambda name, *a: (
+            (find_spec('pytest') if packages[name] else None) if name in packages else find_spec(name, *a)
+        ))
+    return set_installed
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError, match=r"Unknown sampler_backend: stan\. Options: \['numpyro', 'nutpie', 'pymc'\]"):
+        bm.SimpleBayesianModel(verbose=False, sampler_backend='stan')
+    assert SamplerConfig(sampler_backend=' NutPie ').sampler_backend == 'nutpie'
+
+
+@pytest.mark.parametrize('backend', ['nutpie', 'numpyro'])
+def test_missing_optional_package(backend, installed):
+    installed(**{backend: False})
+    with pytest.raises(ImportError, match=f'pip install {backend}'):
+        _sampler_backend_kwargs(backend, n_chains=2)
+
+
+def test_numpyro_sets_device_count_only_when_unset(installed, monkeypatch):
+    installed(numpyro=True)
+    monkeypatch.delitem(sys.modules, 'jax', raising=False)
+
+    monkeypatch.delenv('XLA_FLAGS', raising=False)
+    kwargs = _sampler_backend_kwargs('numpyro', n_chains=3)
+    assert kwargs['nuts_sampler'] == 'numpyro'
+    assert kwargs['nuts_sampler_kwargs'] == {'chain_method': 'parallel'}
+    assert os.environ['XLA_FLAGS'] == '--xla_force_host_platform_device_count=3'
+
+    monkeypatch.setenv('XLA_FLAGS', '--xla_cpu_enable_fast_math=false')
+    kwargs = _sampler_backend_kwargs('numpyro', n_chains=3)
+    assert os.environ['XLA_FLAGS'] == '--xla_cpu_enable_fast_math=false'
+    assert kwargs['nuts_sampler_kwargs'] == {'chain_method': 'vectorized'}
@@ -0,0 +1,46 @@
+"""SamplerConfig: one set of sampling options for both models"""
+
+import pytest
+
+import bayesian_models as bm
+from bayesian_models import SamplerConfig
+
+
+def test_keywords_override_config():
+    sampler = SamplerConfig(n_samples=500, n_chains=2, checkpoint_dir=None)
+    model = bm.SimpleBayesianModel(verbose=False, sampler=sampler, n_chains=3, inference='GIBBS')
+
+    assert (model.n_samples, model.n_chains, model.inference) == (500, 3, 'gibbs')
+    assert model.sampler_config.n_chains == 3
+    assert sampler.n_chains == 2
+
+
+def test_from_dict_ignores_other_model_keys():
+    section = {'type': 'hierarchical', 'priors': 'default', 'parameterization': 'auto',
+               'n_samples': 100, 'max_minutes': None, 'sampler_backend': 'PyMC'}
+    sampler = SamplerConfig.from_dict(section)
+    assert (sampler.n_samples, sampler.sampler_backend, sampler.max_minutes) == (100, 'pymc', None)
+
+    model = bm.HierarchicalBayesianModel(verbose=False, sampler=sampler, parameterization='auto')
+    assert model.n_samples == 100 and model.parameterization == 'auto'
+
+
+def test_invalid_options_fail_fast():
+    with pytest.raises(ValueError, match='Unknown sampler_backend'):
+        SamplerConfig(sampler_backend='stan')
+    with pytest.raises(ValueError, match='Unsupported inference'):
+        bm.HierarchicalBayesianModel(verbose=False, inference='gibbs')
+    with pytest.raises(TypeError):
+        bm.SimpleBayesianModel(verbose=False, n_sample=100)
+
+
+@pytest.mark.parametrize('model_class', [bm.SimpleBayesianModel, bm.HierarchicalBayesianModel])
+def test_baseline_positional_signature(model_class):
+    model = model_class('default', 2000, 1000, 2, 0.9, 7, False)
+    assert (model.n_samples, model.n_tune, model.n_chains, model.target_accept, model.random_seed) == (
+        2000, 1000, 2, 0.9, 7)
+    assert model.verbose is False
+
+    # Positional values override the config; omitted ones keep it
+    model = model_class('default', 300, sampler=SamplerConfig(n_samples=100, n_tune=50), verbose=False)
+    assert (model.n_samples, model.n_tune) == (300, 50)
@@ -0,0 +1,45 @@
+"""Scenario grid groups: pooled 'Overall', retailers and the opt-in global mean"""
+
+import numpy as np
+import pytest
+
+import bayesian_models as bm
+from bayesian_models import GLOBAL_MEAN_GROUP
+
+from conftest import make_prepared_data
+
+
+@pytest.fixture(scope='module')
+def hierarchical():
+    return bm.HierarchicalBayesianModel(
+        verbose=False, inference='advi', vi_iterations=2000, approx_draws=200, random_seed=1
+    ).fit(make_prepared_data())
+
+
+def _revenue_mean(samples, pct):
+    return float(np.mean(((1 + samples * pct / 100.0) * (1 + pct / 100.0) - 1) * 100.0))
+
+
+def test_overall_pools_group_draws(hierarchical):
+    impact = hierarchical.base_price_impact(3)
+    pooled = hierarchical.trace.posterior['base_elasticity'].values.reshape(-1)
+    np.testing.assert_array_equal(hierarchical.base_elasticity_samples, pooled)
+    assert impact['revenue_impact_mean'] == pytest.approx(_revenue_mean(pooled, 3))
+    assert impact['volume_impact_mean'] == pytest.approx(3 * hierarchical.base_elasticity.mean, rel=1e-6)
+
+
+def test_global_mean_only_on_request(hierarchical):
+    grid = hierarchical.scenario_grid(price_changes=[3], discounts=[])
+    assert list(grid['group']) == ['Overall'] + hierarchical.groups
+
+    row = hierarchical.scenario_grid(price_changes=[3], discounts=[], groups=[GLOBAL_MEAN_GROUP]).iloc[0]
+    mu = hierarchical.trace.posterior['mu_global_base'].values.reshape(-1)
+    assert row['revenue_impact_mean'] == pytest.approx(_revenue_mean(mu, 3))
+
+
+def test_simple_results_have_no_global_mean():
+    results = bm.SimpleBayesianModel(
+        verbose=False, inference='advi', vi_iterations=1000, approx_draws=100, random_seed=1
+    ).fit(make_prepared_data())
+    with pytest.raises(ValueError, match='Unknown groups'):
+        results.scenario_grid(groups=[GLOBAL_MEAN_GROUP])
@@ -0,0 +1,44 @@
+"""Sequential updates: update() on the output of an earlier update()"""
+
+import pytest
+
+import bayesian_models as bm
+
+from conftest import make_prepared_data
+
+FAST_VI = dict(verbose=False, inference='advi', vi_iterations=2000, approx_draws=200, random_seed=1)
+
+
+def _weeks(data, n):
+    dates = sorted(data['Date'].unique())
+    return data[data['Date'] <= dates[n - 1]]
+
+
+@pytest.mark.parametrize('model_cls', [bm.SimpleBayesianModel, bm.HierarchicalBayesianModel])
+def test_updates_chain(model_cls):
+    data = make_prepared_data(n_weeks=40)
+    first = model_cls(**FAST_VI).fit(_weeks(data, 30))
+
+    second = model_cls(**FAST_VI).update(_weeks(data, 35), first)
+    third = model_cls(**FAST_VI).update(data, second)
+
+    posterior = third.trace.posterior
+    assert posterior.attrs['sequential_updates'] == 2
+    assert posterior.attrs['data_end_date'] == str(data['Date'].max().date())
+    assert third.data['Date'].nunique() == 5
+    # Each update re-exposes the model's parameters; only its own prior_z is new
+    params = {name for name in first.trace.posterior.data_vars if not name.endswith('_offset')}
+    assert params <= set(posterior.data_vars)
+    assert set(posterior.data_vars) - params == {'prior_z'}
+    assert third.base_elasticity.ci_lower < -2.0 < third.base_elasticity.ci_upper
+
+
+def test_update_from_saved_updated_trace(tmp_path):
+    data = make_prepared_data(n_weeks=40)
+    first = bm.SimpleBayesianModel(**FAST_VI).fit(_weeks(data, 30))
+    second = bm.SimpleBayesianModel(**FAST_VI).update(_weeks(data, 35), first)
+    path = tmp_path / 'trace.nc'
+    second.trace.to_netcdf(path)
+
+    third = bm.SimpleBayesianModel(**FAST_VI).update(data, str(path))
+    assert third.trace.posterior.attrs['sequential_updates'] == 2
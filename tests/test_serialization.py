@@ -0,0 +1,65 @@
+"""Slim results serialization: pickle and to_bytes / from_bytes round trips"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+import bayesian_models as bm
+from bayesian_models import BayesianResults, HierarchicalResults
+
+from conftest import make_prepared_data
+
+STATEMENTS = ['base_elasticity[Costco] < base_elasticity[BJs]', 'mu_global_base < -2']
+
+
+def _fit():
+    return bm.HierarchicalBayesianModel(
+        verbose=False, inference='advi', vi_iterations=2000, approx_draws=400, random_seed=1
+    ).fit(make_prepared_data())
+
+
+@pytest.fixture(scope='module')
+def hierarchical():
+    return _fit()
+
+
+def test_pickle_round_trip(hierarchical):
+    restored = pickle.loads(pickle.dumps(hierarchical))
+    assert isinstance(restored, HierarchicalResults)
+    assert restored.model is None and restored.data is None
+
+    assert restored.base_elasticity.mean == pytest.approx(hierarchical.base_elasticity.mean)
+    assert restored.base_elasticity.ci_lower == pytest.approx(hierarchical.base_elasticity.ci_lower)
+    for group, summary in hierarchical.group_base_elasticities.items():
+        assert restored.group_base_elasticities[group].mean == pytest.approx(summary.mean)
+    np.testing.assert_array_equal(restored.probability(STATEMENTS).values,
+                                  hierarchical.probability(STATEMENTS).values)
+    for name in hierarchical.trace.posterior.data_vars:
+        if not name.endswith('_offset'):
+            np.testing.assert_array_equal(restored.trace.posterior[name].values,
+                                          hierarchical.trace.posterior[name].values)
+
+
+def test_float32_bytes_round_trip(hierarchical):
+    # Serialized before any summary is cached, so the restored side computes its own
+    fresh = _fit()
+    payload = fresh.to_bytes(var_names=['base_elasticity', 'mu_global_base'], float32=True)
+    assert len(payload) < len(pickle.dumps(fresh)) / 2
+
+    restored = BayesianResults.from_bytes(payload)
+    reference = hierarchical
+    assert isinstance(restored, HierarchicalResults)
+    assert restored.model is None and restored.data is None
+    assert restored.trace.posterior['base_elasticity'].dtype == np.float32
+    assert set(restored.trace.posterior.data_vars) == {'base_elasticity', 'mu_global_base'}
+
+    # Summaries and probabilities are recomputed from the float32 draws
+    assert restored.base_elasticity.mean == pytest.approx(reference.base_elasticity.mean, rel=1e-5)
+    for group, summary in reference.group_base_elasticities.items():
+        assert restored.group_base_elasticities[group].mean == pytest.approx(summary.mean, rel=1e-5)
+        assert restored.group_base_elasticities[group].std == pytest.approx(summary.std, rel=1e-4)
+    np.testing.assert_allclose(restored.probability(STATEMENTS).values,
+                               reference.probability(STATEMENTS).values, atol=1e-3)
+    with pytest.raises(ValueError, match='Unknown variable'):
+        restored.probability('promo_elasticity < 0')
@@ -0,0 +1,58 @@
+"""Trimmed trace.nc export: groups, precision, thinning and compression"""
+
+import numpy as np
+import pytest
+
+import bayesian_models as bm
+from bayesian_models import BayesianResults, export_trace
+
+pytest.importorskip('h5netcdf')
+import arviz as az
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    from conftest import make_prepared_data
+    return bm.SimpleBayesianModel(
+        verbose=False, inference='gibbs', n_samples=400, n_tune=50, n_chains=2, random_seed=1
+    ).fit(make_prepared_data())
+
+
+def test_default_export_keeps_float64_draws(fitted, tmp_path):
+    out = export_trace(fitted.trace, tmp_path / 'trace.nc', groups=('posterior', 'sample_stats', 'log_likelihood'))
+    assert out['groups'] == ['posterior', 'sample_stats']
+    assert out['size_mb'] > 0
+
+    reloaded = az.from_netcdf(out['path'])
+    assert 'observed_data' not in reloaded.groups()
+    for name, da in fitted.trace.posterior.data_vars.items():
+        assert reloaded.posterior[name].dtype == np.float64
+        np.testing.assert_array_equal(reloaded.posterior[name].values, da.values)
+
+    fitted.data.to_csv(tmp_path / 'prepared_data.csv', index=False)
+    restored = BayesianResults.from_artifacts(tmp_path)
+    assert restored.base_elasticity.mean == pytest.approx(fitted.base_elasticity.mean)
+
+
+def test_float32_thinned_export(fitted, tmp_path):
+    full = export_trace(fitted.trace, tmp_path / 'full.nc', compression='none')
+    slim = export_trace(fitted.trace, tmp_path / 'slim.nc', float32=True, thin=4, compression='zlib')
+    assert slim['size_mb'] < full['size_mb']
+
+    reloaded = az.from_netcdf(slim['path'])
+    values = fitted.trace.posterior['base_elasticity'].values[:, ::4]
+    assert reloaded.posterior['base_elasticity'].dtype == np.float32
+    assert reloaded.posterior.sizes['draw'] == values.shape[1]
+    np.testing.assert_allclose(reloaded.posterior['base_elasticity'].values, values, rtol=1e-6)
+    assert reloaded.sample_stats['diverging'].dtype == bool
+
+
+@pytest.mark.parametrize('options, match', [
+    ({'compression': 'gzip'}, 'Unknown compression'),
+    ({'thin': 0}, 'thin must be >= 1'),
+    ({'groups': ('log_likelihood',)}, 'None of the groups'),
+])
+def test_invalid_options(fitted, tmp_path, options, match):
+    with pytest.raises(ValueError, match=match):
+        export_trace(fitted.trace, tmp_path / 'trace.nc', **options)
+    assert not (tmp_path / 'trace.nc').exists()
@@ -0,0 +1,52 @@
+"""Warm-started NUTS: previous last draws as starting points, short tuning"""
+
+import numpy as np
+import pytest
+
+import bayesian_models as bm
+
+from conftest import make_prepared_data
+
+NUTS = dict(verbose=False, n_samples=300, n_chains=2)
+
+
+@pytest.fixture(scope='module')
+def data():
+    return make_prepared_data()
+
+
+@pytest.fixture(scope='module')
+def cold(data):
+    return bm.SimpleBayesianModel(n_tune=500, random_seed=1, **NUTS).fit(data)
+
+
+def test_short_tune_continues_previous_run(data, cold, tmp_path, monkeypatch):
+    path = tmp_path / 'trace.nc'
+    cold.trace.to_netcdf(path)
+
+    starts = []
+    continuation = bm._continuation_nuts
+
+    def spy(*args, **kwargs):
+        step, initvals = continuation(*args, **kwargs)
+        starts.append(initvals)
+        return step, initvals
+
+    monkeypatch.setattr(bm, '_continuation_nuts', spy)
+    warm = bm.SimpleBayesianModel(n_tune=50, random_seed=2, **NUTS).fit(data, warm_start=str(path))
+
+    last = cold.trace.posterior.isel(draw=-1)
+    assert len(starts) == 1
+    for chain, point in enumerate(starts[0]):
+        for name, value in point.items():
+            np.testing.assert_allclose(value, last[name].isel(chain=chain).values)
+
+    assert warm.rhat_max < 1.05
+    assert warm.n_divergences == 0
+    assert warm.base_elasticity.mean == pytest.approx(cold.base_elasticity.mean, abs=3 * cold.base_elasticity.std)
+
+
+def test_warm_start_requires_pymc_backend(data, cold):
+    model = bm.SimpleBayesianModel(sampler_backend='numpyro', **NUTS)
+    with pytest.raises(ValueError, match="sampler_backend='pymc'"):
+        model.fit(data, warm_start=cold)
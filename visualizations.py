@@ -472,12 +472,12 @@ def plot_revenue_scenarios_base(results, scenarios=None, output_path: Optional[s
     if scenarios is None:
         scenarios = [-5, -4, -3, -2, -1, 0, 1, 2, 3, 4, 5]
 
-    impacts = [results.base_price_impact(s) for s in scenarios]
+    grid = results.scenario_grid(price_changes=scenarios, discounts=[], groups=['Overall'])
 
-    means = [i['revenue_impact_mean'] for i in impacts]
-    ci_lower = [i['revenue_impact_ci'][0] for i in impacts]
-    ci_upper = [i['revenue_impact_ci'][1] for i in impacts]
-    probs = [i['probability_positive'] for i in impacts]
+    means = grid['revenue_impact_mean'].tolist()
+    ci_lower = grid['revenue_impact_ci_lower'].tolist()
+    ci_upper = grid['revenue_impact_ci_upper'].tolist()
+    probs = grid['probability_positive'].tolist()
 
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize)
 
@@ -523,12 +523,12 @@ def plot_revenue_scenarios_promo(results, discounts=None, output_path: Optional[
     if discounts is None:
         discounts = [5, 10, 15, 20]
 
-    impacts = [results.promo_impact(d) for d in discounts]
+    grid = results.scenario_grid(price_changes=[], discounts=discounts, groups=['Overall'])
 
-    means = [i['revenue_impact_mean'] for i in impacts]
-    ci_lower = [i['revenue_impact_ci'][0] for i in impacts]
-    ci_upper = [i['revenue_impact_ci'][1] for i in impacts]
-    probs = [i['probability_positive'] for i in impacts]
+    means = grid['revenue_impact_mean'].tolist()
+    ci_lower = grid['revenue_impact_ci_lower'].tolist()
+    ci_upper = grid['revenue_impact_ci_upper'].tolist()
+    probs = grid['probability_positive'].tolist()
 
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize)
 
@@ -589,12 +589,12 @@ def plot_revenue_scenarios(results, scenarios=None, output_path: Optional[str] =
         scenarios = [-5, -4, -3, -2, -1, 0, 1, 2, 3, 4, 5]
     
     # Calculate impacts (backwards-compatible: uses base price impact)
-    impacts = [results.revenue_impact(s) for s in scenarios]
+    grid = results.scenario_grid(price_changes=scenarios, discounts=[], groups=['Overall'])
     
-    means = [i['revenue_impact_mean'] for i in impacts]
-    ci_lower = [i['revenue_impact_ci'][0] for i in impacts]
-    ci_upper = [i['revenue_impact_ci'][1] for i in impacts]
-    probs = [i['probability_positive'] for i in impacts]
+    means = grid['revenue_impact_mean'].tolist()
+    ci_lower = grid['revenue_impact_ci_lower'].tolist()
+    ci_upper = grid['revenue_impact_ci_upper'].tolist()
+    probs = grid['probability_positive'].tolist()
     
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize)
     
@@ -710,8 +710,7 @@ def plot_group_comparison(results, output_path: Optional[str] = None, figsize=(1
     
     # Plot 2: Posterior distributions overlay
     for group in groups:
-        group_idx = list(results.groups).index(group)
-        samples = results.trace.posterior[var_group].values[:, :, group_idx].flatten()
+        samples = results.group_samples(var_group, group)
         ax2.hist(samples, bins=30, alpha=0.5, label=group, density=True)
     
     # Add global distribution
@@ -777,24 +776,26 @@ def generate_html_report(
     }
 
 
-def generate_statistical_report(results, data, output_dir: str = "./output", *, template_path: Optional[str] = None) -> str:
+def generate_statistical_report(results, data, output_dir: str = "./output", *, template_path: Optional[str] = None,
+                                payload: Optional[Dict] = None) -> str:
     """
     Contract entry point: Statistical Validation Report.
     Wrapper around `reporting.generate_statistical_report` (lazy import).
     """
     from reporting import generate_statistical_report as _gen
 
-    return _gen(results=results, data=data, output_dir=output_dir, template_path=template_path)
+    return _gen(results=results, data=data, output_dir=output_dir, template_path=template_path, payload=payload)
 
 
-def generate_business_report(results, data, output_dir: str = "./output", *, template_path: Optional[str] = None) -> str:
+def generate_business_report(results, data, output_dir: str = "./output", *, template_path: Optional[str] = None,
+                             payload: Optional[Dict] = None) -> str:
     """
     Contract entry point: Business Decision Brief.
     Wrapper around `reporting.generate_business_report` (lazy import).
     """
     from reporting import generate_business_report as _gen
 
-    return _gen(results=results, data=data, output_dir=output_dir, template_path=template_path)
+    return _gen(results=results, data=data, output_dir=output_dir, template_path=template_path, payload=payload)
 
 
 def _create_html_content(results, data, output_dir, group_path, base_vs_promo_path, revenue_base_path, revenue_promo_path, time_trend_path=None):
@@ -814,6 +815,22 @@ def _create_html_content(results, data, output_dir, group_path, base_vs_promo_pa
     if retailer_names:
         retailers_line_html = f"<p><strong>Retailers Included:</strong> {', '.join(retailer_names)}</p>"
 
+    # ------------------------------------------------------------------------
+    # Convergence status (not defined for ADVI / Pathfinder previews)
+    # ------------------------------------------------------------------------
+    if results.converged is None:
+        convergence_html = f"""<div class="convergence warning">
+            <h3>ℹ️ Approximate Inference ({getattr(results, 'inference_method', 'approximate')})</h3>
+            <p>R-hat, ESS and divergence diagnostics do not apply. Treat as a fast preview and confirm with a full MCMC run.</p>
+        </div>"""
+    else:
+        convergence_html = f"""<div class="convergence {'success' if results.converged else 'warning'}">
+            <h3>{'✓ Model Converged Successfully' if results.converged else '⚠️ Convergence Warnings'}</h3>
+            <p>Max R-hat: {results.rhat_max:.4f} (should be < {results.max_rhat})</p>
+            <p>Min ESS: {results.ess_min:.0f} (should be > {results.min_ess:.0f})</p>
+            <p>Divergences: {results.n_divergences} (should be 0)</p>
+        </div>"""
+
     availability_table_html = ""
     if retailer_names and ('has_promo' in data.columns or 'has_competitor' in data.columns):
         cols = [c for c in ['has_promo', 'has_competitor'] if c in data.columns]
@@ -964,12 +981,7 @@ def _create_html_content(results, data, output_dir, group_path, base_vs_promo_pa
         {retailers_line_html}
         
         <!-- Convergence Status -->
-        <div class="convergence {'success' if results.converged else 'warning'}">
-            <h3>{'✓ Model Converged Successfully' if results.converged else '⚠️ Convergence Warnings'}</h3>
-            <p>Max R-hat: {results.rhat_max:.4f} (should be < 1.01)</p>
-            <p>Min ESS: {results.ess_min:.0f} (should be > 400)</p>
-            <p>Divergences: {results.n_divergences} (should be 0)</p>
-        </div>
+        {convergence_html}
         
         <!-- Key Results -->
         <h2>📊 Key Results</h2>
@@ -1037,8 +1049,9 @@ def _create_html_content(results, data, output_dir, group_path, base_vs_promo_pa
 """
     
     # Add base price scenarios to table
-    for price_change in [-5, -3, -1, 1, 3, 5]:
-        impact = results.revenue_impact(price_change)
+    table_grid = results.scenario_grid(groups=['Overall'])
+    for _, impact in table_grid[table_grid['scenario'] == 'base'].iterrows():
+        price_change = int(impact['price_change_pct'])
         html += f"""
                 <tr>
                     <td>{price_change:+d}%</td>
@@ -1069,8 +1082,8 @@ def _create_html_content(results, data, output_dir, group_path, base_vs_promo_pa
             <tbody>
 """
 
-        for discount in [5, 10, 15, 20]:
-            impact = results.promo_impact(discount)
+        for _, impact in table_grid[table_grid['scenario'] == 'promo'].iterrows():
+            discount = impact['discount_depth_pct']
             html += f"""
                 <tr>
                     <td>{discount:.0f}% off</td>